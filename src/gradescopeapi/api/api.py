@@ -1,12 +1,17 @@
 from datetime import datetime
 
 from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from gradescopeapi._config.config import FileUploadModel, LoginRequestModel
 from gradescopeapi.classes.account import Account
 from gradescopeapi.classes.assignments import Assignment, update_assignment_date
 from gradescopeapi.classes.connection import GSConnection
 from gradescopeapi.classes.courses import Course
+from gradescopeapi.classes.download import (
+    get_active_submissions,
+    iter_submissions_zip,
+)
 from gradescopeapi.classes.extensions import get_extensions, update_student_extension
 from gradescopeapi.classes.member import Member
 from gradescopeapi.classes.upload import upload_assignment
@@ -204,6 +209,49 @@ def get_student_assignment_submission(
         )
 
 
+@app.post("/assignments/submissions/zip", response_class=StreamingResponse)
+def download_assignment_submissions_zip(course_id: str, assignment_id: str):
+    """Download the active submissions of every student as one zip file. ONLY FOR INSTRUCTORS.
+
+    The zip file is streamed while the submissions are downloaded.
+
+    Args:
+        course_id (str): The ID of the course.
+        assignment_id (str): The ID of the assignment.
+
+    Returns:
+        StreamingResponse: The zip file, with one directory per student email.
+
+    Raises:
+        HTTPException: If the submissions cannot be listed, with a 500 Internal Server Error status code and the error message.
+    """
+    try:
+        # list the submissions before streaming, so errors still get an error status
+        submission_infos = get_active_submissions(
+            connection.session,
+            course_id,
+            assignment_id,
+            gradescope_base_url=connection.gradescope_base_url,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get submissions. Error: {e}"
+        )
+    return StreamingResponse(
+        iter_submissions_zip(
+            connection.session,
+            course_id,
+            assignment_id,
+            submission_infos,
+            gradescope_base_url=connection.gradescope_base_url,
+        ),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="submissions_{course_id}_{assignment_id}.zip"'
+        },
+    )
+
+
 @app.post("/assignments/update_dates")
 def update_assignment_dates(
     course_id: str,
@@ -1,48 +1,91 @@
-import json
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from pathlib import PurePosixPath
+from urllib.parse import unquote, urlsplit
 
-import dateutil.parser
 import requests
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._date_helpers import parse_date
+from gradescopeapi.classes._helpers._json_helpers import (
+    AssignmentsTableProps,
+    SubmissionTextFiles,
+    loads,
+)
+from gradescopeapi.classes._helpers._singleflight_helpers import coalesce
 from gradescopeapi.classes.assignments import Assignment
-from datetime import datetime
 
 
 class NotAuthorized(Exception):
     pass
 
 
+# The links of submitted files are presigned S3 links, so they are downloaded without the
+# Gradescope session: no Gradescope headers, rate limiting or circuit breaking.
+_download_session = requests.Session()
+
+
+def get_download_session() -> requests.Session:
+    """Get the plain session used by `download_text_file`."""
+    return _download_session
+
+
 def check_page_auth(session, endpoint):
     """
     raises Exception if user not logged in or doesn't have appropriate authorities
     Returns response if otherwise good
+    Concurrent checks of the same page by the same user share one request
+    """
+    submissions_resp = coalesce(session, endpoint, lambda: session.get(endpoint))
+    return check_page_response(submissions_resp, endpoint)
+
+
+def check_page_response(submissions_resp, endpoint):
+    """
+    raises Exception if the response of a page shows the user is not logged in or doesn't have appropriate authorities
+    Returns response if otherwise good
     """
-    submissions_resp = session.get(endpoint)
     # check if page is valid, raise exception if not
     if submissions_resp.status_code == requests.codes.unauthorized:
         # check error type
         # TODO: how should we handle errors so that our API can read them?
-        error_msg = [*json.loads(submissions_resp.text).values()][0]
+        error_msg = [*loads(submissions_resp.text).values()][0]
         if error_msg == "You are not authorized to access this page.":
             raise NotAuthorized("You are not authorized to access this page.")
         elif error_msg == "You must be logged in to access this page.":
             raise Exception("You must be logged in to access this page.")
+        else:
+            raise Exception(error_msg)
     elif submissions_resp.status_code == requests.codes.not_found:
         raise Exception("Page not Found")
     elif submissions_resp.status_code == requests.codes.ok:
         return submissions_resp
+    else:
+        # e.g. a 5xx that persisted through the retries of the session
+        raise RuntimeError(
+            f"Failed to access {endpoint}. Status code: {submissions_resp.status_code}"
+        )
 
 
 def get_assignments_instructor_view(coursepage_soup):
-    assignments_list = []
     element_with_props = coursepage_soup.find(
         "div", {"data-react-class": "AssignmentsTable"}
     )
     if element_with_props:
         # Extract the value of the data-react-props attribute
-        props_str = element_with_props["data-react-props"]
+        return get_assignments_from_table_props(element_with_props["data-react-props"])
+    return []
+
+
+def get_assignments_from_table_props(props_str):
+    """
+    Parse the assignments from the data-react-props of the AssignmentsTable of the instructor view
+    """
+    assignments_list = []
+    if props_str:
         # Parse the JSON data
-        assignment_json = json.loads(props_str)
+        assignment_json = loads(props_str, AssignmentsTableProps)
 
         # Extract information for each assignment
         for assignment in assignment_json["table_data"]:
@@ -50,36 +93,19 @@ def get_assignments_instructor_view(coursepage_soup):
             if assignment.get("type", "") != "assignment":
                 continue
 
+            # convert dates to datetime objects
+            submission_window = assignment["submission_window"]
             assignment_obj = Assignment(
                 assignment_id=assignment["url"].split("/")[-1],
                 name=assignment["title"],
-                release_date=assignment["submission_window"]["release_date"],
-                due_date=assignment["submission_window"]["due_date"],
-                late_due_date=assignment["submission_window"].get("hard_due_date"),
+                release_date=parse_date(submission_window["release_date"]),
+                due_date=parse_date(submission_window["due_date"]),
+                late_due_date=parse_date(submission_window.get("hard_due_date")),
                 submissions_status=None,
                 grade=None,
                 max_grade=str(float(assignment["total_points"])),
             )
 
-            # convert to datetime objects
-            assignment_obj.release_date = (
-                dateutil.parser.parse(assignment_obj.release_date)
-                if assignment_obj.release_date
-                else assignment_obj.release_date
-            )
-
-            assignment_obj.due_date = (
-                dateutil.parser.parse(assignment_obj.due_date)
-                if assignment_obj.due_date
-                else assignment_obj.due_date
-            )
-
-            assignment_obj.late_due_date = (
-                dateutil.parser.parse(assignment_obj.late_due_date)
-                if assignment_obj.late_due_date
-                else assignment_obj.late_due_date
-            )
-
             # Add the assignment dictionary to the list
             assignments_list.append(assignment_obj)
     return assignments_list
@@ -143,13 +169,9 @@ def get_assignments_student_view(coursepage_soup):
             pass
 
         # convert to datetime objects
-        release_date = (
-            dateutil.parser.parse(release_date) if release_date else release_date
-        )
-        due_date = dateutil.parser.parse(due_date) if due_date else due_date
-        late_due_date = (
-            dateutil.parser.parse(late_due_date) if late_due_date else late_due_date
-        )
+        release_date = parse_date(release_date)
+        due_date = parse_date(due_date)
+        late_due_date = parse_date(late_due_date)
 
         # Store the extracted information in a dictionary
         assignment_obj = Assignment(
@@ -176,61 +198,229 @@ def get_submission_files(
     submission_id,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
 ):
+    return [
+        text_file["url"]
+        for text_file in get_submission_text_files(
+            session, course_id, assignment_id, submission_id, gradescope_base_url
+        )
+    ]
+
+
+def get_submission_text_files(
+    session,
+    course_id,
+    assignment_id,
+    submission_id,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> list[dict[str, str]]:
+    """
+    Get the path (within the submission) and the signed download link of every submitted file
+    Returns a list of {"path": ..., "url": ...} in submission order, with unique paths
+    """
     ASSIGNMENT_ENDPOINT = (
         f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
     )
 
     file_info_link = f"{ASSIGNMENT_ENDPOINT}/submissions/{submission_id}.json?content=react&only_keys[]=text_files&only_keys[]=file_comments"
     file_info_resp = session.get(file_info_link)
-    if file_info_resp.status_code == requests.codes.ok:
-        file_info_json = json.loads(file_info_resp.text)
-        if file_info_json.get("text_files"):
-            aws_links = []
-            for file_data in file_info_json["text_files"]:
-                aws_links.append(file_data["file"]["url"])
-        else:
-            raise NotImplementedError("Image only submissions not yet supported")
+    if file_info_resp.status_code != requests.codes.ok:
+        raise RuntimeError(
+            f"Failed to get files of submission {submission_id}. Status code: {file_info_resp.status_code}"
+        )
+    file_info_json = loads(file_info_resp.text, SubmissionTextFiles)
+    if not file_info_json.get("text_files"):
         # TODO add support for image questions
-    return aws_links
+        raise NotImplementedError("Image only submissions not yet supported")
+    text_files = []
+    paths = set()
+    for file_data in file_info_json["text_files"]:
+        url = file_data["file"]["url"]
+        # the object key of the signed link ends with the file name
+        path = file_data.get("path") or unquote(urlsplit(url).path.rsplit("/", 1)[-1])
+        # files with the same name would overwrite each other, e.g. in an archive
+        unique_path, index = path, 1
+        while unique_path in paths:
+            pure_path = PurePosixPath(path)
+            unique_path = str(
+                pure_path.with_name(f"{pure_path.stem}_{index}{pure_path.suffix}")
+            )
+            index += 1
+        paths.add(unique_path)
+        text_files.append({"path": unique_path, "url": url})
+    return text_files
 
 
-def get_user_submission_info(tds):
-    user_sub_info = {"submissions": [{}]}
-    for td in tds:
-        a_tag = td.find("a")
-        # if td.attrs is not None and td.attrs.get("class") is not None:
-        #     print(td.attrs.get("class"))
-        if (
-            td.attrs is not None
-            and td.attrs.get("class") is not None
-            and "table--primaryLink" in td.attrs.get("class")
-            and "name" not in user_sub_info
-        ):
-            user_sub_info["name"] = a_tag.text
-            user_sub_info["submissions"][0]["submission_id"] = a_tag.attrs.get(
-                "href"
-            ).split("/")[-1]
-        elif (
-            a_tag is not None
-            and a_tag.attrs is not None
-            and a_tag.attrs.get("href").startswith("mailto:")
-        ):
-            user_sub_info["email"] = a_tag.attrs.get("href")[7:]
-        elif td.find("time"):
-            submission_date_time = datetime.strptime(
-                td.find("time").attrs.get("datetime"), "%Y-%m-%d %H:%M:%S %z"
-            )
-            user_sub_info["submissions"][0][
-                "datetime"
-            ] = submission_date_time.isoformat()
+def download_text_file(url: str, stream: bool = False) -> requests.Response:
+    """
+    Download a submitted file from its presigned link, see `get_submission_text_files`
+    Raises RuntimeError if the download fails
+    """
+    response = get_download_session().get(url, stream=stream)
+    if response.status_code != requests.codes.ok:
+        response.close()
+        file_name = unquote(urlsplit(url).path.rsplit("/", 1)[-1])
+        raise RuntimeError(
+            f"Failed to download {file_name}. Status code: {response.status_code}"
+        )
+    return response
+
+
+def get_question_ids(grade_page_text: str, course_id: str) -> list[str]:
+    """
+    Find the IDs of all questions linked from the grading dashboard of an assignment, in page order
+    """
+    question_ids = re.findall(rf"/courses/{course_id}/questions/(\d+)", grade_page_text)
+    # remove duplicates but keep order
+    return list(dict.fromkeys(question_ids))
+
+
+def get_question_grader_counts(question_submissions_soup) -> dict[str, int]:
+    """
+    Count the graded submissions per grader on the submissions page of a question.
+    The grader column is located using the table headers
+    """
+    table = question_submissions_soup.find("table")
+    if table is None:
+        return {}
+
+    headers = [th.text.strip().lower() for th in table.find_all("th")]
+    grader_column = next(
+        (
+            i
+            for i, header in enumerate(headers)
+            if header.startswith(("grader", "graded by"))
+        ),
+        None,
+    )
+    if grader_column is None:
+        # no header found, older page layout has name, score, grader columns
+        grader_column = 2
+
+    grader_counts = Counter()
+    for row in table.find_all("tr"):
+        cells = row.find_all("td")
+        if len(cells) > grader_column:
+            grader = cells[grader_column].text.strip()
+            if grader:  # skip ungraded submissions
+                grader_counts[grader] += 1
+    return dict(grader_counts)
+
 
-            user_sub_info["submissions"][0][
-                "epochtime_s"
-            ] = submission_date_time.timestamp()
+class _ReviewGradesParser(HTMLParser):
+    """
+    Streaming parser extracting one plain record per row of the review_grades table.
+    No document tree is built, so memory stays proportional to the records.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.records = []
+        self._record = None  # record of the current row
+        self._in_primary_td = False
+        self._in_primary_a = False
+        self._name_parts = []
+
+    def _end_row(self):
+        if self._record is not None and "primary" in self._record:
+            del self._record["primary"]
+            self._record["name"] = "".join(self._name_parts).strip()
+            self.records.append(self._record)
+        self._record = None
+        self._in_primary_td = self._in_primary_a = False
+        self._name_parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._end_row()
+            self._record = {}
+            return
+        record = self._record
+        if record is None:
+            return
+        attrs = dict(attrs)
+        if tag == "td":
+            # only the first primary link column of a row holds the submission
+            if (
+                "primary" not in record
+                and "table--primaryLink" in (attrs.get("class") or "").split()
+            ):
+                record["primary"] = True
+                record["submission_id"] = None
+                self._in_primary_td = True
+            else:
+                self._in_primary_td = False
+        elif tag == "a" and "primary" in record:
+            href = attrs.get("href") or ""
+            if self._in_primary_td and record["submission_id"] is None:
+                record["submission_id"] = href.split("/")[-1]
+                self._in_primary_a = True
+            elif href.startswith("mailto:") and "email" not in record:
+                record["email"] = href[7:]
+        elif tag == "time" and "primary" in record and "datetime" not in record:
+            record["datetime"] = attrs.get("datetime")
 
+    def handle_endtag(self, tag):
+        if tag == "a":
+            self._in_primary_a = False
+        elif tag == "td":
+            self._in_primary_td = self._in_primary_a = False
+        elif tag in ("tr", "table"):
+            self._end_row()
+
+    def handle_data(self, data):
+        if self._in_primary_td:
+            self._name_parts.append(data)
+
+
+def parse_review_grades(page_text, chunk_size: int = 1 << 16) -> list[dict]:
+    """
+    Extract one record per student row of a review_grades page:
+    {"name", "email", "submission_id" (None without a submission), "datetime" (raw string or None)}
+    The page is fed to a streaming parser in chunks, page_text may also be an iterable of str chunks.
+    """
+    parser = _ReviewGradesParser()
+    if isinstance(page_text, str):
+        text = page_text
+        page_text = (text[i : i + chunk_size] for i in range(0, len(text), chunk_size))
+    for chunk in page_text:
+        parser.feed(chunk)
+    parser.close()
+    parser._end_row()
+    return parser.records
+
+
+def get_user_submission_info(record):
+    """Convert a record of parse_review_grades to a submission info"""
+    user_sub_info = {
+        "name": record["name"],
+        "email": record.get("email"),
+        "submissions": [{"submission_id": record["submission_id"]}],
+    }
+    if record.get("datetime"):
+        submission_date_time = parse_date(record["datetime"])
+        user_sub_info["submissions"][0]["datetime"] = submission_date_time.isoformat()
+        user_sub_info["submissions"][0]["epochtime_s"] = (
+            submission_date_time.timestamp()
+        )
     return user_sub_info
-    #     a = td.find("a")
-    #     href = a.attrs.get("href")
-    #     if href and href.startswith("mailto:"):
-    #         return href[7:]
-    # return ""
+
+
+def get_submission_infos(records) -> dict:
+    """
+    Map emails to the submission info of every submitted row of parse_review_grades.
+    Group submissions (names joined with commas) and repeated submissions are skipped.
+    """
+    submission_infos = {}
+    submit_id_set = set()
+    for record in records:
+        submission_id = record["submission_id"]
+        if (
+            submission_id is None
+            or "," in record["name"]
+            or submission_id in submit_id_set
+            or record.get("email") is None
+        ):
+            continue
+        submit_id_set.add(submission_id)
+        submission_infos[record["email"]] = get_user_submission_info(record)
+    return submission_infos
@@ -0,0 +1,157 @@
+"""Helpers for running many Gradescope requests concurrently without overwhelming the server."""
+
+import itertools
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TypeVar
+
+from requests.adapters import HTTPAdapter
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing out calls to at most `requests_per_second`.
+
+    A single RateLimiter can be shared between several bulk operations so they
+    stay under one combined request rate.
+    """
+
+    def __init__(self, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.interval = 1 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_time = time.monotonic()
+
+    def acquire(self):
+        """Block until the next request is allowed to be sent."""
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Transport adapter acquiring a RateLimiter before every request it sends.
+
+    Mounting it on a session limits all requests made through that session,
+    including the ones made inside `Account` methods.
+    """
+
+    def __init__(self, rate_limiter: RateLimiter | None = None, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, *args, **kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return super().send(request, *args, **kwargs)
+
+
+def iter_concurrently(
+    func: Callable[[K], T],
+    keys: Iterable[K],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: RateLimiter | None = None,
+) -> Iterator[tuple[K, T | None, Exception | None]]:
+    """Call `func(key)` for every key using a bounded thread pool, yielding results as they complete.
+
+    Yields:
+        tuple[K, T | None, Exception | None]: The key, its result and the exception raised, if any.
+    """
+
+    def call(key: K) -> T:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        return func(key)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(call, key): key for key in keys}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                yield key, None, e
+            else:
+                yield key, result, None
+
+
+def iter_concurrently_in_order(
+    func: Callable[[K], T],
+    keys: Iterable[K],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_pending: int | None = None,
+    rate_limiter: RateLimiter | None = None,
+) -> Iterator[tuple[K, T | None, Exception | None]]:
+    """Like `iter_concurrently`, but yields in the order of `keys` with bounded read-ahead.
+
+    At most `max_pending` calls (defaults to twice `max_workers`) are started but not yet
+    consumed, so a slow consumer bounds how many results are held in memory.
+    Closing the iterator early cancels the calls that have not started yet.
+    """
+    max_pending = max_pending or 2 * max_workers
+
+    def call(key: K) -> T:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        return func(key)
+
+    keys = iter(keys)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        pending = deque(
+            (key, executor.submit(call, key))
+            for key in itertools.islice(keys, max_pending)
+        )
+        while pending:
+            key, future = pending.popleft()
+            try:
+                result = future.result()
+            except Exception as e:
+                yield key, None, e
+            else:
+                yield key, result, None
+            for next_key in itertools.islice(keys, 1):
+                pending.append((next_key, executor.submit(call, next_key)))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def run_concurrently(
+    func: Callable[[K], T],
+    keys: Iterable[K],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: RateLimiter | None = None,
+) -> tuple[dict[K, T], dict[K, Exception]]:
+    """Call `func(key)` for every key using a bounded thread pool.
+
+    Failures are isolated per key, so one failing call does not abort the others.
+
+    Args:
+        func (Callable[[K], T]): The function to call for each key.
+        keys (Iterable[K]): The keys to call `func` with.
+        max_workers (int, optional): Maximum number of concurrent calls. Defaults to DEFAULT_MAX_WORKERS.
+        rate_limiter (RateLimiter | None, optional): If set, acquired before every call. Defaults to None.
+
+    Returns:
+        tuple[dict[K, T], dict[K, Exception]]: The results and the exceptions raised, keyed by key.
+    """
+    results: dict[K, T] = {}
+    errors: dict[K, Exception] = {}
+    for key, result, error in iter_concurrently(func, keys, max_workers, rate_limiter):
+        if error is not None:
+            errors[key] = error
+        else:
+            results[key] = result
+    return results, errors
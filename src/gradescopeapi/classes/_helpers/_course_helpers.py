@@ -1,8 +1,7 @@
-import json
-
 from bs4 import BeautifulSoup
 import bs4
 
+from gradescopeapi.classes._helpers._json_helpers import RosterMemberData, loads
 from gradescopeapi.classes.courses import Course
 from gradescopeapi.classes.member import Member
 
@@ -99,6 +98,34 @@ def get_courses_info(soup: BeautifulSoup) -> dict[str, dict[str, Course]]:
     return all_courses
 
 
+# order of the terms within a year, unknown terms sort first
+SEMESTER_ORDER = {"winter": 1, "spring": 2, "summer": 3, "fall": 4}
+
+
+def get_latest_term_course_ids(courses: dict[str, dict[str, Course]]) -> list[str]:
+    """
+    Get the IDs of the courses (instructor and student) of the most recent term.
+
+    Args:
+        courses (dict): Courses as returned by `get_courses_info`.
+
+    Returns:
+        list: The course IDs of the most recent term, empty if no course has a known year.
+    """
+    terms = {}
+    for role_courses in courses.values():
+        for course_id, course in role_courses.items():
+            try:
+                year = int(course.year)
+            except (TypeError, ValueError):
+                continue
+            terms[course_id] = (year, SEMESTER_ORDER.get(course.semester.lower(), 0))
+    if not terms:
+        return []
+    latest_term = max(terms.values())
+    return [course_id for course_id, term in terms.items() if term == latest_term]
+
+
 def get_course_members(soup: BeautifulSoup, course_id: str) -> list[Member]:
     """
     Scrape all course members from the membership page of a Gradescope course.
@@ -148,7 +175,7 @@ def get_course_members(soup: BeautifulSoup, course_id: str) -> list[Member]:
 
         # fetch full name from data-cm attribute in button
         data_cm = data_button.get("data-cm")
-        json_data_cm = json.loads(data_cm)  # convert to json
+        json_data_cm = loads(data_cm, RosterMemberData)  # convert to json
         full_name = json_data_cm.get("full_name")
 
         # fetch LMS related attributes
@@ -0,0 +1,97 @@
+"""Helpers for converting Gradescope date strings and epoch values to datetime objects.
+
+Gradescope pages only use a handful of date formats, so these helpers try
+`datetime.fromisoformat` and the known formats first and only fall back to
+`dateutil` for anything unexpected. Parsed strings and timezones are memoized,
+since the same dates repeat across every row of a table.
+"""
+
+import datetime
+import functools
+import zoneinfo
+from collections.abc import Iterable
+
+import dateutil.parser
+
+# date formats seen on Gradescope pages, tried in order after `fromisoformat`
+GRADESCOPE_DATE_FORMATS = (
+    "%Y-%m-%d %H:%M:%S %z",  # <time datetime="2024-04-15 23:59:00 -0400">
+    "%Y-%m-%dT%H:%M:%S%z",  # "2024-04-16T03:59:00Z" (Python 3.10 fromisoformat rejects "Z")
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+)
+
+
+@functools.cache
+def get_timezone(identifier: str) -> zoneinfo.ZoneInfo:
+    """Return the (cached) ZoneInfo object for an IANA timezone identifier."""
+    return zoneinfo.ZoneInfo(identifier)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_string(date_str: str) -> datetime.datetime:
+    try:
+        return datetime.datetime.fromisoformat(date_str)
+    except ValueError:
+        pass
+
+    for date_format in GRADESCOPE_DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(date_str, date_format)
+        except ValueError:
+            continue
+
+    # unknown format, let dateutil figure it out
+    return dateutil.parser.parse(date_str)
+
+
+def parse_date(
+    date_str: str | None, tzinfo: datetime.tzinfo | None = None
+) -> datetime.datetime | None:
+    """Convert a date string from Gradescope to a datetime object.
+
+    Args:
+        date_str (str | None): The date string to convert.
+        tzinfo (datetime.tzinfo | None, optional): If set, replaces the timezone of the parsed datetime
+            (the wall clock time is kept). Defaults to None.
+
+    Returns:
+        datetime.datetime | None: The parsed datetime, or None if `date_str` is empty.
+    """
+    if not date_str:
+        return None
+
+    parsed = _parse_date_string(date_str)
+    if tzinfo is not None:
+        parsed = parsed.replace(tzinfo=tzinfo)
+    return parsed
+
+
+def parse_date_in_timezone(
+    date_str: str | None, tzinfo: datetime.tzinfo | None
+) -> datetime.datetime | None:
+    """Convert a date string to a datetime object expressed in the given timezone.
+
+    Unlike `parse_date`, the point in time is preserved (`astimezone`).
+    """
+    parsed = parse_date(date_str)
+    if parsed is None or tzinfo is None:
+        return parsed
+    return parsed.astimezone(tzinfo)
+
+
+def epochs_to_datetimes(
+    epochs: Iterable[float],
+    tzinfo: datetime.tzinfo = datetime.timezone.utc,
+) -> list[datetime.datetime]:
+    """Convert many epoch timestamps (in seconds) to timezone aware datetime objects.
+
+    Repeated timestamps are only converted once.
+    """
+    converted: dict[float, datetime.datetime] = {}
+    datetimes = []
+    for epoch in epochs:
+        dt = converted.get(epoch)
+        if dt is None:
+            dt = converted[epoch] = datetime.datetime.fromtimestamp(epoch, tzinfo)
+        datetimes.append(dt)
+    return datetimes
@@ -0,0 +1,122 @@
+"""Helpers for extracting a single attribute from a page without building a DOM.
+
+Several requests only need one small value from a large page, e.g. an authenticity token or the
+react props of one component. These helpers scan the raw page for the tag with a regular
+expression that respects quoted attribute values, stop at the first match and only unescape the
+value that was asked for. They return None if the tag is not found, so callers fall back to
+parsing the page with BeautifulSoup.
+"""
+
+import html
+import re
+
+_TAG_PATTERN = r"""<{name}(?=[\s/>])((?:\s+[^\s"'>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?)*)\s*/?>"""
+_ATTRIBUTE_PATTERN = (
+    r"""([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?"""
+)
+_ATTRIBUTE_RE = {
+    str: re.compile(_ATTRIBUTE_PATTERN),
+    bytes: re.compile(_ATTRIBUTE_PATTERN.encode()),
+}
+_tag_res: dict[tuple[type, str], re.Pattern] = {}
+
+
+def _tag_re(page_type: type, name: str) -> re.Pattern:
+    key = (page_type, name)
+    if key not in _tag_res:
+        pattern = _TAG_PATTERN.format(name=re.escape(name))
+        if page_type is bytes:
+            pattern = pattern.encode()
+        _tag_res[key] = re.compile(pattern, re.IGNORECASE)
+    return _tag_res[key]
+
+
+def _parse_attributes(attributes, page_type: type) -> dict[str, str]:
+    parsed = {}
+    for match in _ATTRIBUTE_RE[page_type].finditer(attributes):
+        name, *values = match.groups()
+        value = next((value for value in values if value is not None), "")
+        if page_type is bytes:
+            name = name.decode("ascii", errors="replace")
+            value = value.decode("utf-8", errors="replace")
+        # the first occurrence of an attribute wins, as in browsers
+        parsed.setdefault(name.lower(), value)
+    return parsed
+
+
+def find_tag_attributes(
+    page: str | bytes,
+    name: str,
+    attributes: dict[str, str],
+    start: int = 0,
+    end: int | None = None,
+) -> tuple[dict[str, str], int] | None:
+    """Find the first tag `name` with the given attribute values.
+
+    Args:
+        page (str | bytes): The page, e.g. `response.content` or `response.text`.
+        name (str): The tag name.
+        attributes (dict[str, str]): Attribute values the tag must have (compared unescaped).
+        start (int, optional): Position to start searching at. Defaults to 0.
+        end (int | None, optional): Position to stop searching at. Defaults to the end of the page.
+
+    Returns:
+        tuple[dict[str, str], int] | None: The raw (still escaped) attributes of the tag and the
+        position after it, or None if there is no such tag.
+    """
+    page_type = type(page)
+    end = len(page) if end is None else end
+    for match in _tag_re(page_type, name).finditer(page, start, end):
+        tag_attributes = _parse_attributes(match.group(1), page_type)
+        if all(
+            html.unescape(tag_attributes.get(key, "")) == value
+            for key, value in attributes.items()
+        ):
+            return tag_attributes, match.end()
+    return None
+
+
+def get_tag_attribute(
+    page: str | bytes,
+    name: str,
+    attributes: dict[str, str],
+    attribute: str,
+    start: int = 0,
+    end: int | None = None,
+) -> str | None:
+    """Get an (unescaped) attribute of the first tag `name` with the given attribute values.
+
+    Returns None if there is no such tag or it lacks the attribute.
+    """
+    found = find_tag_attributes(page, name, attributes, start, end)
+    if found is None or attribute not in found[0]:
+        return None
+    return html.unescape(found[0][attribute])
+
+
+def get_csrf_token(page: str | bytes) -> str | None:
+    """Get the content of the csrf-token meta tag."""
+    return get_tag_attribute(page, "meta", {"name": "csrf-token"}, "content")
+
+
+def get_form_authenticity_token(page: str | bytes, action: str) -> str | None:
+    """Get the authenticity token input of the form posting to `action`."""
+    found = find_tag_attributes(page, "form", {"action": action})
+    if found is None:
+        return None
+    form_end = page.find(b"</form" if isinstance(page, bytes) else "</form", found[1])
+    return get_tag_attribute(
+        page,
+        "input",
+        {"name": "authenticity_token"},
+        "value",
+        start=found[1],
+        end=None if form_end == -1 else form_end,
+    )
+
+
+def get_react_props(page: str | bytes, react_class: str) -> str | None:
+    """Get the data-react-props JSON of the first element rendering `react_class`."""
+    return get_tag_attribute(
+        page, "div", {"data-react-class": react_class}, "data-react-props"
+    )
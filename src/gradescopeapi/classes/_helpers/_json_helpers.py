@@ -0,0 +1,105 @@
+"""Helpers for decoding the JSON embedded in and returned by Gradescope pages.
+
+The fastest installed backend is used: orjson or msgspec if installed
+(`pip install 'gradescopeapi[json]'`), otherwise the standard library.
+Payloads with a known schema are described by the TypedDicts below. With msgspec they are
+decoded straight into dictionaries holding only those keys, so the (often large) parts of the
+payload that are discarded anyway are skipped instead of being built and thrown away.
+Other backends return the complete payload, which has the same shape for the declared keys.
+"""
+
+import json
+from typing import Any, TypedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+elif msgspec is not None:
+    JSON_BACKEND = "msgspec"
+else:
+    JSON_BACKEND = "json"
+
+
+# data-react-props of the EditExtension rows of the extensions page
+# (fields are nullable on real pages, and msgspec rejects null for a plain `str`)
+class ExtensionProps(TypedDict, total=False):
+    override: dict[str, Any] | None
+    timezone: dict[str, Any] | None
+    deletePath: str | None
+    studentName: str | None
+
+
+class AssignmentsTableRow(TypedDict, total=False):
+    type: str | None
+    url: str | None
+    title: str | None
+    submission_window: dict[str, Any] | None
+    total_points: Any
+
+
+# data-react-props of the AssignmentsTable of the instructor course page
+class AssignmentsTableProps(TypedDict, total=False):
+    table_data: list[AssignmentsTableRow]
+
+
+# data-cm attribute of the roster rows
+class RosterMemberData(TypedDict, total=False):
+    full_name: str | None
+    first_name: str | None
+    last_name: str | None
+    sid: Any
+
+
+# submission JSON requested with only_keys[]=past_submissions
+class PastSubmissions(TypedDict, total=False):
+    past_submissions: list[dict[str, Any]]
+
+
+# submission JSON requested with only_keys[]=text_files
+class SubmissionTextFiles(TypedDict, total=False):
+    text_files: list[dict[str, Any]]
+
+
+_decoders: dict[Any, Any] = {}
+
+
+def _get_decoder(schema):
+    decoder = _decoders.get(schema)
+    if decoder is None:
+        decoder = _decoders[schema] = msgspec.json.Decoder(schema)
+    return decoder
+
+
+def loads(data: str | bytes, schema: Any | None = None) -> Any:
+    """Decode JSON, preferably from the raw bytes (e.g. `response.content`).
+
+    Args:
+        data (str | bytes): The JSON document.
+        schema (Any | None, optional): A TypedDict of the keys that are used. With msgspec, only
+            these keys are decoded; other backends ignore the schema. Defaults to None.
+
+    Returns:
+        Any: The decoded value.
+
+    Raises:
+        ValueError: If the document is not valid JSON (or does not match the schema).
+    """
+    if msgspec is not None and (schema is not None or orjson is None):
+        try:
+            if schema is None:
+                return msgspec.json.decode(data)
+            return _get_decoder(schema).decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -2,6 +2,10 @@ import requests
 from bs4 import BeautifulSoup
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._extract_helpers import (
+    get_csrf_token,
+    get_form_authenticity_token,
+)
 
 
 def get_auth_token_init_gradescope_session(
@@ -13,6 +17,10 @@ def get_auth_token_init_gradescope_session(
     """
     # go to homepage and set initial "_gradescope_session" cookie
     homepage_resp = session.get(gradescope_base_url)
+    auth_token = get_form_authenticity_token(homepage_resp.text, "/login")
+    if auth_token is not None:
+        return auth_token
+
     homepage_soup = BeautifulSoup(homepage_resp.text, "html.parser")
 
     # Find the authenticity token using CSS selectors
@@ -22,6 +30,33 @@ def get_auth_token_init_gradescope_session(
     return auth_token
 
 
+def is_session_valid(
+    session: requests.Session, gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL
+) -> bool:
+    """Check whether a session is still logged in, without following redirects.
+
+    Only a redirect (to the login page) or 401 means logged out. Other errors say nothing about
+    the session, so it is considered valid.
+    """
+    response = session.get(f"{gradescope_base_url}/account", allow_redirects=False)
+    return not (
+        300 <= response.status_code < 400
+        or response.status_code == requests.codes.unauthorized
+    )
+
+
+def get_page_csrf_token(
+    session: requests.Session, gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL
+) -> str:
+    """Get the CSRF token of the logged in session from the csrf-token meta tag of the account page."""
+    response = session.get(f"{gradescope_base_url}/account")
+    csrf_token = get_csrf_token(response.text)
+    if csrf_token is None:
+        soup = BeautifulSoup(response.text, "html.parser")
+        csrf_token = soup.select_one('meta[name="csrf-token"]')["content"]
+    return csrf_token
+
+
 def login_set_session_cookies(
     session: requests.Session,
     email: str,
@@ -53,8 +88,10 @@ def login_set_session_cookies(
     ):
         # update headers with csrf token
         # grab x-csrf-token
-        soup = BeautifulSoup(login_resp.text, "html.parser")
-        csrf_token = soup.select_one('meta[name="csrf-token"]')["content"]
+        csrf_token = get_csrf_token(login_resp.text)
+        if csrf_token is None:
+            soup = BeautifulSoup(login_resp.text, "html.parser")
+            csrf_token = soup.select_one('meta[name="csrf-token"]')["content"]
 
         # update session headers
         session.cookies.update(login_resp.cookies)
@@ -0,0 +1,231 @@
+"""Helpers for retrying transient Gradescope failures and failing fast while it is down.
+
+`RetryAdapter` is mounted on the session of every `GSConnection`, so all helpers making
+requests through that session get the same behaviour: idempotent requests (GET, HEAD, OPTIONS)
+are retried with exponential backoff and jitter on connection errors, timeouts and
+429/5xx responses, and a shared circuit breaker rejects requests immediately after
+repeated failures until Gradescope has had time to recover.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+import requests
+
+from gradescopeapi.classes._helpers._concurrency_helpers import RateLimitedAdapter
+
+# failures that are safe to retry for idempotent requests
+RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    pass
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 4  # including the first attempt
+    # the delay before retry n is up to backoff_factor_s * 2**(n - 1)
+    backoff_factor_s: float = 0.5
+    max_backoff_s: float = 30.0
+    max_elapsed_s: float = 120.0  # no retry is started after this much time
+    jitter: bool = True
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+    retry_methods: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def get_backoff(
+        self, retry_number: int, retry_after_s: float | None = None
+    ) -> float:
+        """Delay in seconds before the given retry (starting at 1)."""
+        backoff = min(
+            self.max_backoff_s, self.backoff_factor_s * 2 ** (retry_number - 1)
+        )
+        if self.jitter:
+            # "full jitter", spreads out retries of concurrent requests
+            backoff = random.uniform(0, backoff)
+        if retry_after_s is not None:
+            backoff = max(backoff, min(retry_after_s, self.max_backoff_s))
+        return backoff
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker tracking consecutive failures.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests
+    are rejected for `reset_timeout_s`. Then a single trial request is let through:
+    success closes the circuit again, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_progress = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if (
+                time.monotonic() - self._opened_at >= self.reset_timeout_s
+                and not self._trial_in_progress
+            ):
+                self._trial_in_progress = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_progress or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_progress = False
+
+    def record_neutral(self):
+        """Record an outcome that says nothing about the health of Gradescope, e.g. a 429.
+
+        Ends a trial request without changing the state, so another trial can be let through.
+        """
+        with self._lock:
+            self._trial_in_progress = False
+
+
+@dataclass
+class RetryMetrics:
+    requests: int = 0  # requests passed to the adapter
+    retries: int = 0  # extra attempts made
+    failures: int = 0  # requests that still failed after all attempts
+    short_circuited: int = 0  # requests rejected by the open circuit breaker
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def increment(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "failures": self.failures,
+                "short_circuited": self.short_circuited,
+            }
+
+
+def _get_retry_after_s(response: requests.Response) -> float | None:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        # missing, or an HTTP date, which Gradescope does not send
+        return None
+
+
+class RetryAdapter(RateLimitedAdapter):
+    """Transport adapter retrying idempotent requests according to a RetryPolicy.
+
+    Every attempt acquires the optional rate limiter, so retries count towards the request budget.
+    Requests with other methods are sent once, but still go through the circuit breaker.
+    """
+
+    def __init__(
+        self,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        metrics: RetryMetrics | None = None,
+        **kwargs,
+    ):
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.metrics = metrics or RetryMetrics()
+        super().__init__(**kwargs)
+
+    def send(self, request, *args, **kwargs):
+        policy = self.retry_policy
+        max_attempts = (
+            policy.max_attempts if request.method in policy.retry_methods else 1
+        )
+        self.metrics.increment("requests")
+        start_time = time.monotonic()
+        attempt = 1
+        while True:
+            if not self.circuit_breaker.allow_request():
+                self.metrics.increment("short_circuited")
+                raise CircuitOpenError(
+                    "Gradescope is failing repeatedly, not sending request",
+                    request=request,
+                )
+
+            response = None
+            try:
+                response = super().send(request, *args, **kwargs)
+            except RETRY_EXCEPTIONS as e:
+                self.circuit_breaker.record_failure()
+                error = e
+            except BaseException:
+                # not retried, but must still end a trial request of the circuit breaker
+                self.circuit_breaker.record_failure()
+                raise
+            else:
+                if response.status_code not in policy.retry_statuses:
+                    self.circuit_breaker.record_success()
+                    return response
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    # rate limited, Gradescope is up
+                    self.circuit_breaker.record_neutral()
+                error = None
+
+            delay = policy.get_backoff(
+                attempt, _get_retry_after_s(response) if response is not None else None
+            )
+            if (
+                attempt >= max_attempts
+                or time.monotonic() - start_time + delay > policy.max_elapsed_s
+            ):
+                self.metrics.increment("failures")
+                if error is not None:
+                    raise error
+                # let the caller handle the final error response
+                return response
+
+            if response is not None:
+                response.close()
+            self.metrics.increment("retries")
+            time.sleep(delay)
+            attempt += 1
+
+
+def mount_retry_adapter(
+    session: requests.Session,
+    retry_policy: RetryPolicy | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    metrics: RetryMetrics | None = None,
+) -> RetryAdapter:
+    """Mount a RetryAdapter for all HTTP(S) requests made through the session and return it."""
+    adapter = RetryAdapter(retry_policy, circuit_breaker, metrics)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
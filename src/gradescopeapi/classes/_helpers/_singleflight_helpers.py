@@ -0,0 +1,110 @@
+"""Helpers for coalescing concurrent identical reads into a single upstream request.
+
+While a read is in flight, other threads asking for the same key wait for it and
+share its result (or exception) instead of sending their own request. Waiting threads get
+their own copy of list and dict results, so callers can mutate what they get. Keys combine
+the URL with the identity of the logged in user, so users never share results.
+Nothing is cached: once the read completes, the next call fetches again.
+"""
+
+import contextlib
+import copy
+import hashlib
+import threading
+from collections.abc import Callable, Hashable
+from typing import TypeVar
+
+import requests
+
+T = TypeVar("T")
+
+# cookies identifying the logged in user of a session (not "_gradescope_session", which
+# changes with every response)
+IDENTITY_COOKIES = ("signed_token", "remember_me")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time, sharing its outcome with concurrent callers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.shared = 0  # number of calls that waited for another call's result
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return _copy_result(call.result)
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+def _copy_result(result: T) -> T:
+    # parsed results are plain containers, responses are shared as they are
+    if isinstance(result, (list, dict)):
+        return copy.deepcopy(result)
+    return result
+
+
+# shared by all sessions, keys are separated by user identity
+request_group = SingleFlight()
+
+
+def get_session_identity(session: requests.Session) -> str:
+    """Identify the user logged in to a session, without keeping the cookie values around."""
+    cookies = getattr(session, "cookies", ())
+    # the lock of the cookie jar, held while other threads update it from responses
+    with getattr(cookies, "_cookies_lock", None) or contextlib.nullcontext():
+        tokens = sorted(
+            f"{cookie.name}={cookie.value}"
+            for cookie in cookies
+            if cookie.name in IDENTITY_COOKIES
+        )
+    if not tokens:
+        # not logged in (or not a real session), only coalesce within this session
+        return f"session-{id(session)}"
+    return hashlib.sha256("\n".join(tokens).encode()).hexdigest()
+
+
+def coalesce(
+    session: requests.Session, url: str, func: Callable[[], T], kind: str = "response"
+) -> T:
+    """Call `func` unless the same `kind` of read of `url` by the same user is already in flight.
+
+    Args:
+        session (requests.Session): The session the read is made with.
+        url (str): The URL being read.
+        func (Callable[[], T]): Fetches (and parses) the URL.
+        kind (str, optional): Distinguishes different results derived from the same URL,
+            e.g. the raw response and a parsed result. Defaults to "response".
+
+    Returns:
+        T: The result of `func`. Concurrent callers get copies of list and dict results.
+    """
+    return request_group.do((kind, url, get_session_identity(session)), func)
@@ -1,27 +1,45 @@
+import logging
 import time
-from datetime import datetime
-import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from bs4 import BeautifulSoup
 from typing import Any
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
 from gradescopeapi.classes._helpers._assignment_helpers import (
     check_page_auth,
+    get_assignments_from_table_props,
     get_assignments_instructor_view,
     get_assignments_student_view,
+    get_question_grader_counts,
+    get_question_ids,
     get_submission_files,
 )
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    run_concurrently,
+)
 from gradescopeapi.classes._helpers._course_helpers import (
     get_course_members,
     get_courses_info,
+    get_latest_term_course_ids,
+)
+from gradescopeapi.classes._helpers._date_helpers import (
+    parse_date,
+    parse_date_in_timezone,
 )
+from gradescopeapi.classes._helpers._extract_helpers import get_react_props
+from gradescopeapi.classes._helpers._json_helpers import PastSubmissions, loads
+from gradescopeapi.classes._helpers._singleflight_helpers import coalesce
 from gradescopeapi.classes.assignments import Assignment
 from gradescopeapi.classes.member import Member
 from gradescopeapi.classes._helpers._assignment_helpers import (
     NotAuthorized,
-    get_user_submission_info,
+    get_submission_infos,
+    parse_review_grades,
 )
 from gradescopeapi.classes.courses import Course
 
+logger = logging.getLogger(__name__)
+
 
 class Account:
     def __init__(
@@ -33,10 +51,38 @@ class Account:
         self.gradescope_base_url = gradescope_base_url
         self.assignment_submission_cache: dict[str, dict[str, dict[str, Any]]] = {}
         # dict[str : dict[str:any]]
+        # filled by warmup
+        self.courses_cache: dict[str, dict[str, Course]] | None = None
+        self.assignments_cache: dict[str, Future] = {}
 
-    def get_courses(self) -> dict[str, dict[str, Course]]:
+    def warmup(self, max_workers: int = DEFAULT_MAX_WORKERS) -> list[str]:
+        """
+        Prefetch the courses, then fetch the assignments of the courses of the most recent term in the background.
+        Later get_courses and get_assignments calls return the prefetched results,
+        waiting for the background fetch if it is still in flight.
+        Returns:
+            list: The IDs of the courses whose assignments are being prefetched
+        Raises:
+            RuntimeError: If request to account page fails.
+        """
+        self.courses_cache = self.get_courses(force=True)
+        course_ids = get_latest_term_course_ids(self.courses_cache)
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gradescope-warmup"
+        )
+        for course_id in course_ids:
+            self.assignments_cache[course_id] = executor.submit(
+                self._fetch_assignments, course_id
+            )
+        # threads exit once the prefetches are done
+        executor.shutdown(wait=False)
+        return course_ids
+
+    def get_courses(self, force: bool = False) -> dict[str, dict[str, Course]]:
         """
         Get all courses for the user, including both instructor and student courses
+        The courses prefetched by warmup are returned unless force is True, which refetches and replaces them
 
         Returns:
             dict: A dictionary of dictionaries, where keys are "instructor" and "student" and values are
@@ -57,21 +103,29 @@ class Account:
         Raises:
             RuntimeError: If request to account page fails.
         """
+        if self.courses_cache is not None and not force:
+            return self.courses_cache
 
         endpoint = f"{self.gradescope_base_url}/account"
 
-        # get main page
-        response = self.session.get(endpoint)
+        def fetch_courses():
+            # get main page
+            response = self.session.get(endpoint)
 
-        if response.status_code != 200:
-            raise RuntimeError(
-                f"Failed to access account page on Gradescope. Status code: {response.status_code}"
-            )
+            if response.status_code != 200:
+                raise RuntimeError(
+                    f"Failed to access account page on Gradescope. Status code: {response.status_code}"
+                )
+
+            soup = BeautifulSoup(response.text, "html.parser")
 
-        soup = BeautifulSoup(response.text, "html.parser")
+            # see if user is solely a student or instructor
+            return get_courses_info(soup)
 
-        # see if user is solely a student or instructor
-        return get_courses_info(soup)
+        courses = coalesce(self.session, endpoint, fetch_courses, kind="courses")
+        if self.courses_cache is not None:
+            self.courses_cache = courses
+        return courses
 
     def get_course_users(self, course_id: str) -> list[Member]:
         """
@@ -94,21 +148,23 @@ class Account:
 
         session = self.session
 
-        try:
+        def fetch_users():
             # scrape page
             membership_resp = check_page_auth(session, membership_endpoint)
             membership_soup = BeautifulSoup(membership_resp.text, "html.parser")
 
             # get all users in the course
-            users = get_course_members(membership_soup, course_id)
+            return get_course_members(membership_soup, course_id)
 
-            return users
+        try:
+            return coalesce(session, membership_endpoint, fetch_users, kind="users")
         except Exception:
             return None
 
-    def get_assignments(self, course_id: str) -> list[Assignment]:
+    def get_assignments(self, course_id: str, force: bool = False) -> list[Assignment]:
         """
         Get a list of detailed assignment information for a course
+        The assignments prefetched by warmup are returned unless force is True, which refetches and replaces them
         Returns:
             list: A list of Assignments
         Raises:
@@ -120,28 +176,57 @@ class Account:
         # check that course_id is valid (not empty)
         if not course_id:
             raise Exception("Invalid Course ID")
+        prefetched = self.assignments_cache.get(course_id)
+        if prefetched is not None and not force:
+            try:
+                # waits for the prefetch if it is still in flight
+                return prefetched.result()
+            except Exception:
+                # prefetch failed, fetch again
+                self.assignments_cache.pop(course_id, None)
+        assignments = self._fetch_assignments(course_id)
+        if force:
+            # later calls return the refreshed assignments instead of the stale prefetch
+            refreshed = Future()
+            refreshed.set_result(assignments)
+            self.assignments_cache[course_id] = refreshed
+        return assignments
+
+    def _fetch_assignments(self, course_id: str) -> list[Assignment]:
         session = self.session
+        # this endpoint is only available if the user is a staff of the course
+        assignments_endpoint = (
+            f"{self.gradescope_base_url}/courses/{course_id}/assignments"
+        )
 
-        # scrape page
-        try:
-            # this endpoint is only available if the user is a staff of the course
-            course_endpoint = (
-                f"{self.gradescope_base_url}/courses/{course_id}/assignments"
+        def fetch_assignments():
+            # scrape page
+            try:
+                coursepage_resp = check_page_auth(session, assignments_endpoint)
+            except NotAuthorized:
+                # fall back to default course page if the user is a student
+                course_endpoint = f"{self.gradescope_base_url}/courses/{course_id}"
+                coursepage_resp = check_page_auth(session, course_endpoint)
+            # the instructor view only needs the props of one element, skip building a DOM
+            assignment_info_list = get_assignments_from_table_props(
+                get_react_props(coursepage_resp.text, "AssignmentsTable")
             )
-            coursepage_resp = check_page_auth(session, course_endpoint)
-        except NotAuthorized:
-            # fall back to default course page if the user is a student
-            course_endpoint = f"{self.gradescope_base_url}/courses/{course_id}"
-            coursepage_resp = check_page_auth(session, course_endpoint)
-        coursepage_soup = BeautifulSoup(coursepage_resp.text, "html.parser")
+            if assignment_info_list:
+                return assignment_info_list
+
+            coursepage_soup = BeautifulSoup(coursepage_resp.text, "html.parser")
 
-        # two different helper functions to parse assignment info
-        # webpage html structure differs based on if user if instructor or student
-        assignment_info_list = get_assignments_instructor_view(coursepage_soup)
-        if not assignment_info_list:
-            assignment_info_list = get_assignments_student_view(coursepage_soup)
+            # two different helper functions to parse assignment info
+            # webpage html structure differs based on if user if instructor or student
+            assignment_info_list = get_assignments_instructor_view(coursepage_soup)
+            if not assignment_info_list:
+                assignment_info_list = get_assignments_student_view(coursepage_soup)
 
-        return assignment_info_list
+            return assignment_info_list
+
+        return coalesce(
+            session, assignments_endpoint, fetch_assignments, kind="assignments"
+        )
 
     def get_assignment_submissions(
         self, course_id: str, assignment_id: str
@@ -178,11 +263,11 @@ class Account:
             raise Exception("One or more invalid parameters")
         session = self.session
         submissions_resp = check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
-        submissions_soup = BeautifulSoup(submissions_resp.text, "html.parser")
-        # select submissions (class of td.table--primaryLink a tag, submission id stored in href link)
-        submissions_a_tags = submissions_soup.select("td.table--primaryLink a")
+        # submission id stored in href link of the td.table--primaryLink a tag
         submission_ids = [
-            a_tag.attrs.get("href").split("/")[-1] for a_tag in submissions_a_tags
+            record["submission_id"]
+            for record in parse_review_grades(submissions_resp.text)
+            if record["submission_id"] is not None
         ]
         submission_links = {}
         for submission_id in submission_ids:  # doesn't support image submissions yet
@@ -195,7 +280,11 @@ class Account:
         return submission_links
 
     def get_assignment_submissions_for_each_users(
-        self, course_id: str, assignment_id: str, get_past_submissions: bool = False
+        self,
+        course_id: str,
+        assignment_id: str,
+        get_past_submissions: bool = False,
+        include_links: bool = True,
     ):
 
         students = [
@@ -205,7 +294,7 @@ class Account:
         if get_past_submissions:
             return [
                 self.get_assignment_all_submissions(
-                    course_id, assignment_id, student.email
+                    course_id, assignment_id, student.email, include_links
                 )
                 for student in students
                 if student.email in info_dict
@@ -213,7 +302,7 @@ class Account:
         else:
             return [
                 self.get_assignment_active_submission(
-                    course_id, assignment_id, student.email
+                    course_id, assignment_id, student.email, include_links
                 )
                 for student in students
                 if student.email in info_dict
@@ -249,18 +338,18 @@ class Account:
             raise Exception("One or more invalid parameters")
         session = self.session
         submissions_resp = check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
-        submissions_soup = BeautifulSoup(submissions_resp.text, "html.parser")
-        td_with_email = submissions_soup.find(
-            "td", string=lambda s: student_email in str(s)
+        record = next(
+            (
+                record
+                for record in parse_review_grades(submissions_resp.text)
+                if student_email in (record.get("email") or "")
+            ),
+            None,
         )
-        if td_with_email:
-            # grab submission from previous td
-            submission_td = td_with_email.find_previous_sibling()
-            # submission_td will have an anchor element as a child if there is a submission
-            a_element = submission_td.find("a")
-            if a_element:
-                submission_id = a_element.get("href").split("/")[-1]
-            else:
+        if record:
+            # the primary link column has an anchor element if there is a submission
+            submission_id = record["submission_id"]
+            if submission_id is None:
                 raise Exception("No submission found")
             # call get_submission_files helper function
             aws_links = get_submission_files(
@@ -273,8 +362,7 @@ class Account:
     def get_assignment_submission_infos(
         self, course_id: str, assignment_id: str, force=False
     ) -> dict[str, Any]:
-        if course_id not in self.assignment_submission_cache:
-            self.assignment_submission_cache[course_id] = {}
+        self.assignment_submission_cache.setdefault(course_id, {})
         if assignment_id in self.assignment_submission_cache[course_id] and not force:
             return self.assignment_submission_cache[course_id][assignment_id]
 
@@ -283,103 +371,41 @@ class Account:
         if not course_id or not assignment_id:
             raise Exception("One or more invalid parameters")
         session = self.session
-        submissions_resp = check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
-        submissions_soup = BeautifulSoup(submissions_resp.text, "html.parser")
-        submission_tds = submissions_soup.select("td.table--primaryLink")
-        submission_tds_filtered = []
-        submit_id_set = set()
-        for td in submission_tds:
-            tag = td.find("a")
-            if tag is not None:
-                href = tag.attrs.get("href")
-                if href is not None:
-                    td_sub_id = href.split("/")[-1]
-                    if "," not in tag.text and td_sub_id not in submit_id_set:
-                        submit_id_set.add(td_sub_id)
-                        submission_tds_filtered.append(td)
-
-        submissions_tds = [
-            [td] + td.find_next_siblings("td") for td in submission_tds_filtered
-        ]
-        submission_infos = [get_user_submission_info(tds) for tds in submissions_tds]
-        self.assignment_submission_cache[course_id][assignment_id] = {
-            info["email"]: info for info in submission_infos
-        }
-        return self.assignment_submission_cache[course_id][assignment_id]
-
-    def get_assignment_active_submission(
-        self, course_id: str, assignment_id: str, student_email: str
-    ):
-
-        info_dict = self.get_assignment_submission_infos(course_id, assignment_id)
-        if student_email not in info_dict:
-            return None
-        info = info_dict[student_email]
-        ASSIGNMENT_ENDPOINT = f"{self.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
-        ASSIGNMENT_SUBMISSIONS_ENDPOINT = f"{ASSIGNMENT_ENDPOINT}/review_grades"
-        session = self.session
-        check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
 
-        submission_link = f"{ASSIGNMENT_ENDPOINT}/submissions/{info['submissions'][0]['submission_id']}.json?content=react&only_keys%5B%5D=past_submissions"
-        submission_histories = json.loads(session.get(submission_link).text)[
-            "past_submissions"
-        ]
-        active_submission = [
-            hist
-            for hist in submission_histories
-            if [owner for owner in hist["owners"] if owner["name"] == info["name"]][0][
-                "active"
-            ]
-        ][0]
-        active_submission_tz = datetime.fromisoformat(
-            info["submissions"][0]["datetime"]
-        ).tzinfo
-        sub_time = datetime.fromisoformat(active_submission["created_at"]).astimezone(
-            active_submission_tz
+        def fetch_infos():
+            submissions_resp = check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
+            # plain records only, no soup of the (possibly huge) page is kept alive
+            return get_submission_infos(parse_review_grades(submissions_resp.text))
+
+        # concurrent callers (e.g. bulk paths) share one fetch of the review_grades page
+        self.assignment_submission_cache[course_id][assignment_id] = coalesce(
+            session,
+            ASSIGNMENT_SUBMISSIONS_ENDPOINT,
+            fetch_infos,
+            kind="submission_infos",
         )
-        active_submission["is_active"] = True
-        active_submission["datetime"] = sub_time.isoformat()
-        active_submission["epochtime_s"] = int(sub_time.timestamp())
-        active_submission["gradescope_submission_link"] = (
-            f"{ASSIGNMENT_ENDPOINT}/submissions/{active_submission['id']}"
-        )
-        active_submission["name"] = info["name"]
-        active_submission["email"] = info["email"]
-        del active_submission["show_path"]
-        del active_submission["activate_path"]
-        del active_submission["active"]
-        try:
-            active_submission["links"] = get_submission_files(
-                session, course_id, assignment_id, active_submission["id"]
-            )
-        except Exception as e:
-            print(f"Exception occured: {e}")
-            pass
-        return active_submission
+        return self.assignment_submission_cache[course_id][assignment_id]
 
-    def get_assignment_all_submissions(
+    def _get_submission_history(
         self, course_id: str, assignment_id: str, student_email: str
-    ):
+    ) -> list[dict[str, Any]] | None:
+        """
+        Fetch the past_submissions JSON of a student once and normalize every version.
+        Returns None if the student has no submission.
+        """
         info_dict = self.get_assignment_submission_infos(course_id, assignment_id)
         if student_email not in info_dict:
             return None
         info = info_dict[student_email]
         ASSIGNMENT_ENDPOINT = f"{self.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
-        ASSIGNMENT_SUBMISSIONS_ENDPOINT = f"{ASSIGNMENT_ENDPOINT}/review_grades"
-        session = self.session
-        check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
 
         submission_link = f"{ASSIGNMENT_ENDPOINT}/submissions/{info['submissions'][0]['submission_id']}.json?content=react&only_keys%5B%5D=past_submissions"
-        submission_histories = json.loads(session.get(submission_link).text)[
-            "past_submissions"
-        ]
-        submission_tz = datetime.fromisoformat(
-            info["submissions"][0]["datetime"]
-        ).tzinfo
+        submission_histories = loads(
+            self.session.get(submission_link).text, PastSubmissions
+        )["past_submissions"]
+        submission_tz = parse_date(info["submissions"][0]["datetime"]).tzinfo
         for submission in submission_histories:
-            sub_time = datetime.fromisoformat(submission["created_at"]).astimezone(
-                submission_tz
-            )
+            sub_time = parse_date_in_timezone(submission["created_at"], submission_tz)
             submission["datetime"] = sub_time.isoformat()
             submission["epochtime_s"] = sub_time.timestamp()
             submission["gradescope_submission_link"] = (
@@ -393,13 +419,85 @@ class Account:
             del submission["show_path"]
             del submission["activate_path"]
             del submission["active"]
-            try:
-                submission["links"] = get_submission_files(
-                    session, course_id, assignment_id, submission["id"]
+        return submission_histories
+
+    def _add_submission_links(
+        self,
+        course_id: str,
+        assignment_id: str,
+        submissions: list[dict[str, Any]],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        """
+        Look up the file links of each submission concurrently and store them under "links"
+        """
+        links, errors = run_concurrently(
+            lambda submission_id: get_submission_files(
+                self.session,
+                course_id,
+                assignment_id,
+                submission_id,
+                self.gradescope_base_url,
+            ),
+            [submission["id"] for submission in submissions],
+            max_workers=max_workers,
+        )
+        for submission in submissions:
+            if submission["id"] in links:
+                submission["links"] = links[submission["id"]]
+            else:
+                logger.warning(
+                    "Failed to get the files of submission %s",
+                    submission["id"],
+                    exc_info=errors[submission["id"]],
                 )
-            except Exception as e:
-                print(f"Exception occured: {e}")
-                pass
+
+    def get_assignment_active_submission(
+        self,
+        course_id: str,
+        assignment_id: str,
+        student_email: str,
+        include_links: bool = True,
+    ):
+        """
+        Get the active submission of a student, or None if the student has no submission.
+        If include_links is False, the file links of the submission are not looked up.
+        """
+        submission_histories = self._get_submission_history(
+            course_id, assignment_id, student_email
+        )
+        if submission_histories is None:
+            return None
+        active_submission = [
+            submission for submission in submission_histories if submission["is_active"]
+        ][0]
+        active_submission["epochtime_s"] = int(active_submission["epochtime_s"])
+        if include_links:
+            self._add_submission_links(course_id, assignment_id, [active_submission])
+        return active_submission
+
+    def get_assignment_all_submissions(
+        self,
+        course_id: str,
+        assignment_id: str,
+        student_email: str,
+        include_links: bool = True,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        """
+        Get all submissions (versions) of a student, or None if the student has no submission.
+        The active submission is marked with "is_active".
+        The file links of all versions are looked up concurrently, unless include_links is False.
+        """
+        submission_histories = self._get_submission_history(
+            course_id, assignment_id, student_email
+        )
+        if submission_histories is None:
+            return None
+        if include_links:
+            self._add_submission_links(
+                course_id, assignment_id, submission_histories, max_workers
+            )
         return submission_histories
 
     def get_assignment_graders(self, course_id: str, question_id: str) -> set[str]:
@@ -420,18 +518,70 @@ class Account:
                 "You must be logged in to access this page.": if no user is logged in
                 "Page not Found": When link is invalid: change in url, invalid course_if or assignment id
         """
+        if not course_id or not question_id:
+            raise Exception("One or more invalid parameters")
+        return set(self._get_question_grader_counts(course_id, question_id))
+
+    def _get_question_grader_counts(
+        self, course_id: str, question_id: str
+    ) -> dict[str, int]:
         QUESTION_ENDPOINT = (
             f"{self.gradescope_base_url}/courses/{course_id}/questions/{question_id}"
         )
         ASSIGNMENT_SUBMISSIONS_ENDPOINT = f"{QUESTION_ENDPOINT}/submissions"
-        if not course_id or not question_id:
-            raise Exception("One or more invalid parameters")
-        session = self.session
-        submissions_resp = check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
+        submissions_resp = check_page_auth(
+            self.session, ASSIGNMENT_SUBMISSIONS_ENDPOINT
+        )
         submissions_soup = BeautifulSoup(submissions_resp.text, "html.parser")
-        # select graders (class of td tag, grader name stored in text)
-        graders = submissions_soup.select("td")[2::3]
-        grader_names = set(
-            [grader.text for grader in graders if grader.text]
-        )  # get non-empty grader names
-        return grader_names
+        return get_question_grader_counts(submissions_soup)
+
+    def get_assignment_graders_matrix(
+        self,
+        course_id: str,
+        assignment_id: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Get the number of submissions graded by each grader for every question in an assignment.
+        The submissions pages of all questions are fetched concurrently.
+        Returns:
+            dict: A dictionary with the grader counts per question and the total counts per grader
+            For example:
+                {
+                    'questions': {
+                        'question_id1': {'grader1': 10, 'grader2': 5},
+                        'question_id2': {'grader1': 15},
+                    },
+                    'totals': {'grader1': 25, 'grader2': 5},
+                }
+        Raises:
+            Exceptions:
+                "One or more invalid parameters": if course_id or assignment_id is null or empty value
+                "You are not authorized to access this page.": if logged in user is unable to access submissions
+                "You must be logged in to access this page.": if no user is logged in
+                "Page not Found": When link is invalid: change in url, invalid course_if or assignment id
+        """
+        if not course_id or not assignment_id:
+            raise Exception("One or more invalid parameters")
+        GRADE_ENDPOINT = f"{self.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/grade"
+        grade_resp = check_page_auth(self.session, GRADE_ENDPOINT)
+        question_ids = get_question_ids(grade_resp.text, course_id)
+
+        grader_counts, errors = run_concurrently(
+            lambda question_id: self._get_question_grader_counts(
+                course_id, question_id
+            ),
+            question_ids,
+            max_workers=max_workers,
+        )
+        if errors:
+            raise next(iter(errors.values()))
+
+        questions = {
+            question_id: grader_counts[question_id] for question_id in question_ids
+        }
+        totals = {}
+        for counts in questions.values():
+            for grader, count in counts.items():
+                totals[grader] = totals.get(grader, 0) + count
+        return {"questions": questions, "totals": totals}
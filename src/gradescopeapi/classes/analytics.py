@@ -0,0 +1,239 @@
+"""Functions for computing deadline and lateness statistics for a whole course at once.
+
+Submission times, assignment deadlines and per-student extensions are loaded into
+students x assignments arrays, so effective deadlines, minutes late, late day usage
+and on time/late/past late due/missing classification are computed in vectorized form.
+
+Requires the `analytics` extra (NumPy).
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    run_concurrently,
+)
+from gradescopeapi.classes.account import Account
+from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.extensions import Extension, get_extensions
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Lateness analytics require NumPy. Install it with: pip install 'gradescopeapi[analytics]'"
+    ) from e
+
+# submission status codes used in LatenessReport.status
+ON_TIME = 0
+LATE = 1
+MISSING = 2
+PAST_LATE_DUE = 3  # submitted after the (effective) late due date
+
+
+@dataclass
+class LatenessReport:
+    emails: list[str]  # row labels
+    assignment_ids: list[str]  # column labels
+    # all arrays have shape (num students, num assignments), times are epoch seconds
+    # effective deadlines include extensions
+    due_dates_s: np.ndarray  # effective due date, NaN if none
+    late_due_dates_s: np.ndarray  # effective late due date, NaN if none
+    submitted_s: np.ndarray  # time of the active submission, NaN if missing
+    minutes_late: np.ndarray  # 0 if on time, NaN if missing
+    late_days: np.ndarray  # late days consumed, NaN if missing
+    status: np.ndarray  # ON_TIME, LATE, PAST_LATE_DUE or MISSING
+
+    def late_days_per_student(self) -> dict[str, int]:
+        """Total late days consumed by each student across all assignments."""
+        totals = np.nansum(self.late_days, axis=1)
+        return {email: int(total) for email, total in zip(self.emails, totals)}
+
+    def status_counts(self) -> dict[str, dict[str, int]]:
+        """Number of on time, late, past late due and missing submissions per assignment."""
+        return {
+            assignment_id: {
+                "on_time": int(np.count_nonzero(self.status[:, j] == ON_TIME)),
+                "late": int(np.count_nonzero(self.status[:, j] == LATE)),
+                "past_late_due": int(
+                    np.count_nonzero(self.status[:, j] == PAST_LATE_DUE)
+                ),
+                "missing": int(np.count_nonzero(self.status[:, j] == MISSING)),
+            }
+            for j, assignment_id in enumerate(self.assignment_ids)
+        }
+
+
+def _timestamp(date) -> float:
+    return date.timestamp() if date is not None else np.nan
+
+
+def _index(indices: list[int]) -> np.ndarray:
+    # explicit dtype so empty lists are still valid indices
+    return np.asarray(indices, dtype=np.intp)
+
+
+def compute_lateness(
+    assignments: list[Assignment],
+    submission_infos: dict[str, dict[str, dict[str, Any]]],
+    emails: list[str],
+    extensions: dict[str, dict[str, Extension]] | None = None,
+    user_id_to_email: dict[str, str] | None = None,
+    grace_minutes: float = 0,
+    late_day_minutes: float = 24 * 60,
+) -> LatenessReport:
+    """Compute effective deadlines and lateness for every (student, assignment) pair.
+
+    Args:
+        assignments (list[Assignment]): The assignments (columns), as returned by `Account.get_assignments`.
+        submission_infos (dict[str, dict[str, dict[str, Any]]]): Maps assignment IDs to the result of
+            `Account.get_assignment_submission_infos` for that assignment.
+        emails (list[str]): The emails of the students (rows).
+        extensions (dict[str, dict[str, Extension]] | None, optional): Maps assignment IDs to the result of
+            `get_extensions` for that assignment. Defaults to None.
+        user_id_to_email (dict[str, str] | None, optional): Maps user IDs to emails, needed to match
+            extensions (keyed by user ID) to students. Defaults to None.
+        grace_minutes (float, optional): Submissions at most this late count as on time. Defaults to 0.
+        late_day_minutes (float, optional): Length of a late day in minutes. Defaults to 24 hours.
+
+    Returns:
+        LatenessReport: The lateness of every student for every assignment.
+    """
+    row_index = {email: i for i, email in enumerate(emails)}
+    assignment_ids = [assignment.assignment_id for assignment in assignments]
+    shape = (len(emails), len(assignments))
+
+    # assignment deadlines, broadcast to every student
+    due_dates_s = np.empty(shape)
+    due_dates_s[:] = [_timestamp(assignment.due_date) for assignment in assignments]
+    late_due_dates_s = np.empty(shape)
+    late_due_dates_s[:] = [
+        _timestamp(assignment.late_due_date or assignment.due_date)
+        for assignment in assignments
+    ]
+
+    # collect extension overrides and submission times as index arrays
+    due_rows, due_cols, due_values = [], [], []
+    late_rows, late_cols, late_values = [], [], []
+    submission_rows, submission_cols, submission_values = [], [], []
+    for j, assignment_id in enumerate(assignment_ids):
+        for user_id, extension in (extensions or {}).get(assignment_id, {}).items():
+            i = row_index.get((user_id_to_email or {}).get(user_id))
+            if i is None:
+                continue
+            if extension.due_date is not None:
+                due_rows.append(i)
+                due_cols.append(j)
+                due_values.append(extension.due_date.timestamp())
+            if extension.late_due_date is not None:
+                late_rows.append(i)
+                late_cols.append(j)
+                late_values.append(extension.late_due_date.timestamp())
+
+        for email, info in submission_infos.get(assignment_id, {}).items():
+            i = row_index.get(email)
+            epochtime_s = info["submissions"][0].get("epochtime_s")
+            if i is not None and epochtime_s is not None:
+                submission_rows.append(i)
+                submission_cols.append(j)
+                submission_values.append(epochtime_s)
+
+    due_dates_s[_index(due_rows), _index(due_cols)] = due_values
+    late_due_dates_s[_index(late_rows), _index(late_cols)] = late_values
+    # an extended due date past the late due date also extends the late due date
+    late_due_dates_s = np.fmax(late_due_dates_s, due_dates_s)
+
+    submitted_s = np.full(shape, np.nan)
+    submitted_s[_index(submission_rows), _index(submission_cols)] = submission_values
+
+    # NaN due dates (no deadline) propagate to NaN here and are treated as on time
+    minutes_late = np.maximum(submitted_s - due_dates_s, 0) / 60
+    minutes_late[~np.isnan(submitted_s) & np.isnan(due_dates_s)] = 0
+    minutes_late[minutes_late <= grace_minutes] = 0
+
+    late_days = np.ceil(minutes_late / late_day_minutes)
+
+    status = np.full(shape, ON_TIME, dtype=np.int8)
+    status[minutes_late > 0] = LATE
+    # only where late submissions are allowed, i.e. the late due date is past the due date
+    # (NaN deadlines compare False, so those stay on time or late)
+    minutes_past_late_due = (submitted_s - late_due_dates_s) / 60
+    status[
+        (minutes_late > 0)
+        & (late_due_dates_s > due_dates_s)
+        & (minutes_past_late_due > grace_minutes)
+    ] = PAST_LATE_DUE
+    status[np.isnan(submitted_s)] = MISSING
+
+    return LatenessReport(
+        emails=list(emails),
+        assignment_ids=assignment_ids,
+        due_dates_s=due_dates_s,
+        late_due_dates_s=late_due_dates_s,
+        submitted_s=submitted_s,
+        minutes_late=minutes_late,
+        late_days=late_days,
+        status=status,
+    )
+
+
+def get_course_lateness(
+    account: Account,
+    course_id: str,
+    grace_minutes: float = 0,
+    late_day_minutes: float = 24 * 60,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> LatenessReport:
+    """Fetch the assignments, roster, submissions and extensions of a course and compute its lateness report.
+
+    Submissions and extensions of all assignments are fetched concurrently. ONLY FOR INSTRUCTORS.
+
+    Raises:
+        RuntimeError: If the course roster can't be fetched.
+    """
+    assignments = [
+        assignment
+        for assignment in account.get_assignments(course_id)
+        if assignment.assignment_id is not None
+    ]
+    members = account.get_course_users(course_id)
+    if members is None:
+        raise RuntimeError(f"Failed to get members of course {course_id}")
+    students = [member for member in members if member.role == "Student"]
+
+    def fetch(assignment_id: str):
+        return (
+            account.get_assignment_submission_infos(course_id, assignment_id),
+            get_extensions(
+                account.session,
+                course_id,
+                assignment_id,
+                gradescope_base_url=account.gradescope_base_url,
+            ),
+        )
+
+    results, errors = run_concurrently(
+        fetch,
+        [assignment.assignment_id for assignment in assignments],
+        max_workers=max_workers,
+    )
+    if errors:
+        raise next(iter(errors.values()))
+
+    return compute_lateness(
+        assignments,
+        {assignment_id: infos for assignment_id, (infos, _) in results.items()},
+        [student.email for student in students],
+        extensions={
+            assignment_id: extensions
+            for assignment_id, (_, extensions) in results.items()
+        },
+        user_id_to_email={
+            student.user_id: student.email
+            for student in students
+            if student.user_id is not None
+        },
+        grace_minutes=grace_minutes,
+        late_day_minutes=late_day_minutes,
+    )
@@ -0,0 +1,364 @@
+"""Content-addressed local archive of downloaded submission files.
+
+The signed download links of `get_submission_files` change on every request, so they cannot be
+used as cache keys. The archive keys files by (submission ID, file path) instead and stores their
+contents by SHA-256, so identical files (e.g. unchanged starter code) are stored once. Submissions
+cannot be changed on Gradescope, so an archived submission is never downloaded again.
+
+Layout of the archive directory:
+    objects/<first 2 hex digits>/<sha256>  contents of the files
+    submissions/<submission ID>.json       manifest of a submission: file path -> sha256
+
+The modification time of a manifest records when the submission was last used, for the LRU
+garbage collection. An archive directory should only be used by one process at a time.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+import requests
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    download_text_file,
+    get_submission_text_files,
+)
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    run_concurrently,
+)
+from gradescopeapi.classes._helpers._singleflight_helpers import coalesce
+
+CHUNK_SIZE = 1 << 16
+# files at least this large are memory-mapped by SubmissionArchive.read
+DEFAULT_MMAP_THRESHOLD = 1 << 20
+
+
+class ArchiveIntegrityError(Exception):
+    pass
+
+
+def _map(object_path: Path) -> mmap.mmap:
+    with open(object_path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class SubmissionArchive:
+    """Local archive of submission files.
+
+    Args:
+        root (str | os.PathLike): The archive directory, created if missing.
+        max_bytes (int | None, optional): If set, least recently used submissions are removed
+            after every fetch until the stored files take at most this many bytes. Defaults to None.
+    """
+
+    def __init__(self, root: str | os.PathLike, max_bytes: int | None = None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.objects_dir = self.root / "objects"
+        self.submissions_dir = self.root / "submissions"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.submissions_dir.mkdir(parents=True, exist_ok=True)
+        # serializes adding submissions with garbage collection
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _manifest_path(self, submission_id: str) -> Path:
+        return self.submissions_dir / f"{submission_id}.json"
+
+    def __contains__(self, submission_id: str) -> bool:
+        return self._manifest_path(submission_id).exists()
+
+    def get_manifest(self, submission_id: str) -> dict[str, str] | None:
+        """Get the file paths and hashes of an archived submission, or None if it is not archived."""
+        manifest_path = self._manifest_path(submission_id)
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            os.utime(manifest_path)  # mark as recently used
+        except FileNotFoundError:
+            return None
+        return manifest
+
+    def _stage(self, chunks: Iterable[bytes]) -> tuple[str, str]:
+        # write to a temporary file next to the objects, hashing on the way
+        fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir, prefix=".tmp-")
+        sha256 = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    sha256.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return tmp_path, sha256.hexdigest()
+
+    def _commit_object(self, tmp_path: str, digest: str):
+        object_path = self._object_path(digest)
+        if object_path.exists():
+            os.unlink(tmp_path)  # already stored for another file
+        else:
+            object_path.parent.mkdir(exist_ok=True)
+            os.replace(tmp_path, object_path)
+
+    def put(
+        self, submission_id: str, files: dict[str, bytes | Iterable[bytes]]
+    ) -> dict[str, str]:
+        """Archive the files of a submission, given as contents or chunks by file path.
+
+        Returns:
+            dict[str, str]: The manifest of the submission, file path -> sha256.
+        """
+        staged = {}
+        try:
+            for path, content in files.items():
+                chunks = [content] if isinstance(content, bytes) else content
+                staged[path] = self._stage(chunks)
+        except BaseException:
+            self._discard(staged)
+            raise
+        return self._commit(submission_id, staged)
+
+    def _discard(self, staged: dict[str, tuple[str, str]]):
+        for tmp_path, _ in staged.values():
+            os.unlink(tmp_path)
+
+    def _commit(
+        self, submission_id: str, staged: dict[str, tuple[str, str]]
+    ) -> dict[str, str]:
+        manifest = {path: digest for path, (_, digest) in staged.items()}
+        manifest_path = self._manifest_path(submission_id)
+        tmp_manifest_path = manifest_path.with_suffix(".json.tmp")
+        with self._lock:
+            for tmp_path, digest in staged.values():
+                self._commit_object(tmp_path, digest)
+            with open(tmp_manifest_path, "w") as f:
+                json.dump(manifest, f)
+            os.replace(tmp_manifest_path, manifest_path)
+        return manifest
+
+    def _get_digest(self, submission_id: str, path: str) -> str:
+        manifest = self.get_manifest(submission_id)
+        if manifest is None:
+            raise KeyError(f"Submission {submission_id} is not archived")
+        if path not in manifest:
+            raise KeyError(f"Submission {submission_id} has no file {path}")
+        return manifest[path]
+
+    def open_mmap(self, submission_id: str, path: str) -> mmap.mmap:
+        """Memory-map an archived file read-only. Empty files cannot be mapped."""
+        return _map(self._object_path(self._get_digest(submission_id, path)))
+
+    def read(
+        self,
+        submission_id: str,
+        path: str,
+        verify: bool = False,
+        mmap_threshold: int | None = DEFAULT_MMAP_THRESHOLD,
+    ) -> bytes | mmap.mmap:
+        """Read an archived file.
+
+        Args:
+            submission_id (str): The ID of the submission.
+            path (str): The path of the file within the submission.
+            verify (bool, optional): Whether to check the contents against their hash. Defaults to False.
+            mmap_threshold (int | None, optional): Files of at least this many bytes are returned
+                memory-mapped instead of read into memory. None never maps. Defaults to 1 MiB.
+
+        Returns:
+            bytes | mmap.mmap: The contents of the file.
+
+        Raises:
+            KeyError: If the submission is not archived or has no such file.
+            ArchiveIntegrityError: If `verify` is set and the contents do not match their hash.
+        """
+        digest = self._get_digest(submission_id, path)
+        object_path = self._object_path(digest)
+        if mmap_threshold is not None and object_path.stat().st_size >= max(
+            mmap_threshold, 1
+        ):
+            data = _map(object_path)
+        else:
+            data = object_path.read_bytes()
+        if verify and hashlib.sha256(data).hexdigest() != digest:
+            raise ArchiveIntegrityError(
+                f"File {path} of submission {submission_id} is corrupted"
+            )
+        return data
+
+    def verify(self, submission_id: str) -> list[str]:
+        """Check the files of an archived submission against their hashes.
+
+        Returns:
+            list[str]: The paths of missing or corrupted files.
+        """
+        manifest = self.get_manifest(submission_id)
+        if manifest is None:
+            raise KeyError(f"Submission {submission_id} is not archived")
+        corrupted = []
+        for path, digest in manifest.items():
+            sha256 = hashlib.sha256()
+            try:
+                with open(self._object_path(digest), "rb") as f:
+                    while chunk := f.read(CHUNK_SIZE):
+                        sha256.update(chunk)
+            except FileNotFoundError:
+                corrupted.append(path)
+                continue
+            if sha256.hexdigest() != digest:
+                corrupted.append(path)
+        return corrupted
+
+    def size(self) -> int:
+        """Number of bytes taken by the stored files."""
+        return sum(
+            object_path.stat().st_size
+            for object_path in self.objects_dir.glob("*/*")
+            if object_path.is_file()
+        )
+
+    def gc(self, max_bytes: int | None = None, keep: Iterable[str] = ()) -> list[str]:
+        """Remove least recently used submissions until the stored files fit in `max_bytes`.
+
+        Files no longer used by any submission are removed as well.
+
+        Args:
+            max_bytes (int | None, optional): Defaults to the `max_bytes` of the archive, or
+                only removing unused files if that is not set either.
+            keep (Iterable[str], optional): IDs of submissions that are never removed. Defaults to ().
+
+        Returns:
+            list[str]: The IDs of the removed submissions.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        keep = {self._manifest_path(submission_id) for submission_id in keep}
+        with self._lock:
+            manifest_paths = sorted(
+                self.submissions_dir.glob("*.json"),
+                key=lambda manifest_path: manifest_path.stat().st_mtime,
+            )
+            manifests = {}
+            for manifest_path in manifest_paths:
+                with open(manifest_path) as f:
+                    manifests[manifest_path] = set(json.load(f).values())
+
+            object_sizes = {
+                object_path.name: object_path.stat().st_size
+                for object_path in self.objects_dir.glob("*/*")
+                if object_path.is_file()
+            }
+            references: dict[str, int] = {}
+            for digests in manifests.values():
+                for digest in digests:
+                    references[digest] = references.get(digest, 0) + 1
+            size = sum(object_sizes.get(digest, 0) for digest in references)
+
+            removed = []
+            for manifest_path, digests in manifests.items():
+                if max_bytes is None or size <= max_bytes:
+                    break
+                if manifest_path in keep:
+                    continue
+                manifest_path.unlink()
+                removed.append(manifest_path.stem)
+                for digest in digests:
+                    references[digest] -= 1
+                    if references[digest] == 0:
+                        size -= object_sizes.get(digest, 0)
+
+            for digest in object_sizes:
+                if references.get(digest, 0) == 0:
+                    self._object_path(digest).unlink()
+        return removed
+
+    def fetch(
+        self,
+        session: requests.Session,
+        course_id: str,
+        assignment_id: str,
+        submission_id: str,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    ) -> dict[str, str]:
+        """Download the files of a submission into the archive, unless it is archived already.
+
+        Returns:
+            dict[str, str]: The manifest of the submission, file path -> sha256.
+
+        Raises:
+            RuntimeError: If a file could not be downloaded.
+        """
+        manifest = self.get_manifest(submission_id)
+        if manifest is not None:
+            return manifest
+        # concurrent fetches of the same submission share one download
+        manifest = coalesce(
+            session,
+            f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/submissions/{submission_id}",
+            lambda: self._download(
+                session, course_id, assignment_id, submission_id, gradescope_base_url
+            ),
+            kind="archive",
+        )
+        if self.max_bytes is not None:
+            # never evict the submission that is returned, even if it exceeds max_bytes alone
+            self.gc(keep=[submission_id])
+        return manifest
+
+    def _download(
+        self,
+        session: requests.Session,
+        course_id: str,
+        assignment_id: str,
+        submission_id: str,
+        gradescope_base_url: str,
+    ) -> dict[str, str]:
+        text_files = get_submission_text_files(
+            session, course_id, assignment_id, submission_id, gradescope_base_url
+        )
+        staged = {}
+        try:
+            # one file at a time, streamed to disk
+            for text_file in text_files:
+                with download_text_file(text_file["url"], stream=True) as response:
+                    staged[text_file["path"]] = self._stage(
+                        response.iter_content(CHUNK_SIZE)
+                    )
+        except BaseException:
+            self._discard(staged)
+            raise
+        return self._commit(submission_id, staged)
+
+    def fetch_many(
+        self,
+        session: requests.Session,
+        course_id: str,
+        assignment_id: str,
+        submission_ids: Iterable[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limiter: RateLimiter | None = None,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    ) -> tuple[dict[str, dict[str, str]], dict[str, Exception]]:
+        """Fetch several submissions concurrently, skipping the archived ones.
+
+        Returns:
+            tuple[dict[str, dict[str, str]], dict[str, Exception]]: The manifests and the
+            exceptions raised, keyed by submission ID.
+        """
+        return run_concurrently(
+            lambda submission_id: self.fetch(
+                session, course_id, assignment_id, submission_id, gradescope_base_url
+            ),
+            submission_ids,
+            max_workers=max_workers,
+            rate_limiter=rate_limiter or RateLimiter(),
+        )
@@ -8,6 +8,12 @@ from bs4 import BeautifulSoup
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    run_concurrently,
+)
+from gradescopeapi.classes._helpers._date_helpers import get_timezone
 
 
 class AssignmentUpdateError(Exception):
@@ -30,6 +36,37 @@ class Assignment:
     max_grade: str
 
 
+@dataclass
+class AssignmentDatesUpdateResult:
+    assignment_id: str
+    status: str  # "updated", "skipped" (dates already match), or "failed"
+    release_date: datetime.datetime | None
+    due_date: datetime.datetime | None
+    late_due_date: datetime.datetime | None
+    error: str | None = None
+
+
+def _get_edit_assignment_auth_token(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> str:
+    GS_EDIT_ASSIGNMENT_ENDPOINT = (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/edit"
+    )
+
+    response = session.get(GS_EDIT_ASSIGNMENT_ENDPOINT)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, "html.parser")
+    return soup.select_one('input[name="authenticity_token"]')["value"]
+
+
+def _format_form_date(date: datetime.datetime | None) -> str:
+    """Format a date the way the assignment edit form expects it (minute resolution)."""
+    return date.strftime("%Y-%m-%dT%H:%M") if date else ""
+
+
 def update_assignment_date(
     session: requests.Session,
     course_id: str,
@@ -38,6 +75,7 @@ def update_assignment_date(
     due_date: datetime.datetime | None = None,
     late_due_date: datetime.datetime | None = None,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    auth_token: str | None = None,
 ) -> bool:
     """Update the dates of an assignment on Gradescope.
 
@@ -48,6 +86,8 @@ def update_assignment_date(
         release_date (datetime.datetime | None, optional): The release date of the assignment. Defaults to None.
         due_date (datetime.datetime | None, optional): The due date of the assignment. Defaults to None.
         late_due_date (datetime.datetime | None, optional): The late due date of the assignment. Defaults to None.
+        auth_token (str | None, optional): An authenticity token from a previous request in this session.
+            If None, it is fetched from the edit page of the assignment. Defaults to None.
 
     Notes:
         The timezone for dates used in Gradescope is specific to an institution. For example, for NYU, the timezone is America/New_York.
@@ -66,10 +106,10 @@ def update_assignment_date(
     )
 
     # Get auth token
-    response = session.get(GS_EDIT_ASSIGNMENT_ENDPOINT)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
-    auth_token = soup.select_one('input[name="authenticity_token"]')["value"]
+    if auth_token is None:
+        auth_token = _get_edit_assignment_auth_token(
+            session, course_id, assignment_id, gradescope_base_url
+        )
 
     # Setup multipart form data
     multipart = MultipartEncoder(
@@ -77,16 +117,10 @@ def update_assignment_date(
             "utf8": "✓",
             "_method": "patch",
             "authenticity_token": auth_token,
-            "assignment[release_date_string]": (
-                release_date.strftime("%Y-%m-%dT%H:%M") if release_date else ""
-            ),
-            "assignment[due_date_string]": (
-                due_date.strftime("%Y-%m-%dT%H:%M") if due_date else ""
-            ),
+            "assignment[release_date_string]": _format_form_date(release_date),
+            "assignment[due_date_string]": _format_form_date(due_date),
             "assignment[allow_late_submissions]": "1" if late_due_date else "0",
-            "assignment[hard_due_date_string]": (
-                late_due_date.strftime("%Y-%m-%dT%H:%M") if late_due_date else ""
-            ),
+            "assignment[hard_due_date_string]": _format_form_date(late_due_date),
             "commit": "Save",
         }
     )
@@ -103,6 +137,156 @@ def update_assignment_date(
     return response.status_code == 200
 
 
+def update_assignment_dates_bulk(
+    session: requests.Session,
+    course_id: str,
+    delta: datetime.timedelta | None = None,
+    new_dates: dict[str, dict[str, datetime.datetime | None]] | None = None,
+    assignment_ids: list[str] | None = None,
+    assignments: list[Assignment] | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: RateLimiter | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    timezone: str | datetime.tzinfo | None = None,
+) -> dict[str, AssignmentDatesUpdateResult]:
+    """Update the dates of many assignments in a course, e.g. to move them to a new semester.
+
+    The current dates are read once from the assignments page of the course. New dates are either
+    the current dates shifted by `delta`, or given explicitly per assignment in `new_dates`
+    (explicit dates take precedence). Assignments whose dates already match are skipped, and the
+    remaining updates are sent concurrently, reusing a single authenticity token.
+
+    Args:
+        session (requests.Session): The session object for making HTTP requests.
+        course_id (str): The ID of the course.
+        delta (datetime.timedelta | None, optional): The offset to shift all dates by. Defaults to None.
+        new_dates (dict[str, dict[str, datetime.datetime | None]] | None, optional): Maps assignment IDs to
+            the dates to set, with the keys "release_date", "due_date" and/or "late_due_date". Missing keys
+            fall back to the (shifted) current date. Defaults to None.
+        assignment_ids (list[str] | None, optional): The assignments to update. Defaults to all assignments
+            of the course if `delta` is set, otherwise the assignments in `new_dates`.
+        assignments (list[Assignment] | None, optional): The assignments of the course as returned by
+            `Account.get_assignments`. Fetched if None. Defaults to None.
+        max_workers (int, optional): Maximum number of concurrent updates. Defaults to DEFAULT_MAX_WORKERS.
+        rate_limiter (RateLimiter | None, optional): Shared limit on the rate of updates. Defaults to a new
+            RateLimiter with the default rate.
+        timezone (str | datetime.tzinfo | None, optional): The timezone of the course, as an IANA identifier
+            such as "America/New_York" or a tzinfo. All dates are converted to it before they are shifted
+            and sent. Defaults to None, which keeps the offset each date has.
+
+    Notes:
+        Shifted dates keep their wall clock time in the course timezone, so a 23:59 due date stays at
+        23:59 across daylight saving time changes. See `update_assignment_date` for how timezones are
+        handled.
+
+    Raises:
+        ValueError: If neither `delta` nor `new_dates` is provided.
+
+    Returns:
+        dict[str, AssignmentDatesUpdateResult]: The result for each assignment, keyed by assignment ID.
+    """
+    if delta is None and not new_dates:
+        raise ValueError("Either delta or new_dates must be provided")
+    new_dates = new_dates or {}
+
+    if assignments is None:
+        # imported here since account imports this module
+        from gradescopeapi.classes.account import Account
+
+        assignments = Account(session, gradescope_base_url).get_assignments(course_id)
+    current_assignments = {
+        assignment.assignment_id: assignment for assignment in assignments
+    }
+
+    if assignment_ids is None:
+        assignment_ids = list(current_assignments) if delta else list(new_dates)
+
+    if isinstance(timezone, str):
+        timezone = get_timezone(timezone)
+
+    def localize(date: datetime.datetime | None) -> datetime.datetime | None:
+        if date is None or timezone is None or date.tzinfo is None:
+            return date
+        return date.astimezone(timezone)
+
+    def shift(date: datetime.datetime | None) -> datetime.datetime | None:
+        if date is None or delta is None:
+            return date
+        # keep the wall clock time, so ignore daylight saving time changes
+        return date + delta
+
+    results = {}
+    dates_to_update = {}
+    for assignment_id in assignment_ids:
+        assignment = current_assignments.get(assignment_id)
+        if assignment is None:
+            results[assignment_id] = AssignmentDatesUpdateResult(
+                assignment_id=assignment_id,
+                status="failed",
+                release_date=None,
+                due_date=None,
+                late_due_date=None,
+                error="Assignment not found",
+            )
+            continue
+
+        current_dates = {
+            "release_date": localize(assignment.release_date),
+            "due_date": localize(assignment.due_date),
+            "late_due_date": localize(assignment.late_due_date),
+        }
+        explicit_dates = new_dates.get(assignment_id, {})
+        dates = {
+            name: localize(explicit_dates[name])
+            if name in explicit_dates
+            else shift(date)
+            for name, date in current_dates.items()
+        }
+
+        if all(
+            _format_form_date(dates[name]) == _format_form_date(current_dates[name])
+            for name in dates
+        ):
+            results[assignment_id] = AssignmentDatesUpdateResult(
+                assignment_id=assignment_id, status="skipped", **dates
+            )
+        else:
+            dates_to_update[assignment_id] = dates
+
+    if dates_to_update:
+        auth_token = _get_edit_assignment_auth_token(
+            session, course_id, next(iter(dates_to_update)), gradescope_base_url
+        )
+
+        def update(assignment_id: str) -> bool:
+            return update_assignment_date(
+                session,
+                course_id,
+                assignment_id,
+                **dates_to_update[assignment_id],
+                auth_token=auth_token,
+                gradescope_base_url=gradescope_base_url,
+            )
+
+        successes, errors = run_concurrently(
+            update,
+            dates_to_update,
+            max_workers=max_workers,
+            rate_limiter=rate_limiter or RateLimiter(),
+        )
+        for assignment_id, dates in dates_to_update.items():
+            success = successes.get(assignment_id, False)
+            error = errors.get(assignment_id)
+            results[assignment_id] = AssignmentDatesUpdateResult(
+                assignment_id=assignment_id,
+                status="updated" if success else "failed",
+                error=None if success else str(error or "Update unsuccessful"),
+                **dates,
+            )
+
+    return results
+
+
 def update_assignment_title(
     session: requests.Session,
     course_id: str,
@@ -172,44 +356,59 @@ def update_assignment_title(
     return response.status_code == 200
 
 
-def update_autograder_image_name(
+@dataclass
+class AutograderImageUpdateResult:
+    course_id: str
+    assignment_id: str
+    image_name: str
+    # "updated", "skipped" (already on the image), "image_not_found" or "failed"
+    status: str
+    previous_image_name: str | None = None
+    error: str | None = None
+
+
+# shown by Gradescope when the image is not available to the course
+DOCKER_IMAGE_NOT_FOUND = "Docker image not found in your current course!"
+
+
+def get_autograder_config(
     session: requests.Session,
     course_id: str,
     assignment_id: str,
-    image_name: str,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
-) -> bool:
-    """Update the Docker Hub image name of an assignment on Gradescope.
-
-    Args:
-        session (requests.Session): The session object for making HTTP requests.
-        course_id (str): The ID of the course.
-        assignment_id (str): The ID of the assignment.
-        image_name (str): The Docker Hub Image Name (user-handle/repo:tag)
-
-    Notes:
-        In most cases Gradescope does not validate that the image_name provided exists on Docker Hub. Garbage
-        values may still successfully return OK. You should test your autograder after updating the image name
-        to ensure it works as expected.
+) -> tuple[str, str | None]:
+    """Read the configure autograder page of an assignment.
 
-        Example image name: 'gradescope/autograder-base:ubuntu-22.04'
-        from https://hub.docker.com/layers/gradescope/autograder-base/ubuntu-22.04
-
-    Raises if session does not have access to configure autograder or if assignment does not have an autograder.
+    Raises if session does not have access to configure autograder.
 
     Returns:
-        bool: True if the image name was successfully updated, False otherwise.
+        tuple[str, str | None]: An authenticity token and the current Docker Hub image name,
+        or None if the page shows no image name.
     """
     GS_EDIT_AUTOGRADER_ASSIGNMENT_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/configure_autograder"
-    GS_POST_ASSIGNMENT_ENDPOINT = (
-        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
-    )
 
-    # Get auth token
     response = session.get(GS_EDIT_AUTOGRADER_ASSIGNMENT_ENDPOINT)
     response.raise_for_status()
     soup = BeautifulSoup(response.text, "html.parser")
     auth_token = soup.select_one('input[name="authenticity_token"]')["value"]
+    image_name_input = soup.select_one('input[name="assignment[image_name]"]')
+    image_name = image_name_input.get("value") if image_name_input else None
+    return auth_token, image_name or None
+
+
+def _patch_autograder_image_name(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    image_name: str,
+    auth_token: str,
+    gradescope_base_url: str,
+) -> bool:
+    """Send the new image name, returns False if Gradescope did not find the image."""
+    GS_EDIT_AUTOGRADER_ASSIGNMENT_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/configure_autograder"
+    GS_POST_ASSIGNMENT_ENDPOINT = (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+    )
 
     # Setup multipart form data
     multipart = MultipartEncoder(
@@ -232,6 +431,121 @@ def update_autograder_image_name(
     response.raise_for_status()
 
     soup = BeautifulSoup(response.content, "html.parser")
-    return response.status_code == 200 and not soup.find(
-        string="Docker image not found in your current course!"
+    return response.status_code == 200 and not soup.find(string=DOCKER_IMAGE_NOT_FOUND)
+
+
+def update_autograder_image_name(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    image_name: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    auth_token: str | None = None,
+) -> bool:
+    """Update the Docker Hub image name of an assignment on Gradescope.
+
+    Args:
+        session (requests.Session): The session object for making HTTP requests.
+        course_id (str): The ID of the course.
+        assignment_id (str): The ID of the assignment.
+        image_name (str): The Docker Hub Image Name (user-handle/repo:tag)
+        auth_token (str | None, optional): An authenticity token from a previous request in this session.
+            If None, it is fetched from the configure autograder page of the assignment. Defaults to None.
+
+    Notes:
+        In most cases Gradescope does not validate that the image_name provided exists on Docker Hub. Garbage
+        values may still successfully return OK. You should test your autograder after updating the image name
+        to ensure it works as expected.
+
+        Example image name: 'gradescope/autograder-base:ubuntu-22.04'
+        from https://hub.docker.com/layers/gradescope/autograder-base/ubuntu-22.04
+
+    Raises if session does not have access to configure autograder or if assignment does not have an autograder.
+
+    Returns:
+        bool: True if the image name was successfully updated, False otherwise.
+    """
+    # Get auth token
+    if auth_token is None:
+        auth_token, _ = get_autograder_config(
+            session, course_id, assignment_id, gradescope_base_url
+        )
+
+    return _patch_autograder_image_name(
+        session, course_id, assignment_id, image_name, auth_token, gradescope_base_url
+    )
+
+
+def update_autograder_image_names_bulk(
+    session: requests.Session,
+    updates: list[tuple[str, str, str]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: RateLimiter | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> dict[tuple[str, str], AutograderImageUpdateResult]:
+    """Update the Docker Hub image name of many assignments, e.g. to roll out a new base image.
+
+    The configure autograder page of every assignment is read to find its current image, and
+    assignments already on the target image are skipped. The rest are updated concurrently, with
+    the authenticity token of the page that was read, so each update takes one GET and one PATCH.
+
+    Args:
+        session (requests.Session): The session object for making HTTP requests.
+        updates (list[tuple[str, str, str]]): The (course_id, assignment_id, image_name) to apply.
+            If an assignment is listed more than once, the last image name is used.
+        max_workers (int, optional): Maximum number of concurrent updates. Defaults to DEFAULT_MAX_WORKERS.
+        rate_limiter (RateLimiter | None, optional): Shared limit on the rate of requests. Defaults to a new
+            RateLimiter with the default rate.
+
+    Returns:
+        dict[tuple[str, str], AutograderImageUpdateResult]: The result for each assignment, keyed by
+        (course_id, assignment_id). Images Gradescope reports as "Docker image not found" have the
+        status "image_not_found".
+    """
+    image_names = {
+        (course_id, assignment_id): image_name
+        for course_id, assignment_id, image_name in updates
+    }
+
+    def update(key: tuple[str, str]) -> AutograderImageUpdateResult:
+        course_id, assignment_id = key
+        image_name = image_names[key]
+        auth_token, previous_image_name = get_autograder_config(
+            session, course_id, assignment_id, gradescope_base_url
+        )
+        if previous_image_name == image_name:
+            status = "skipped"
+        elif _patch_autograder_image_name(
+            session,
+            course_id,
+            assignment_id,
+            image_name,
+            auth_token,
+            gradescope_base_url,
+        ):
+            status = "updated"
+        else:
+            status = "image_not_found"
+        return AutograderImageUpdateResult(
+            course_id=course_id,
+            assignment_id=assignment_id,
+            image_name=image_name,
+            status=status,
+            previous_image_name=previous_image_name,
+        )
+
+    results, errors = run_concurrently(
+        update,
+        image_names,
+        max_workers=max_workers,
+        rate_limiter=rate_limiter or RateLimiter(),
     )
+    for (course_id, assignment_id), error in errors.items():
+        results[(course_id, assignment_id)] = AutograderImageUpdateResult(
+            course_id=course_id,
+            assignment_id=assignment_id,
+            image_name=image_names[(course_id, assignment_id)],
+            status="failed",
+            error=str(error),
+        )
+    return {key: results[key] for key in image_names}
@@ -1,21 +1,47 @@
+import logging
+from typing import Any
+
 import requests
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
 from gradescopeapi.classes._helpers._login_helpers import (
     get_auth_token_init_gradescope_session,
+    get_page_csrf_token,
+    is_session_valid,
     login_set_session_cookies,
 )
+from gradescopeapi.classes._helpers._retry_helpers import (
+    RetryPolicy,
+    mount_retry_adapter,
+)
 from gradescopeapi.classes.account import Account
 
+logger = logging.getLogger(__name__)
+
+# session headers set by login that later requests rely on
+SESSION_STATE_HEADERS = ("X-CSRF-Token",)
+
 
 class GSConnection:
-    def __init__(self, gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL):
+    def __init__(
+        self,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        retry_policy: RetryPolicy | None = None,
+    ):
         self.session = requests.Session()
+        # retries transient failures of idempotent requests, see RetryPolicy for the defaults
+        self.retry_adapter = mount_retry_adapter(self.session, retry_policy)
         self.gradescope_base_url = gradescope_base_url
         self.logged_in = False
         self.account = None
 
-    def login(self, email, password):
+    def login(self, email, password, warmup: bool = False):
+        """
+        Log in to Gradescope.
+        If warmup is True, the courses are prefetched and the assignments of the most
+        recent term's courses are fetched in the background, see `Account.warmup`.
+        A failed warmup is logged and does not fail the login.
+        """
         # go to homepage to parse hidden authenticity token and to set initial "_gradescope_session" cookie
         auth_token = get_auth_token_init_gradescope_session(
             self.session, self.gradescope_base_url
@@ -28,5 +54,62 @@ class GSConnection:
         if login_success:
             self.logged_in = True
             self.account = Account(self.session, self.gradescope_base_url)
+            if warmup:
+                try:
+                    self.account.warmup()
+                except Exception:
+                    # the session is logged in, later calls fetch what was not prefetched
+                    logger.warning("Warmup after login failed", exc_info=True)
         else:
             raise ValueError("Invalid credentials.")
+
+    def get_session_state(self) -> dict[str, Any]:
+        """
+        Get the cookies and CSRF token of the logged in session as plain data, so the session
+        can be restored with `from_session_state`, e.g. in another process or a later run.
+        Returns:
+            dict: The base URL, the CSRF token header and the session cookies
+        """
+        return {
+            "gradescope_base_url": self.gradescope_base_url,
+            "headers": {
+                name: self.session.headers[name]
+                for name in SESSION_STATE_HEADERS
+                if name in self.session.headers
+            },
+            "cookies": [
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                }
+                for cookie in self.session.cookies
+            ],
+        }
+
+    @classmethod
+    def from_session_state(cls, session_state: dict[str, Any]) -> "GSConnection":
+        """
+        Restore a logged in connection from the result of `get_session_state`
+        without logging in again.
+        """
+        connection = cls(session_state["gradescope_base_url"])
+        # states saved before the headers were recorded lack the CSRF token, see `restore_csrf_token`
+        connection.session.headers.update(session_state.get("headers", {}))
+        for cookie in session_state["cookies"]:
+            connection.session.cookies.set(**cookie)
+        connection.logged_in = True
+        connection.account = Account(connection.session, connection.gradescope_base_url)
+        return connection
+
+    def is_session_valid(self) -> bool:
+        """Check whether the session is still logged in, e.g. after `from_session_state`."""
+        return is_session_valid(self.session, self.gradescope_base_url)
+
+    def restore_csrf_token(self):
+        """Set the CSRF token header of the session if it is missing, e.g. after restoring an old state."""
+        if "X-CSRF-Token" not in self.session.headers:
+            self.session.headers["X-CSRF-Token"] = get_page_csrf_token(
+                self.session, self.gradescope_base_url
+            )
@@ -0,0 +1,173 @@
+"""Functions for downloading the submissions of a whole assignment as a single zip file.
+
+The zip file is produced as a stream of chunks while the files are downloaded, without staging
+anything on disk: the files of several students are downloaded concurrently, and written to the
+zip file in a deterministic order (by student email, then file order of the submission) as soon
+as all earlier students are written. Only a bounded number of students is buffered in memory.
+
+Layout of the zip file:
+    <student email>/<path of the submitted file>
+    <student email>/ERROR.txt  if the files of the student could not be downloaded
+"""
+
+import datetime
+import zipfile
+from collections.abc import Iterator
+from pathlib import PurePosixPath
+
+import requests
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    check_page_auth,
+    download_text_file,
+    get_submission_infos,
+    get_submission_text_files,
+    parse_review_grades,
+)
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    iter_concurrently_in_order,
+)
+from gradescopeapi.classes.archive import SubmissionArchive
+
+CHUNK_SIZE = 1 << 16
+
+
+def get_active_submissions(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> dict[str, dict]:
+    """Get the active submission of every student of an assignment. ONLY FOR INSTRUCTORS.
+
+    Returns:
+        dict[str, dict]: The submission infos (see `Account.get_assignment_submission_infos`)
+        by student email, sorted by email.
+
+    Raises:
+        NotAuthorized: If the user cannot access the submissions of the assignment.
+        Exception: If the user is not logged in or the assignment is not found.
+    """
+    review_grades_endpoint = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/review_grades"
+    submissions_resp = check_page_auth(session, review_grades_endpoint)
+    submission_infos = get_submission_infos(parse_review_grades(submissions_resp.text))
+    return dict(sorted(submission_infos.items()))
+
+
+class _ZipStream:
+    # write-only file object collecting the output of zipfile until it is drained
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _zip_path(email: str, path: str) -> str:
+    # keep submitted paths inside the directory of the student
+    parts = [part for part in PurePosixPath(path).parts if part not in ("/", "..")]
+    return "/".join([email, *parts])
+
+
+def _zip_date_time(submission_info: dict) -> tuple:
+    submitted_at = submission_info["submissions"][0].get("datetime")
+    if submitted_at is None:
+        return (1980, 1, 1, 0, 0, 0)
+    return datetime.datetime.fromisoformat(submitted_at).timetuple()[:6]
+
+
+def iter_submissions_zip(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    submission_infos: dict[str, dict] | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_buffered_submissions: int | None = None,
+    archive: SubmissionArchive | None = None,
+    rate_limiter: RateLimiter | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> Iterator[bytes]:
+    """Stream a zip file of the active submissions of every student. ONLY FOR INSTRUCTORS.
+
+    Args:
+        session (requests.Session): The session object used for making HTTP requests.
+        course_id (str): The ID of the course.
+        assignment_id (str): The ID of the assignment.
+        submission_infos (dict[str, dict] | None, optional): The submissions to include, as
+            returned by `get_active_submissions`. Defaults to all active submissions.
+        max_workers (int, optional): Maximum number of concurrent downloads. Defaults to DEFAULT_MAX_WORKERS.
+        max_buffered_submissions (int | None, optional): Maximum number of students downloaded
+            ahead of the one being written. Defaults to twice `max_workers`.
+        archive (SubmissionArchive | None, optional): If set, files are read from (and downloaded
+            into) the archive instead of being downloaded every time. Defaults to None.
+        rate_limiter (RateLimiter | None, optional): Shared rate limiter for the requests. Defaults to a new RateLimiter.
+
+    Yields:
+        bytes: Consecutive chunks of the zip file.
+    """
+    if submission_infos is None:
+        submission_infos = get_active_submissions(
+            session, course_id, assignment_id, gradescope_base_url
+        )
+
+    def download(email: str) -> list[tuple[str, bytes]]:
+        submission_id = submission_infos[email]["submissions"][0]["submission_id"]
+        if archive is not None:
+            manifest = archive.fetch(
+                session, course_id, assignment_id, submission_id, gradescope_base_url
+            )
+            return [(path, archive.read(submission_id, path)) for path in manifest]
+        files = []
+        for text_file in get_submission_text_files(
+            session, course_id, assignment_id, submission_id, gradescope_base_url
+        ):
+            response = download_text_file(text_file["url"])
+            files.append((text_file["path"], response.content))
+        return files
+
+    for chunk in _write_zip(
+        submission_infos,
+        iter_concurrently_in_order(
+            download,
+            submission_infos,
+            max_workers=max_workers,
+            max_pending=max_buffered_submissions,
+            rate_limiter=rate_limiter or RateLimiter(),
+        ),
+    ):
+        if chunk:
+            yield chunk
+
+
+def _write_zip(submission_infos, downloads) -> Iterator[bytes]:
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        for email, files, error in downloads:
+            date_time = _zip_date_time(submission_infos[email])
+            if error is not None:
+                files = [
+                    ("ERROR.txt", f"Failed to download submission: {error}\n".encode())
+                ]
+            for path, content in files:
+                zip_info = zipfile.ZipInfo(_zip_path(email, path), date_time)
+                zip_info.compress_type = zipfile.ZIP_DEFLATED
+                with zip_file.open(zip_info, "w") as zip_entry:
+                    for start in range(0, len(content), CHUNK_SIZE):
+                        zip_entry.write(content[start : start + CHUNK_SIZE])
+                        yield stream.drain()
+                if hasattr(content, "close"):
+                    content.close()  # memory-mapped file of the archive
+                yield stream.drain()
+    yield stream.drain()
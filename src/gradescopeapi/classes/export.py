@@ -0,0 +1,171 @@
+"""Functions for exporting the courses, assignments and submissions of a whole term at once.
+
+Courses are sharded across a pool of worker processes. Every worker restores the logged in
+session from `GSConnection.get_session_state`, and the request rate is split evenly between
+the workers so that together they stay under one global request budget.
+"""
+
+import dataclasses
+import datetime
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any
+
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_REQUESTS_PER_SECOND,
+    RateLimiter,
+)
+from gradescopeapi.classes.account import Account
+from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.courses import Course
+
+DEFAULT_PROCESSES = 4
+
+
+@dataclass
+class CourseExport:
+    course_id: str
+    role: str  # "instructor" or "student"
+    course: Course
+    assignments: list[Assignment] = field(default_factory=list)
+    # assignment ID -> result of Account.get_assignment_submission_infos, instructor courses only
+    submission_infos: dict[str, dict[str, Any]] = field(default_factory=dict)
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the export to plain data, with dates as ISO 8601 strings."""
+
+        def convert(value):
+            if isinstance(value, datetime.datetime):
+                return value.isoformat()
+            if isinstance(value, dict):
+                return {key: convert(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [convert(item) for item in value]
+            return value
+
+        return convert(dataclasses.asdict(self))
+
+
+# account of the current worker process, set by _init_worker
+_worker_account: Account | None = None
+
+
+def _init_worker(session_state: dict[str, Any], requests_per_second: float):
+    global _worker_account
+    connection = GSConnection.from_session_state(session_state)
+    # retries acquire the rate limiter too, so they count towards the budget
+    connection.retry_adapter.rate_limiter = RateLimiter(requests_per_second)
+    _worker_account = connection.account
+
+
+def _export_course(
+    course_id: str, role: str, course: Course, include_submissions: bool
+) -> CourseExport:
+    export = CourseExport(course_id=course_id, role=role, course=course)
+    try:
+        export.assignments = _worker_account.get_assignments(course_id)
+        if include_submissions and role == "instructor":
+            for assignment in export.assignments:
+                if assignment.assignment_id is None:
+                    continue
+                export.submission_infos[assignment.assignment_id] = (
+                    _worker_account.get_assignment_submission_infos(
+                        course_id, assignment.assignment_id
+                    )
+                )
+    except Exception as e:
+        # isolate the failure to this course, partial results are kept
+        export.error = f"{type(e).__name__}: {e}"
+    return export
+
+
+def write_term_export(exports: dict[str, CourseExport], path: str | os.PathLike):
+    """Write the exports to a JSON Lines file, with one course per line."""
+    with open(path, "w") as f:
+        for export in exports.values():
+            f.write(json.dumps(export.to_dict()) + "\n")
+
+
+def export_term(
+    connection: GSConnection,
+    semester: str | None = None,
+    year: str | None = None,
+    include_submissions: bool = True,
+    processes: int = DEFAULT_PROCESSES,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    output_path: str | os.PathLike | None = None,
+) -> dict[str, CourseExport]:
+    """Export the assignments and submission infos of every course of a term.
+
+    Args:
+        connection (GSConnection): A logged in connection.
+        semester (str | None, optional): Only export courses of this semester, e.g. "Spring".
+            Defaults to all semesters.
+        year (str | None, optional): Only export courses of this year, e.g. "2024". Defaults to all years.
+        include_submissions (bool, optional): Whether to export the submission infos of every
+            assignment in instructor courses. Defaults to True.
+        processes (int, optional): Number of worker processes. Defaults to DEFAULT_PROCESSES.
+        requests_per_second (float, optional): Request budget shared by all worker processes.
+            Defaults to DEFAULT_REQUESTS_PER_SECOND.
+        output_path (str | os.PathLike | None, optional): If set, the merged export is also written
+            there as JSON Lines. Defaults to None.
+
+    Returns:
+        dict[str, CourseExport]: The export of every course, keyed by course ID, in the order returned by
+        `Account.get_courses`. Courses that failed have `error` set.
+
+    Raises:
+        ValueError: If the connection is not logged in.
+    """
+    if not connection.logged_in:
+        raise ValueError("Connection must be logged in.")
+
+    # a course can be listed under several roles, export it once with the first one
+    # (instructor before student)
+    courses_by_id: dict[str, tuple[str, str, Course]] = {}
+    for role, role_courses in connection.account.get_courses().items():
+        for course_id, course in role_courses.items():
+            if (
+                (semester is None or course.semester == semester)
+                and (year is None or course.year == year)
+                and course_id not in courses_by_id
+            ):
+                courses_by_id[course_id] = (course_id, role, course)
+    courses = list(courses_by_id.values())
+    if not courses:
+        return {}
+
+    processes = min(processes, len(courses))
+    exports: dict[str, CourseExport] = {}
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(connection.get_session_state(), requests_per_second / processes),
+    ) as executor:
+        futures = {
+            executor.submit(
+                _export_course, course_id, role, course, include_submissions
+            ): (course_id, role, course)
+            for course_id, role, course in courses
+        }
+        for future in as_completed(futures):
+            course_id, role, course = futures[future]
+            try:
+                exports[course_id] = future.result()
+            except Exception as e:
+                # the worker process itself failed, e.g. it was killed
+                exports[course_id] = CourseExport(
+                    course_id=course_id,
+                    role=role,
+                    course=course,
+                    error=f"{type(e).__name__}: {e}",
+                )
+
+    exports = {course_id: exports[course_id] for course_id, _, _ in courses}
+    if output_path is not None:
+        write_term_export(exports, output_path)
+    return exports
@@ -6,20 +6,26 @@ for a specific student, and remove a student's extension.
 
 The main functions in this module are:
 - `get_extensions`: Retrieves all extensions for a specific assignment.
+- `get_course_extensions`: Retrieves the extensions of every assignment in a course concurrently.
 - `update_student_extension`: Updates the extension for a specific student on an assignment.
 - `remove_student_extension`: Removes the extension for a specific student.
 """
 
 import datetime
-import json
-import zoneinfo
 from dataclasses import dataclass
 
-import dateutil.parser
 import requests
 from bs4 import BeautifulSoup
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    run_concurrently,
+)
+from gradescopeapi.classes._helpers._date_helpers import get_timezone, parse_date
+from gradescopeapi.classes._helpers._json_helpers import ExtensionProps, loads
+from gradescopeapi.classes.assignments import Assignment
 
 
 @dataclass
@@ -31,6 +37,17 @@ class Extension:
     delete_path: str
 
 
+@dataclass
+class CourseExtensions:
+    # user ID -> assignment ID -> Extension
+    by_user: dict[str, dict[str, Extension]]
+    # assignment ID -> user ID -> Extension
+    by_assignment: dict[str, dict[str, Extension]]
+
+    def get(self, user_id: str, assignment_id: str) -> Extension | None:
+        return self.by_user.get(user_id, {}).get(assignment_id)
+
+
 def get_extensions(
     session: requests.Session,
     course_id: str,
@@ -86,13 +103,13 @@ def get_extensions(
         user_properties = row.find("div", {"data-react-class": "EditExtension"}).get(
             "data-react-props"
         )
-        user_properties = json.loads(user_properties)
+        user_properties = loads(user_properties, ExtensionProps)
 
         # user id
         user_id = str(user_properties["override"]["user_id"])  # TODO: keep as int?
 
         # timezone
-        timezone = zoneinfo.ZoneInfo(user_properties["timezone"]["identifier"])
+        timezone = get_timezone(user_properties["timezone"]["identifier"])
 
         # extension properties
         extension_info = user_properties["override"]["settings"]
@@ -101,21 +118,9 @@ def get_extensions(
         late_due_date = extension_info.get("hard_due_date", {}).get("value", None)
 
         # convert dates to datetime objects
-        release_date = (
-            dateutil.parser.parse(release_date).replace(tzinfo=timezone)
-            if release_date
-            else None
-        )
-        due_date = (
-            dateutil.parser.parse(due_date).replace(tzinfo=timezone)
-            if due_date
-            else None
-        )
-        late_due_date = (
-            dateutil.parser.parse(late_due_date).replace(tzinfo=timezone)
-            if late_due_date
-            else None
-        )
+        release_date = parse_date(release_date, tzinfo=timezone)
+        due_date = parse_date(due_date, tzinfo=timezone)
+        late_due_date = parse_date(late_due_date, tzinfo=timezone)
 
         # delete path
         delete_path = user_properties["deletePath"]
@@ -136,6 +141,60 @@ def get_extensions(
     return extensions
 
 
+def get_course_extensions(
+    session: requests.Session,
+    course_id: str,
+    assignments: list[Assignment | str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: RateLimiter | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> CourseExtensions:
+    """Get the extensions of every given assignment in a course.
+
+    The extensions pages are fetched concurrently and indexed both by user and by assignment,
+    e.g. to look up all accommodations of a student across the course.
+
+    Args:
+        session (requests.Session): The session object used for making HTTP requests.
+        course_id (str): The ID of the course.
+        assignments (list[Assignment | str]): The assignments (e.g. from `Account.get_assignments`)
+            or assignment IDs.
+        max_workers (int, optional): Maximum number of concurrent requests. Defaults to DEFAULT_MAX_WORKERS.
+        rate_limiter (RateLimiter | None, optional): Shared rate limiter for the requests. Defaults to a new RateLimiter.
+
+    Returns:
+        CourseExtensions: The extensions, indexed by user ID and then assignment ID (`by_user`)
+        and by assignment ID and then user ID (`by_assignment`). Assignments without extensions
+        map to an empty dictionary in `by_assignment`.
+
+    Raises:
+        RuntimeError: If the request to get the extensions of an assignment fails.
+    """
+    assignment_ids = [
+        assignment.assignment_id if isinstance(assignment, Assignment) else assignment
+        for assignment in assignments
+    ]
+    extensions, errors = run_concurrently(
+        lambda assignment_id: get_extensions(
+            session, course_id, assignment_id, gradescope_base_url
+        ),
+        assignment_ids,
+        max_workers=max_workers,
+        rate_limiter=rate_limiter or RateLimiter(),
+    )
+    if errors:
+        raise next(iter(errors.values()))
+
+    by_assignment = {
+        assignment_id: extensions[assignment_id] for assignment_id in assignment_ids
+    }
+    by_user = {}
+    for assignment_id, assignment_extensions in by_assignment.items():
+        for user_id, extension in assignment_extensions.items():
+            by_user.setdefault(user_id, {})[assignment_id] = extension
+    return CourseExtensions(by_user=by_user, by_assignment=by_assignment)
+
+
 def update_student_extension(
     session: requests.Session,
     course_id: str,
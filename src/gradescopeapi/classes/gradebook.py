@@ -0,0 +1,186 @@
+"""Functions for exporting the gradebook of a course as a students x assignments score matrix.
+
+The scores of every student are fetched from the per-student `gradebook.json` endpoints that
+back the roster page, concurrently and under a shared rate limit.
+
+Requires the `analytics` extra (NumPy). Exporting to Parquet also requires the `parquet` extra.
+"""
+
+import csv
+import os
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    run_concurrently,
+)
+from gradescopeapi.classes.account import Account
+from gradescopeapi.classes.member import Member
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Exporting gradebooks requires NumPy. Install it with: pip install 'gradescopeapi[analytics]'"
+    ) from e
+
+
+@dataclass
+class Gradebook:
+    # shape (num students, num assignments), NaN if there is no score
+    scores: np.ndarray
+    students: list[Member]  # row labels
+    assignment_ids: list[str]  # column labels
+    assignment_names: list[str]
+
+    def _columns(self) -> dict[str, list]:
+        columns = {
+            "user_id": [student.user_id for student in self.students],
+            "full_name": [student.full_name for student in self.students],
+            "email": [student.email for student in self.students],
+            "sid": [student.sid for student in self.students],
+        }
+        for j, (assignment_id, assignment_name) in enumerate(
+            zip(self.assignment_ids, self.assignment_names)
+        ):
+            columns[f"{assignment_name} ({assignment_id})"] = [
+                None if np.isnan(score) else float(score) for score in self.scores[:, j]
+            ]
+        return columns
+
+    def to_csv(self, path: str | os.PathLike):
+        """Write the gradebook to a CSV file, with one row per student. Missing scores are left empty."""
+        columns = self._columns()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for row in zip(*columns.values()):
+                writer.writerow(["" if value is None else value for value in row])
+
+    def to_parquet(self, path: str | os.PathLike):
+        """Write the gradebook to a Parquet file, with one row per student. Missing scores are null."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Exporting to Parquet requires pyarrow. Install it with: pip install 'gradescopeapi[parquet]'"
+            ) from e
+
+        pq.write_table(pa.table(self._columns()), path)
+
+
+def get_gradebook_scores(gradebook_json: Any) -> dict[str, tuple[str, float | None]]:
+    """Extract the scores from the gradebook.json document of a single student.
+
+    The document is a list with one entry per assignment:
+        [{"assignment": {"id": 10, "title": "HW 1", ...}, "score": "9.5" | 9.5 | null, ...}, ...]
+
+    Returns:
+        dict: Maps assignment IDs to (assignment name, score) tuples. The score is None if the
+        assignment has not been graded or submitted.
+
+    Raises:
+        RuntimeError: If the document does not have this format.
+    """
+    if not isinstance(gradebook_json, list):
+        raise RuntimeError(
+            f"Unexpected gradebook.json format: expected a list, got {type(gradebook_json).__name__}"
+        )
+
+    scores = {}
+    for entry in gradebook_json:
+        assignment = entry.get("assignment") if isinstance(entry, dict) else None
+        if (
+            not isinstance(assignment, dict)
+            or assignment.get("id") is None
+            or "score" not in entry
+        ):
+            raise RuntimeError(f"Unexpected gradebook.json entry: {entry!r}")
+        score = entry["score"]
+        scores[str(assignment["id"])] = (
+            assignment.get("title") or str(assignment["id"]),
+            None if score is None else float(score),
+        )
+    return scores
+
+
+def get_gradebook(
+    session: requests.Session,
+    course_id: str,
+    students: list[Member] | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: RateLimiter | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> Gradebook:
+    """Get the scores of all students in a course for all assignments.
+
+    Args:
+        session (requests.Session): The session object used for making HTTP requests.
+        course_id (str): The ID of the course.
+        students (list[Member] | None, optional): The students to include. Defaults to all members of the
+            course with a user ID (students), as returned by `Account.get_course_users`.
+        max_workers (int, optional): Maximum number of concurrent requests. Defaults to DEFAULT_MAX_WORKERS.
+        rate_limiter (RateLimiter | None, optional): Shared limit on the request rate. Defaults to a new
+            RateLimiter with the default rate.
+
+    Returns:
+        Gradebook: The score matrix with one row per student and one column per assignment,
+        in the order assignments are first seen.
+
+    Raises:
+        RuntimeError: If the course roster or the gradebook of a student can't be fetched.
+    """
+    if students is None:
+        members = Account(session, gradescope_base_url).get_course_users(course_id)
+        if members is None:
+            raise RuntimeError(f"Failed to get members of course {course_id}")
+        students = [member for member in members if member.user_id is not None]
+
+    def fetch_scores(user_id: str) -> dict[str, tuple[str, float | None]]:
+        response = session.get(
+            f"{gradescope_base_url}/courses/{course_id}/gradebook.json",
+            params={"user_id": user_id},
+        )
+        if response.status_code != requests.codes.ok:
+            raise RuntimeError(
+                f"Failed to get gradebook for user {user_id}. Status code: {response.status_code}"
+            )
+        return get_gradebook_scores(response.json())
+
+    user_ids = [student.user_id for student in students]
+    scores_by_user, errors = run_concurrently(
+        fetch_scores,
+        user_ids,
+        max_workers=max_workers,
+        rate_limiter=rate_limiter or RateLimiter(),
+    )
+    if errors:
+        raise next(iter(errors.values()))
+
+    # collect the columns in the order they are first seen
+    assignment_names: dict[str, str] = {}
+    for user_id in user_ids:
+        for assignment_id, (name, _) in scores_by_user[user_id].items():
+            assignment_names.setdefault(assignment_id, name)
+    column_index = {
+        assignment_id: j for j, assignment_id in enumerate(assignment_names)
+    }
+
+    scores = np.full((len(user_ids), len(assignment_names)), np.nan)
+    for i, user_id in enumerate(user_ids):
+        for assignment_id, (_, score) in scores_by_user[user_id].items():
+            if score is not None:
+                scores[i, column_index[assignment_id]] = score
+
+    return Gradebook(
+        scores=scores,
+        students=students,
+        assignment_ids=list(assignment_names),
+        assignment_names=list(assignment_names.values()),
+    )
@@ -0,0 +1,260 @@
+"""A pool of logged in connections shared by concurrent tasks, e.g. the requests of an API server.
+
+Every account of the pool is logged in lazily, the first time a task needs it. Before a connection
+is lent out it is checked with a cheap probe if it was not used recently, and expired sessions are
+logged in again in the background while other connections keep serving. Tasks ask for a course
+(and optionally a role in it), and get a connection of an account that has access to the course,
+preferring the least busy one. Each connection is lent to at most `max_uses_per_session` tasks at
+a time; further tasks wait. Accounts that failed to log in are tried again after a backoff.
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._login_helpers import is_session_valid
+from gradescopeapi.classes._helpers._retry_helpers import RetryPolicy
+from gradescopeapi.classes.connection import GSConnection
+
+DEFAULT_MAX_USES_PER_SESSION = 4
+DEFAULT_VALIDATE_AFTER_S = 60.0
+# the delay before login retry n is DEFAULT_LOGIN_BACKOFF_S * 2**(n - 1), up to the max
+DEFAULT_LOGIN_BACKOFF_S = 5.0
+DEFAULT_MAX_LOGIN_BACKOFF_S = 300.0
+
+
+class NoSessionAvailable(Exception):
+    pass
+
+
+class _PoolEntry:
+    def __init__(self, email: str, password: str):
+        self.email = email
+        self.password = password
+        self.status = "new"  # "new", "logging_in", "ready" or "failed"
+        self.connection: GSConnection | None = None
+        self.roles: dict[str, str] = {}  # course ID -> "instructor" or "student"
+        self.in_use = 0
+        self.used_at = 0.0  # time.monotonic() of the last validation or release
+        self.error: Exception | None = None
+        self.login_failures = 0  # consecutive failed logins
+        self.failed_at = 0.0  # time.monotonic() of the last failed login
+
+
+class SessionPool:
+    """Lends logged in connections of a few accounts to concurrent tasks.
+
+    Args:
+        credentials (list[tuple[str, str]]): The (email, password) of every account of the pool.
+        gradescope_base_url (str, optional): Defaults to DEFAULT_GRADESCOPE_BASE_URL.
+        max_uses_per_session (int, optional): Maximum number of tasks using a connection at the
+            same time. Defaults to DEFAULT_MAX_USES_PER_SESSION.
+        validate_after_s (float, optional): Connections unused for longer are probed before being
+            lent out. Defaults to DEFAULT_VALIDATE_AFTER_S.
+        retry_policy (RetryPolicy | None, optional): Retry policy of the connections. Defaults to None.
+        login_backoff_s (float, optional): Delay before an account that failed to log in is tried
+            again, doubled after every further failure. Defaults to DEFAULT_LOGIN_BACKOFF_S.
+        max_login_backoff_s (float, optional): Maximum delay between login attempts of an account.
+            Defaults to DEFAULT_MAX_LOGIN_BACKOFF_S.
+    """
+
+    def __init__(
+        self,
+        credentials: list[tuple[str, str]],
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        max_uses_per_session: int = DEFAULT_MAX_USES_PER_SESSION,
+        validate_after_s: float = DEFAULT_VALIDATE_AFTER_S,
+        retry_policy: RetryPolicy | None = None,
+        login_backoff_s: float = DEFAULT_LOGIN_BACKOFF_S,
+        max_login_backoff_s: float = DEFAULT_MAX_LOGIN_BACKOFF_S,
+    ):
+        self.gradescope_base_url = gradescope_base_url
+        self.max_uses_per_session = max_uses_per_session
+        self.validate_after_s = validate_after_s
+        self.retry_policy = retry_policy
+        self.login_backoff_s = login_backoff_s
+        self.max_login_backoff_s = max_login_backoff_s
+        self._entries = [_PoolEntry(email, password) for email, password in credentials]
+        self._condition = threading.Condition()
+        # id of a lent connection -> its entry and the number of tasks using it
+        self._lent: dict[int, tuple[_PoolEntry, int]] = {}
+        self._relogin_executor = ThreadPoolExecutor(max_workers=1)
+
+    def _login(self, entry: _PoolEntry):
+        try:
+            connection = GSConnection(self.gradescope_base_url, self.retry_policy)
+            connection.login(entry.email, entry.password)
+            courses = connection.account.get_courses()
+        except Exception as e:
+            with self._condition:
+                entry.status = "failed"
+                entry.error = e
+                entry.login_failures += 1
+                entry.failed_at = time.monotonic()
+                self._condition.notify_all()
+            return
+        with self._condition:
+            entry.connection = connection
+            entry.roles = {
+                course_id: role
+                for role, role_courses in courses.items()
+                for course_id in role_courses
+            }
+            entry.status = "ready"
+            entry.error = None
+            entry.login_failures = 0
+            entry.used_at = time.monotonic()
+            self._condition.notify_all()
+
+    def _can_login(self, entry: _PoolEntry) -> bool:
+        # not logged in yet, or failed long enough ago to try again, called with the lock held
+        if entry.status == "new":
+            return True
+        if entry.status != "failed":
+            return False
+        backoff = min(
+            self.max_login_backoff_s,
+            self.login_backoff_s * 2 ** (entry.login_failures - 1),
+        )
+        return time.monotonic() - entry.failed_at >= backoff
+
+    def _can_access(self, entry: _PoolEntry, course_id: str | None, role: str | None):
+        if course_id is None:
+            return True
+        return course_id in entry.roles and role in (None, entry.roles[course_id])
+
+    def _pick(self, course_id: str | None, role: str | None) -> _PoolEntry | None:
+        # the least busy ready entry with access and spare capacity, called with the lock held
+        entries = [
+            entry
+            for entry in self._entries
+            if entry.status == "ready"
+            and entry.in_use < self.max_uses_per_session
+            and self._can_access(entry, course_id, role)
+        ]
+        return min(entries, key=lambda entry: entry.in_use, default=None)
+
+    def acquire(
+        self,
+        course_id: str | None = None,
+        role: str | None = None,
+        timeout: float | None = None,
+    ) -> GSConnection:
+        """Borrow a connection of an account with access to the course. Give it back with `release`.
+
+        Args:
+            course_id (str | None, optional): The course the connection is used for. Defaults to any account.
+            role (str | None, optional): The role ("instructor" or "student") needed in the course.
+                Defaults to any role.
+            timeout (float | None, optional): Seconds to wait for a free connection. Defaults to waiting forever.
+
+        Raises:
+            NoSessionAvailable: If no account has access to the course (or all failed to log in
+                and are waiting to retry), or the timeout expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                entry = self._wait_for_entry(course_id, role, deadline)
+                entry.in_use += 1
+                needs_validation = (
+                    time.monotonic() - entry.used_at > self.validate_after_s
+                )
+            if not needs_validation:
+                break
+            try:
+                valid = is_session_valid(
+                    entry.connection.session, self.gradescope_base_url
+                )
+            except Exception:
+                # e.g. a network error, which does not mean the session expired
+                valid = True
+            with self._condition:
+                if valid:
+                    entry.used_at = time.monotonic()
+                    break
+                # expired, log in again in the background and try another connection
+                entry.in_use -= 1
+                if entry.status == "ready":
+                    entry.status = "logging_in"
+                    self._relogin_executor.submit(self._login, entry)
+
+        with self._condition:
+            connection = entry.connection
+            _, uses = self._lent.get(id(connection), (entry, 0))
+            self._lent[id(connection)] = (entry, uses + 1)
+        return connection
+
+    def _wait_for_entry(
+        self, course_id: str | None, role: str | None, deadline: float | None
+    ) -> _PoolEntry:
+        # called with the lock held
+        while True:
+            entry = self._pick(course_id, role)
+            if entry is not None:
+                return entry
+
+            new_entry = next(
+                (entry for entry in self._entries if self._can_login(entry)), None
+            )
+            if new_entry is not None:
+                # no logged in account can serve the task (now), so log in another one
+                new_entry.status = "logging_in"
+                self._condition.release()
+                try:
+                    self._login(new_entry)
+                finally:
+                    self._condition.acquire()
+                continue
+
+            pending = any(
+                entry.status == "logging_in"
+                or (
+                    entry.status == "ready" and self._can_access(entry, course_id, role)
+                )
+                for entry in self._entries
+            )
+            if not pending:
+                errors = [str(entry.error) for entry in self._entries if entry.error]
+                raise NoSessionAvailable(
+                    f"No account of the pool can access course {course_id}"
+                    + (f" as {role}" if role else "")
+                    + (f". Login errors: {'; '.join(errors)}" if errors else "")
+                )
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise NoSessionAvailable("Timed out waiting for a free session")
+            self._condition.wait(remaining)
+
+    def release(self, connection: GSConnection):
+        """Give back a connection borrowed with `acquire`."""
+        with self._condition:
+            if id(connection) not in self._lent:
+                raise ValueError("Connection was not borrowed from this pool")
+            entry, uses = self._lent.pop(id(connection))
+            if uses > 1:
+                self._lent[id(connection)] = (entry, uses - 1)
+            entry.in_use -= 1
+            entry.used_at = time.monotonic()
+            self._condition.notify_all()
+
+    @contextmanager
+    def connection(
+        self,
+        course_id: str | None = None,
+        role: str | None = None,
+        timeout: float | None = None,
+    ) -> Iterator[GSConnection]:
+        """Borrow a connection for the duration of a `with` block, see `acquire`."""
+        connection = self.acquire(course_id, role, timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self):
+        """Stop logging in again in the background."""
+        self._relogin_executor.shutdown(wait=False, cancel_futures=True)
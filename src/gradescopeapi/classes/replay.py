@@ -0,0 +1,274 @@
+"""Record and replay Gradescope traffic for deterministic offline runs.
+
+`record` mounts a transport adapter capturing every request/response pair made through a session
+(e.g. `GSConnection.session`) into a cassette: gzip-compressed JSON with credentials scrubbed.
+`replay` mounts an adapter serving those responses back without any network access, optionally
+with the recorded or a synthetic latency, so `Account` methods and the write helpers run offline.
+Both also cover the shared session downloading submitted files (see `download_text_file`), so
+recording and replaying affect those downloads process-wide.
+
+Requests are matched on method and scrubbed URL. Repeated requests are answered in recorded
+order, and the last response is repeated once a request's recordings are used up.
+"""
+
+import base64
+import gzip
+import http.client
+import io
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from collections import defaultdict
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPHeaderDict, HTTPResponse
+
+from gradescopeapi.classes._helpers._assignment_helpers import get_download_session
+from gradescopeapi.classes._helpers._retry_helpers import RetryAdapter, RetryPolicy
+
+CASSETTE_VERSION = 1
+REDACTED = "REDACTED"
+
+# query and form parameters holding credentials, e.g. the login request and presigned links
+SENSITIVE_PARAMS = {
+    "authenticity_token",
+    "session[email]",
+    "session[password]",
+    "password",
+    "X-Amz-Signature",
+    "X-Amz-Credential",
+    "X-Amz-Security-Token",
+}
+# headers that are not recorded: the body is stored decoded and without chunking
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+SENSITIVE_BODY_PATTERNS = [
+    # hidden form tokens and the csrf meta tag
+    re.compile(rb'(name="authenticity_token"[^>]*?value=")[^"]*'),
+    re.compile(rb'(value=")[^"]*("[^>]*?name="authenticity_token")'),
+    re.compile(rb'(name="csrf-token"[^>]*?content=")[^"]*'),
+    # signatures of presigned download links
+    re.compile(
+        rb"((?:X-Amz-Signature|X-Amz-Credential|X-Amz-Security-Token)=)[^&\"'\s]*"
+    ),
+]
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    pass
+
+
+def scrub_url(url: str) -> str:
+    """Replace the values of credential query parameters.
+
+    Presigned links are scrubbed like the links in recorded bodies, so a link parsed from a
+    replayed page matches the recording of its download.
+    """
+    parts = urllib.parse.urlsplit(url)
+    if not parts.query:
+        return url
+    query = [
+        (name, REDACTED if name in SENSITIVE_PARAMS else value)
+        for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+
+def _scrub_set_cookie(value: str) -> str:
+    # keep the cookie name and attributes, so replayed logins still set the cookies
+    name, _, rest = value.partition("=")
+    attributes = rest.partition(";")[2]
+    return f"{name}={REDACTED}" + (f";{attributes}" if attributes else "")
+
+
+def _scrub_body(body: bytes) -> bytes:
+    for pattern in SENSITIVE_BODY_PATTERNS:
+        if pattern.groups == 2:
+            body = pattern.sub(rb"\g<1>" + REDACTED.encode() + rb"\g<2>", body)
+        else:
+            body = pattern.sub(rb"\g<1>" + REDACTED.encode(), body)
+    return body
+
+
+class Cassette:
+    """Recorded interactions, stored as gzip-compressed JSON."""
+
+    def __init__(self, interactions: list[dict[str, Any]] | None = None):
+        self.interactions = interactions or []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "Cassette":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {data.get('version')}")
+        return cls(data["interactions"])
+
+    def save(self, path: str | os.PathLike):
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": self.interactions}
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+
+    def append(self, request: requests.PreparedRequest, response: requests.Response):
+        """Record a request/response pair with credentials scrubbed."""
+        if response.raw is not None and hasattr(response.raw, "headers"):
+            # keeps repeated headers such as Set-Cookie apart
+            header_items = list(response.raw.headers.items())
+        else:
+            header_items = list(response.headers.items())
+        headers = [
+            [name, _scrub_set_cookie(value) if name.lower() == "set-cookie" else value]
+            for name, value in header_items
+            if name.lower() not in DROPPED_HEADERS
+        ]
+        interaction = {
+            "request": {"method": request.method, "url": scrub_url(request.url)},
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": headers,
+                "body": base64.b64encode(_scrub_body(response.content)).decode(),
+                "elapsed_s": response.elapsed.total_seconds(),
+            },
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+
+class RecordingAdapter(RetryAdapter):
+    """Sends requests like the default adapter of GSConnection and records them into a cassette.
+
+    The cassette is saved to `path` when the session is closed, or explicitly with `Cassette.save`.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        path: str | os.PathLike | None = None,
+        retry_policy: RetryPolicy | None = None,
+        **kwargs,
+    ):
+        self.cassette = cassette
+        self.path = path
+        super().__init__(retry_policy, **kwargs)
+
+    def send(self, request, *args, **kwargs):
+        response = super().send(request, *args, **kwargs)
+        self.cassette.append(request, response)
+        return response
+
+    def close(self):
+        super().close()
+        if self.path is not None:
+            self.cassette.save(self.path)
+
+
+class _RecordedMessage:
+    # stands in for http.client.HTTPResponse, so requests extracts cookies from replayed responses
+    def __init__(self, headers: list[list[str]]):
+        self.msg = http.client.HTTPMessage()
+        for name, value in headers:
+            self.msg[name] = value
+
+    def isclosed(self) -> bool:
+        return True
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Serves responses from a cassette without network access.
+
+    Args:
+        cassette (Cassette): The recorded interactions.
+        latency (float | str | None, optional): Seconds to wait before each response, "recorded"
+            to wait as long as the recorded response took, or None to respond immediately.
+            Defaults to None.
+    """
+
+    def __init__(
+        self, cassette: Cassette, latency: float | str | None = None, **kwargs
+    ):
+        self.cassette = cassette
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._queues: dict[tuple[str, str], list[dict]] = defaultdict(list)
+        for interaction in cassette.interactions:
+            request = interaction["request"]
+            self._queues[(request["method"], request["url"])].append(
+                interaction["response"]
+            )
+        super().__init__(**kwargs)
+
+    def send(self, request, *args, **kwargs):
+        key = (request.method, scrub_url(request.url))
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise CassetteMiss(
+                    f"No recorded response for {key[0]} {key[1]}", request=request
+                )
+            recorded = queue.pop(0) if len(queue) > 1 else queue[0]
+
+        if self.latency == "recorded":
+            time.sleep(recorded["elapsed_s"])
+        elif self.latency is not None:
+            time.sleep(self.latency)
+
+        body = base64.b64decode(recorded["body"])
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=HTTPHeaderDict(recorded["headers"]),
+            status=recorded["status"],
+            reason=recorded["reason"],
+            preload_content=False,
+            original_response=_RecordedMessage(recorded["headers"]),
+        )
+        return self.build_response(request, raw)
+
+
+def record(
+    session: requests.Session,
+    path: str | os.PathLike | None = None,
+    retry_policy: RetryPolicy | None = None,
+) -> Cassette:
+    """Record all requests made through the session, e.g. `GSConnection.session`.
+
+    Args:
+        session (requests.Session): The session to record.
+        path (str | os.PathLike | None, optional): If set, the cassette is saved there when the
+            session is closed. Defaults to None.
+        retry_policy (RetryPolicy | None, optional): Retry policy of the recording adapter, which
+            replaces the default adapter of the session. Defaults to the default RetryPolicy.
+
+    Returns:
+        Cassette: The cassette being recorded into.
+    """
+    cassette = Cassette()
+    adapter = RecordingAdapter(cassette, path, retry_policy)
+    for mounted in (session, get_download_session()):
+        mounted.mount("https://", adapter)
+        mounted.mount("http://", adapter)
+    return cassette
+
+
+def replay(
+    session: requests.Session,
+    cassette: Cassette | str | os.PathLike,
+    latency: float | str | None = None,
+) -> ReplayAdapter:
+    """Serve all requests made through the session from a cassette (or the path of a saved one).
+
+    See `ReplayAdapter` for the latency options. Requests without a recording raise CassetteMiss.
+    """
+    if not isinstance(cassette, Cassette):
+        cassette = Cassette.load(cassette)
+    adapter = ReplayAdapter(cassette, latency)
+    for mounted in (session, get_download_session()):
+        mounted.mount("https://", adapter)
+        mounted.mount("http://", adapter)
+    return adapter
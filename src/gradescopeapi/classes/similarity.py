@@ -0,0 +1,316 @@
+"""Find similar submissions of an assignment without comparing every pair.
+
+Every submission is reduced to a set of fingerprints by winnowing (as in MOSS): the text files
+are stripped of whitespace, every k-gram of characters is hashed, and the minimum hash of every
+window of consecutive k-grams is kept. Fingerprints shared with the starter code can be ignored.
+
+The fingerprint sets are summarized by MinHash signatures (one permutation hashing, so a single
+pass over the fingerprints, with empty bins filled by optimal densification) and bucketed by
+locality sensitive hashing: submissions sharing a bucket in any band of their signature become
+candidate pairs. Only candidate pairs are compared
+exactly, so the work grows roughly linearly with the number of submissions.
+
+Fingerprints are kept per submission ID and can be saved, so adding submissions to a saved index
+only fingerprints the new submissions.
+"""
+
+import gzip
+import json
+import os
+from collections import deque
+from collections.abc import Iterable
+
+import requests
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    download_text_file,
+    get_submission_text_files,
+)
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    iter_concurrently,
+)
+from gradescopeapi.classes.archive import SubmissionArchive
+
+INDEX_VERSION = 1
+DEFAULT_K = 16  # characters per k-gram
+DEFAULT_WINDOW = 8  # k-grams per winnowing window
+DEFAULT_NUM_BINS = 128  # length of the MinHash signatures
+DEFAULT_BANDS = 32  # LSH bands, each of DEFAULT_NUM_BINS // DEFAULT_BANDS bins
+
+_MOD = (1 << 61) - 1  # Mersenne prime modulus of the rolling hash
+_BASE = 257
+_HASH_BITS = 61
+_MASK_64 = (1 << 64) - 1
+
+
+def _kgram_hashes(text: str, k: int) -> list[int]:
+    # Rabin-Karp rolling hash of every k-gram
+    codes = [ord(char) for char in text]
+    if len(codes) < k:
+        return []
+    top = pow(_BASE, k - 1, _MOD)
+    value = 0
+    for code in codes[:k]:
+        value = (value * _BASE + code) % _MOD
+    hashes = [value]
+    for i in range(k, len(codes)):
+        value = ((value - codes[i - k] * top) * _BASE + codes[i]) % _MOD
+        hashes.append(value)
+    return hashes
+
+
+def winnow(hashes: list[int], window: int) -> set[int]:
+    """Select the minimum hash (the rightmost one on ties) of every window of hashes."""
+    if len(hashes) <= window:
+        return {min(hashes)} if hashes else set()
+    fingerprints = set()
+    candidates = deque()  # indices of increasing hashes within the current window
+    for i, value in enumerate(hashes):
+        while candidates and hashes[candidates[-1]] >= value:
+            candidates.pop()
+        candidates.append(i)
+        if candidates[0] <= i - window:
+            candidates.popleft()
+        if i >= window - 1:
+            fingerprints.add(hashes[candidates[0]])
+    return fingerprints
+
+
+def fingerprint(
+    texts: Iterable[str], k: int = DEFAULT_K, window: int = DEFAULT_WINDOW
+) -> set[int]:
+    """Get the winnowing fingerprints of the files of a submission."""
+    fingerprints = set()
+    for text in texts:
+        normalized = "".join(text.split())
+        fingerprints |= winnow(_kgram_hashes(normalized, k), window)
+    return fingerprints
+
+
+def _mix(value: int) -> int:
+    # splitmix64 finalizer, a fixed pseudo-random function shared by all signatures
+    value = (value + 0x9E3779B97F4A7C15) & _MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return value ^ (value >> 31)
+
+
+def jaccard(a: set[int], b: set[int]) -> float:
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class SimilarityIndex:
+    """Fingerprints of submissions, indexed for finding similar pairs.
+
+    Args:
+        k (int, optional): Characters per k-gram, shorter matches are not detected. Defaults to DEFAULT_K.
+        window (int, optional): Winnowing window, matches of at least `k + window - 1` characters
+            are always detected. Defaults to DEFAULT_WINDOW.
+        num_bins (int, optional): Length of the MinHash signatures. Defaults to DEFAULT_NUM_BINS.
+        bands (int, optional): Number of LSH bands, more bands find less similar pairs but
+            produce more candidates. Must divide `num_bins`. Defaults to DEFAULT_BANDS.
+        base_texts (Iterable[str], optional): Starter code, whose fingerprints are ignored. Defaults to ().
+    """
+
+    def __init__(
+        self,
+        k: int = DEFAULT_K,
+        window: int = DEFAULT_WINDOW,
+        num_bins: int = DEFAULT_NUM_BINS,
+        bands: int = DEFAULT_BANDS,
+        base_texts: Iterable[str] = (),
+    ):
+        if num_bins % bands != 0:
+            raise ValueError("bands must divide num_bins")
+        self.k = k
+        self.window = window
+        self.num_bins = num_bins
+        self.bands = bands
+        self.ignored = fingerprint(base_texts, k, window)
+        self.fingerprints: dict[str, frozenset[int]] = {}
+        self._signatures: dict[str, tuple] = {}
+        self._buckets: dict[tuple, set[str]] = {}
+
+    def __contains__(self, submission_id: str) -> bool:
+        return submission_id in self.fingerprints
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def _signature(self, fingerprints: frozenset[int]) -> tuple:
+        # one permutation hashing: the bin of a fingerprint is its remainder, its value the quotient
+        signature = [None] * self.num_bins
+        for value in fingerprints:
+            bin_index = value % self.num_bins
+            value //= self.num_bins
+            current = signature[bin_index]
+            if current is None or value < current:
+                signature[bin_index] = value
+        # Small submissions leave bins empty, and bands of empty bins would collide for all
+        # of them. Optimal densification fills every empty bin with the value of a non-empty
+        # bin chosen by a probe sequence that only depends on the bin, so filled bins of two
+        # submissions still agree with probability equal to their Jaccard similarity.
+        densified = list(signature)
+        for bin_index, value in enumerate(signature):
+            attempt = 0
+            while value is None:
+                attempt += 1
+                probe = _mix((attempt << 32) | bin_index) % self.num_bins
+                value = signature[probe]
+            densified[bin_index] = value
+        return tuple(densified)
+
+    def _index(self, submission_id: str, fingerprints: frozenset[int]):
+        self.fingerprints[submission_id] = fingerprints
+        if not fingerprints:
+            return  # nothing to compare
+        signature = self._signature(fingerprints)
+        self._signatures[submission_id] = signature
+        rows = self.num_bins // self.bands
+        for band in range(self.bands):
+            key = (band, signature[band * rows : (band + 1) * rows])
+            self._buckets.setdefault(key, set()).add(submission_id)
+
+    def add(self, submission_id: str, texts: Iterable[str]) -> bool:
+        """Fingerprint and index a submission, unless it is indexed already.
+
+        Returns:
+            bool: Whether the submission was added.
+        """
+        if submission_id in self.fingerprints:
+            return False
+        fingerprints = fingerprint(texts, self.k, self.window) - self.ignored
+        self._index(submission_id, frozenset(fingerprints))
+        return True
+
+    def candidate_pairs(self) -> set[tuple[str, str]]:
+        """Get the pairs of submissions sharing an LSH bucket, as sorted tuples."""
+        pairs = set()
+        for submission_ids in self._buckets.values():
+            if len(submission_ids) < 2:
+                continue
+            submission_ids = sorted(submission_ids)
+            for i, first in enumerate(submission_ids):
+                for second in submission_ids[i + 1 :]:
+                    pairs.add((first, second))
+        return pairs
+
+    def similar_pairs(self, threshold: float = 0.5) -> list[tuple[str, str, float]]:
+        """Get the candidate pairs whose fingerprints overlap by at least `threshold` (Jaccard).
+
+        Returns:
+            list[tuple[str, str, float]]: The submission IDs and their similarity, most similar first.
+        """
+        pairs = []
+        for first, second in self.candidate_pairs():
+            similarity = jaccard(self.fingerprints[first], self.fingerprints[second])
+            if similarity >= threshold:
+                pairs.append((first, second, similarity))
+        return sorted(pairs, key=lambda pair: (-pair[2], pair[0], pair[1]))
+
+    def _params(self) -> dict:
+        return {
+            "k": self.k,
+            "window": self.window,
+            "num_bins": self.num_bins,
+            "bands": self.bands,
+            "ignored": sorted(self.ignored),
+        }
+
+    def save(self, path: str | os.PathLike):
+        """Save the fingerprints as gzip-compressed JSON."""
+        data = {
+            "version": INDEX_VERSION,
+            "params": self._params(),
+            "fingerprints": {
+                submission_id: sorted(fingerprints)
+                for submission_id, fingerprints in self.fingerprints.items()
+            },
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "SimilarityIndex":
+        """Load an index saved by `save`, with the parameters it was built with."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported index version: {data.get('version')}")
+        params = data["params"]
+        index = cls(params["k"], params["window"], params["num_bins"], params["bands"])
+        index.ignored = set(params["ignored"])
+        for submission_id, fingerprints in data["fingerprints"].items():
+            index._index(submission_id, frozenset(fingerprints))
+        return index
+
+
+def index_submissions(
+    index: SimilarityIndex,
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    submission_ids: Iterable[str],
+    archive: SubmissionArchive | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: RateLimiter | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> dict[str, Exception]:
+    """Download and add the text files of submissions that are not indexed yet.
+
+    Files are downloaded concurrently and fingerprinted as they arrive, one submission at a time.
+
+    Args:
+        index (SimilarityIndex): The index to add the submissions to.
+        session (requests.Session): The session object used for making HTTP requests.
+        course_id (str): The ID of the course.
+        assignment_id (str): The ID of the assignment.
+        submission_ids (Iterable[str]): The submissions, e.g. the active submissions of
+            `download.get_active_submissions`.
+        archive (SubmissionArchive | None, optional): If set, files are read from (and downloaded
+            into) the archive. Defaults to None.
+        max_workers (int, optional): Maximum number of concurrent downloads. Defaults to DEFAULT_MAX_WORKERS.
+        rate_limiter (RateLimiter | None, optional): Shared rate limiter for the requests. Defaults to a new RateLimiter.
+
+    Returns:
+        dict[str, Exception]: The exceptions raised, by submission ID.
+    """
+
+    def download(submission_id: str) -> list[str]:
+        if archive is not None:
+            manifest = archive.fetch(
+                session, course_id, assignment_id, submission_id, gradescope_base_url
+            )
+            contents = [
+                archive.read(submission_id, path, mmap_threshold=None)
+                for path in manifest
+            ]
+        else:
+            contents = []
+            for text_file in get_submission_text_files(
+                session, course_id, assignment_id, submission_id, gradescope_base_url
+            ):
+                contents.append(download_text_file(text_file["url"]).content)
+        return [content.decode("utf-8", errors="replace") for content in contents]
+
+    errors = {}
+    for submission_id, texts, error in iter_concurrently(
+        download,
+        [
+            submission_id
+            for submission_id in dict.fromkeys(submission_ids)
+            if submission_id not in index
+        ],
+        max_workers=max_workers,
+        rate_limiter=rate_limiter or RateLimiter(),
+    ):
+        if error is not None:
+            errors[submission_id] = error
+        else:
+            index.add(submission_id, texts)
+    return errors
@@ -1,86 +1,474 @@
 """Functions for uploading assignments to Gradescope."""
 
+import contextlib
+import hashlib
 import io
+import json
 import mimetypes
+import os
 import pathlib
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import BinaryIO
 
 import requests
 from bs4 import BeautifulSoup
-from requests_toolbelt.multipart.encoder import MultipartEncoder
+from requests_toolbelt.multipart.encoder import (
+    MultipartEncoder,
+    MultipartEncoderMonitor,
+)
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    download_text_file,
+    get_submission_text_files,
+)
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    run_concurrently,
+)
+from gradescopeapi.classes._helpers._extract_helpers import get_csrf_token
+
+# Anything that can be uploaded: an open file/binary stream, a path to a file,
+# raw bytes, or a (filename, bytes | stream) tuple
+UploadFile = (
+    io.IOBase
+    | BinaryIO
+    | str
+    | os.PathLike
+    | bytes
+    | tuple[str, bytes | io.IOBase | BinaryIO]
+)
+
+
+@dataclass
+class UploadProgress:
+    bytes_sent: int
+    total_bytes: int
+    elapsed_s: float
+    bytes_per_second: float
+
+
+@dataclass
+class SubmissionUploadResult:
+    owner_id: str
+    submission_link: str | None  # None if the upload was unsuccessful
+    error: str | None = None
+
+
+def _get_upload_filename(file: UploadFile, index: int) -> str:
+    """Get the filename a file input is uploaded as."""
+    if isinstance(file, tuple):
+        return file[0]
+    if isinstance(file, (str, os.PathLike)):
+        return pathlib.Path(file).name
+    # raw bytes, or a file object or arbitrary stream whose name may not be available
+    name = getattr(file, "name", None)
+    return pathlib.Path(name).name if isinstance(name, str) else f"file_{index}"
+
+
+def _prepare_upload_file(
+    file: UploadFile, index: int, exit_stack: contextlib.ExitStack
+) -> tuple[str, BinaryIO | bytes, str | None]:
+    """Convert a supported file input into a (filename, data, mimetype) tuple for MultipartEncoder.
+
+    Paths are opened in binary mode and closed by `exit_stack`. Streams are passed through
+    as is so MultipartEncoder reads them in chunks instead of loading them into memory.
+    """
+    filename = _get_upload_filename(file, index)
+    if isinstance(file, tuple):
+        data = file[1]
+    elif isinstance(file, (str, os.PathLike)):
+        data = exit_stack.enter_context(open(file, "rb"))
+    elif isinstance(file, (bytes, bytearray)):
+        data = bytes(file)
+    else:
+        data = file
+
+    return filename, data, mimetypes.guess_type(filename)[0]
 
 
 def upload_assignment(
     session: requests.Session,
     course_id: str,
     assignment_id: str,
-    *files: io.TextIOWrapper,
+    *files: UploadFile,
     leaderboard_name: str | None = None,
     owner_id: str | None = None,
+    progress_callback: Callable[[UploadProgress], None] | None = None,
+    skip_if_unchanged: bool = False,
+    hash_ledger_path: str | os.PathLike | None = None,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
 ) -> str | None:
-    """Uploads given file objects to the specified assignment on Gradescope.
+    """Uploads given files to the specified assignment on Gradescope.
+
+    Files are streamed to Gradescope, so memory usage stays flat regardless of file size.
+
+    If `skip_if_unchanged` is set, the files are hashed and compared with the latest active
+    submission first. If the file names and contents match, nothing is uploaded and the link to the existing
+    submission is returned. The latest submission is looked up in the hash ledger at
+    `hash_ledger_path` if given, otherwise its text files are downloaded from Gradescope.
 
     Args:
         session (requests.Session): The session object to use for making HTTP requests.
         course_id (str): The ID of the course on Gradescope.
         assignment_id (str): The ID of the assignment on Gradescope.
-        *files (io.TextIOWrapper): Variable number of file objects to upload.
+        *files (UploadFile): Variable number of files to upload. Each file can be an open file object
+            or binary stream, a path, raw bytes, or a (filename, bytes | stream) tuple.
         leaderboard_name (str | None, optional): The name of the leaderboard. Defaults to None.
+        owner_id (str | None, optional): The user ID of the student to submit on behalf of. Defaults to None.
+        progress_callback (Callable[[UploadProgress], None] | None, optional): Called as the request body
+            is sent with the number of bytes sent so far and the upload rate. Defaults to None.
+        skip_if_unchanged (bool, optional): Skip the upload if the files match the latest active submission.
+            Defaults to False.
+        hash_ledger_path (str | os.PathLike | None, optional): Path to a JSON file recording the hashes of
+            previous uploads. Defaults to None.
+
+    Notes:
+        Without a hash ledger, only submissions of the logged in user (no `owner_id`) can be compared, and
+        only if the files were uploaded as is. Gradescope extracts uploaded archives, so zip files never
+        match the files of the active submission; use a hash ledger for those. Non-seekable streams cannot
+        be hashed without consuming them, so they are always uploaded.
 
     Returns:
         str | None: Link to submission if successful or None if unsuccessful.
     """
+    # hash before uploading, since uploading consumes streams
+    file_hashes = (
+        _hash_upload_files(files)
+        if skip_if_unchanged or hash_ledger_path is not None
+        else None
+    )
+    ledger_key = f"{course_id}/{assignment_id}/{owner_id or ''}"
+    if skip_if_unchanged and file_hashes is not None:
+        if hash_ledger_path is not None:
+            ledger_entry = _read_hash_ledger(hash_ledger_path).get(ledger_key)
+            if ledger_entry and ledger_entry["file_hashes"] == file_hashes:
+                return ledger_entry["submission_link"]
+        elif owner_id is None:
+            submission_link = _get_active_submission_link(
+                session, course_id, assignment_id, gradescope_base_url
+            )
+            if submission_link is not None and file_hashes == _hash_submission_files(
+                session,
+                course_id,
+                assignment_id,
+                submission_link.split("/")[-1],
+                gradescope_base_url,
+            ):
+                return submission_link
+
+    auth_token = get_upload_auth_token(session, course_id, gradescope_base_url)
+
+    submission_link = _post_submission(
+        session,
+        course_id,
+        assignment_id,
+        auth_token,
+        files,
+        leaderboard_name=leaderboard_name,
+        owner_id=owner_id,
+        progress_callback=progress_callback,
+        gradescope_base_url=gradescope_base_url,
+    )
+
+    if (
+        submission_link is not None
+        and hash_ledger_path is not None
+        and file_hashes is not None
+    ):
+        _write_hash_ledger_entry(
+            hash_ledger_path,
+            ledger_key,
+            {"file_hashes": file_hashes, "submission_link": submission_link},
+        )
+    return submission_link
+
+
+def _hash_upload_files(files: Sequence[UploadFile]) -> list[list[str]] | None:
+    """Return the sorted [filename, SHA-256 digest] pairs of the files, or None if a file can't be hashed.
+
+    Streams are rewound to their original position after hashing.
+    """
+    file_hashes = []
+    for i, file in enumerate(files):
+        filename = _get_upload_filename(file, i)
+        data = file[1] if isinstance(file, tuple) else file
+        if isinstance(data, (bytes, bytearray)):
+            file_hashes.append([filename, hashlib.sha256(data).hexdigest()])
+        elif isinstance(data, (str, os.PathLike)):
+            with open(data, "rb") as f:
+                file_hashes.append([filename, _hash_stream(f)])
+        else:
+            if not (hasattr(data, "seekable") and data.seekable()):
+                return None
+            position = data.tell()
+            file_hashes.append([filename, _hash_stream(data)])
+            data.seek(position)
+    return sorted(file_hashes)
+
+
+def _hash_stream(stream: BinaryIO) -> str:
+    file_hash = hashlib.sha256()
+    while chunk := stream.read(1024 * 1024):
+        if isinstance(chunk, str):
+            # text mode streams, e.g. io.TextIOWrapper
+            chunk = chunk.encode()
+        file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _get_active_submission_link(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> str | None:
+    """Return the link to the logged in user's active submission, or None if there is none."""
+    GS_ASSIGNMENT_ENDPOINT = (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+    )
+
+    # the assignment page redirects to the active submission if there is one
+    response = session.get(GS_ASSIGNMENT_ENDPOINT)
+    if (
+        response.status_code == requests.codes.ok
+        and response.url.startswith(f"{GS_ASSIGNMENT_ENDPOINT}/submissions/")
+        and response.url.split("/")[-1].isdigit()
+    ):
+        return response.url
+    return None
+
+
+def _hash_submission_files(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    submission_id: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> list[list[str]] | None:
+    """Return the sorted [path, SHA-256 digest] pairs of the text files of a submission, or None if unavailable."""
+    try:
+        text_files = get_submission_text_files(
+            session, course_id, assignment_id, submission_id, gradescope_base_url
+        )
+    except NotImplementedError:
+        # image only submissions
+        return None
+    except RuntimeError:
+        # the files could not be looked up, so upload anyway
+        return None
+
+    file_hashes = []
+    for text_file in text_files:
+        file_hash = hashlib.sha256()
+        try:
+            response = download_text_file(text_file["url"], stream=True)
+        except RuntimeError:
+            return None
+        with response:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                file_hash.update(chunk)
+        file_hashes.append([text_file["path"], file_hash.hexdigest()])
+    return sorted(file_hashes)
+
+
+def _read_hash_ledger(hash_ledger_path: str | os.PathLike) -> dict:
+    try:
+        with open(hash_ledger_path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+# serializes the read-modify-write of hash ledgers by concurrent (bulk) uploads
+_hash_ledger_lock = threading.Lock()
+
+
+def _write_hash_ledger_entry(
+    hash_ledger_path: str | os.PathLike, ledger_key: str, ledger_entry: dict
+):
+    with _hash_ledger_lock:
+        ledger = _read_hash_ledger(hash_ledger_path)
+        ledger[ledger_key] = ledger_entry
+        # replace the ledger atomically, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(hash_ledger_path)), prefix=".tmp-"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(ledger, f, indent=2)
+            os.replace(tmp_path, hash_ledger_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def get_upload_auth_token(
+    session: requests.Session,
+    course_id: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> str:
+    """Get the CSRF token used to submit to assignments in a course."""
     GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
-    GS_UPLOAD_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/submissions"
 
-    # Get auth token
-    # TODO: Refactor to helper function since it is needed in multiple places
     response = session.get(GS_COURSE_ENDPOINT)
+    csrf_token = get_csrf_token(response.text)
+    if csrf_token is not None:
+        return csrf_token
     soup = BeautifulSoup(response.text, "html.parser")
-    auth_token = soup.find("meta", {"name": "csrf-token"})["content"]
-
-    # Format files for upload
-    form_files = []
-    for file in files:
-        form_files.append(
-            (
-                "submission[files][]",
-                (
-                    pathlib.Path(file.name).name,  # get the filename from the path
-                    file,
-                    mimetypes.guess_type(file.name)[0],
-                ),
-            )
-        )
+    return soup.find("meta", {"name": "csrf-token"})["content"]
+
+
+def _post_submission(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    auth_token: str,
+    files: Sequence[UploadFile],
+    leaderboard_name: str | None = None,
+    owner_id: str | None = None,
+    progress_callback: Callable[[UploadProgress], None] | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> str | None:
+    GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
+    GS_UPLOAD_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/submissions"
+
+    with contextlib.ExitStack() as exit_stack:
+        # Format files for upload
+        form_files = [
+            ("submission[files][]", _prepare_upload_file(file, i, exit_stack))
+            for i, file in enumerate(files)
+        ]
 
-    # Setup multipart form data
-    fields = [
-        ("utf8", "✓"),
-        ("authenticity_token", auth_token),
-        ("submission[method]", "upload"),
-        *form_files,
-    ]
-    if leaderboard_name is not None:
-        fields.append(("submission[leaderboard_name]", leaderboard_name))
+        # Setup multipart form data
+        fields = [
+            ("utf8", "✓"),
+            ("authenticity_token", auth_token),
+            ("submission[method]", "upload"),
+            *form_files,
+        ]
+        if leaderboard_name is not None:
+            fields.append(("submission[leaderboard_name]", leaderboard_name))
 
-    if owner_id is not None:
-        fields.append(("submission[owner_id]", owner_id))
+        if owner_id is not None:
+            fields.append(("submission[owner_id]", owner_id))
 
-    multipart = MultipartEncoder(fields=fields)
+        multipart = MultipartEncoder(fields=fields)
+        if progress_callback is not None:
+            start_time = time.monotonic()
 
-    headers = {
-        "Content-Type": multipart.content_type,
-        "Referer": GS_COURSE_ENDPOINT,
-    }
-    response = session.post(GS_UPLOAD_ENDPOINT, data=multipart, headers=headers)
+            def monitor_callback(monitor: MultipartEncoderMonitor):
+                elapsed_s = time.monotonic() - start_time
+                progress_callback(
+                    UploadProgress(
+                        bytes_sent=monitor.bytes_read,
+                        total_bytes=monitor.len,
+                        elapsed_s=elapsed_s,
+                        bytes_per_second=(
+                            monitor.bytes_read / elapsed_s if elapsed_s > 0 else 0.0
+                        ),
+                    )
+                )
 
+            multipart = MultipartEncoderMonitor(multipart, monitor_callback)
+
+        headers = {
+            "Content-Type": multipart.content_type,
+            "Referer": GS_COURSE_ENDPOINT,
+        }
+        response = session.post(GS_UPLOAD_ENDPOINT, data=multipart, headers=headers)
+
+    return _get_submission_link(response, GS_COURSE_ENDPOINT)
+
+
+def _get_submission_link(
+    response: requests.Response, course_endpoint: str
+) -> str | None:
     # Note: Response status code is always 200 even if upload was unsuccessful (e.g. past the due date,
     # missing form fields, etc.). The response from the server either redirects to the submission page (url)
     # if successful, or redirects to the Course homepage if unsuccessful.
     return (
         None
-        if response.url == GS_COURSE_ENDPOINT or response.url.endswith("submissions")
+        if response.url == course_endpoint or response.url.endswith("submissions")
         else response.url
     )
+
+
+def upload_assignments_for_students(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    files_by_owner_id: dict[str, Sequence[UploadFile]],
+    leaderboard_name: str | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limiter: RateLimiter | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> dict[str, SubmissionUploadResult]:
+    """Uploads submissions on behalf of many students to the specified assignment on Gradescope.
+
+    The CSRF token is fetched once and shared by all uploads, which run concurrently.
+    A failed upload for one student does not stop the uploads for other students.
+
+    Args:
+        session (requests.Session): The session object to use for making HTTP requests.
+        course_id (str): The ID of the course on Gradescope.
+        assignment_id (str): The ID of the assignment on Gradescope.
+        files_by_owner_id (dict[str, Sequence[UploadFile]]): Maps the user ID of each student to the files
+            to submit for them. See `upload_assignment` for the supported file types.
+        leaderboard_name (str | None, optional): The name of the leaderboard. Defaults to None.
+        max_workers (int, optional): Maximum number of concurrent uploads. Defaults to DEFAULT_MAX_WORKERS.
+        rate_limiter (RateLimiter | None, optional): Shared limit on the rate of uploads. Defaults to a new
+            RateLimiter with the default rate.
+
+    Notes:
+        Only instructors (and TAs) are able to submit on behalf of students.
+
+    Returns:
+        dict[str, SubmissionUploadResult]: The result of each upload, keyed by owner ID.
+        For example:
+
+        {
+            "123456": SubmissionUploadResult(owner_id="123456", submission_link="https://...", error=None),
+            "654321": SubmissionUploadResult(owner_id="654321", submission_link=None, error="..."),
+        }
+    """
+    auth_token = get_upload_auth_token(session, course_id, gradescope_base_url)
+
+    def upload(owner_id: str) -> str | None:
+        return _post_submission(
+            session,
+            course_id,
+            assignment_id,
+            auth_token,
+            files_by_owner_id[owner_id],
+            leaderboard_name=leaderboard_name,
+            owner_id=owner_id,
+            gradescope_base_url=gradescope_base_url,
+        )
+
+    submission_links, errors = run_concurrently(
+        upload,
+        files_by_owner_id,
+        max_workers=max_workers,
+        rate_limiter=rate_limiter or RateLimiter(),
+    )
+
+    results = {}
+    for owner_id in files_by_owner_id:
+        if owner_id in errors:
+            results[owner_id] = SubmissionUploadResult(
+                owner_id=owner_id, submission_link=None, error=str(errors[owner_id])
+            )
+        else:
+            submission_link = submission_links[owner_id]
+            results[owner_id] = SubmissionUploadResult(
+                owner_id=owner_id,
+                submission_link=submission_link,
+                error=None if submission_link else "Upload unsuccessful",
+            )
+    return results
@@ -0,0 +1,176 @@
+"""Watch an assignment for new or changed submissions.
+
+The watcher polls the review_grades page of an assignment (the page behind
+`Account.get_assignment_submission_infos`) with conditional requests, diffs it against the last
+snapshot by submission ID and timestamp, and reports only new or changed submissions.
+Polling is tight around the deadlines of the assignment and backs off while nothing changes.
+"""
+
+import datetime
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    check_page_response,
+    get_submission_infos,
+    parse_review_grades,
+)
+from gradescopeapi.classes.account import Account
+
+
+@dataclass
+class SubmissionEvent:
+    kind: str  # "new" (first submission of the student) or "changed" (resubmitted)
+    email: str
+    # as returned by Account.get_assignment_submission_infos
+    submission_info: dict[str, Any]
+    previous_submission_info: dict[str, Any] | None = None
+
+
+def _submission_key(submission_info: dict[str, Any]) -> tuple:
+    submission = submission_info["submissions"][0]
+    return submission.get("submission_id"), submission.get("epochtime_s")
+
+
+def diff_submission_infos(
+    previous: dict[str, dict[str, Any]], current: dict[str, dict[str, Any]]
+) -> list[SubmissionEvent]:
+    """Get the events for submissions in `current` that are new or changed since `previous`."""
+    events = []
+    for email, submission_info in current.items():
+        previous_info = previous.get(email)
+        if previous_info is None:
+            events.append(SubmissionEvent("new", email, submission_info))
+        elif _submission_key(previous_info) != _submission_key(submission_info):
+            events.append(
+                SubmissionEvent("changed", email, submission_info, previous_info)
+            )
+    return events
+
+
+class SubmissionWatcher:
+    """Polls an assignment for new or changed submissions. ONLY FOR INSTRUCTORS.
+
+    Args:
+        account (Account): The account used to poll.
+        course_id (str): The ID of the course.
+        assignment_id (str): The ID of the assignment.
+        due_date (datetime.datetime | None, optional): Due date of the assignment. Defaults to None.
+        late_due_date (datetime.datetime | None, optional): Late due date of the assignment. Defaults to None.
+        min_interval_s (float, optional): Poll interval near a deadline and right after a change.
+            Defaults to 5 seconds.
+        max_interval_s (float, optional): Longest poll interval while idle. Defaults to 5 minutes.
+        deadline_window_s (float, optional): How long before and after a deadline polling stays at
+            `min_interval_s`. Defaults to 30 minutes.
+        backoff_factor (float, optional): Growth of the interval per poll without changes. Defaults to 1.5.
+        on_event (Callable[[SubmissionEvent], None] | None, optional): Called for every event. Defaults to None.
+        report_existing (bool, optional): Whether the submissions found by the first poll are reported
+            as new. Defaults to False, so only submissions made while watching are reported.
+
+    Raises:
+        ValueError: If a deadline has no timezone.
+    """
+
+    def __init__(
+        self,
+        account: Account,
+        course_id: str,
+        assignment_id: str,
+        due_date: datetime.datetime | None = None,
+        late_due_date: datetime.datetime | None = None,
+        min_interval_s: float = 5,
+        max_interval_s: float = 5 * 60,
+        deadline_window_s: float = 30 * 60,
+        backoff_factor: float = 1.5,
+        on_event: Callable[[SubmissionEvent], None] | None = None,
+        report_existing: bool = False,
+    ):
+        self.account = account
+        self.course_id = course_id
+        self.assignment_id = assignment_id
+        self.deadlines = [
+            date for date in (due_date, late_due_date) if date is not None
+        ]
+        if any(deadline.utcoffset() is None for deadline in self.deadlines):
+            # compared against the current time in UTC
+            raise ValueError("due_date and late_due_date must be timezone aware")
+        self.min_interval_s = min_interval_s
+        self.max_interval_s = max_interval_s
+        self.deadline_window_s = deadline_window_s
+        self.backoff_factor = backoff_factor
+        self.on_event = on_event
+        self.report_existing = report_existing
+
+        self.endpoint = f"{account.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/review_grades"
+        self.snapshot: dict[str, dict[str, Any]] | None = None
+        self.idle_polls = 0  # polls without changes since the last change
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+
+    def poll(self) -> list[SubmissionEvent]:
+        """Fetch the submissions once and return the events since the last poll."""
+        headers = {}
+        if self._etag is not None:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified is not None:
+            headers["If-Modified-Since"] = self._last_modified
+        response = self.account.session.get(self.endpoint, headers=headers)
+
+        if response.status_code == requests.codes.not_modified:
+            events = []
+        else:
+            check_page_response(response, self.endpoint)
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+            submission_infos = get_submission_infos(parse_review_grades(response.text))
+            # share the fresh snapshot with other users of the account
+            self.account.assignment_submission_cache.setdefault(self.course_id, {})[
+                self.assignment_id
+            ] = submission_infos
+
+            if self.snapshot is None and not self.report_existing:
+                events = []
+            else:
+                events = diff_submission_infos(self.snapshot or {}, submission_infos)
+            self.snapshot = submission_infos
+
+        self.idle_polls = 0 if events else self.idle_polls + 1
+        if self.on_event is not None:
+            for event in events:
+                self.on_event(event)
+        return events
+
+    def next_interval(self, now: datetime.datetime | None = None) -> float:
+        """Seconds to wait before the next poll."""
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        interval = min(
+            self.max_interval_s,
+            self.min_interval_s * self.backoff_factor**self.idle_polls,
+        )
+        for deadline in self.deadlines:
+            seconds_to_deadline = (deadline - now).total_seconds()
+            if abs(seconds_to_deadline) <= self.deadline_window_s:
+                return self.min_interval_s
+            if seconds_to_deadline > 0:
+                # wake up in time for the deadline window
+                interval = min(interval, seconds_to_deadline - self.deadline_window_s)
+        return max(interval, self.min_interval_s)
+
+    def watch(
+        self,
+        stop_event: threading.Event | None = None,
+        max_polls: int | None = None,
+    ) -> Iterator[SubmissionEvent]:
+        """Poll until `stop_event` is set (or `max_polls` polls were made), yielding events as they occur."""
+        stop_event = stop_event or threading.Event()
+        polls = 0
+        while not stop_event.is_set():
+            yield from self.poll()
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                return
+            stop_event.wait(self.next_interval())
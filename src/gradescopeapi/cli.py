@@ -0,0 +1,336 @@
+"""Command line interface for the Gradescope API.
+
+Examples:
+    gradescopeapi login
+    gradescopeapi courses
+    gradescopeapi roster 123456 --format csv --output roster.csv
+    gradescopeapi submissions export 123456 654321 --jobs 8 --format jsonl
+    gradescopeapi extensions apply 123456 654321 extensions.csv
+    gradescopeapi upload 123456 654321 main.py utils.py
+
+The session of `gradescopeapi login` is saved and reused by later invocations. Credentials are read
+from the GRADESCOPE_EMAIL and GRADESCOPE_PASSWORD environment variables (or a .env file) if set,
+otherwise they are prompted for.
+"""
+
+import argparse
+import cProfile
+import csv
+import dataclasses
+import datetime
+import getpass
+import json
+import os
+import pstats
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from dotenv import load_dotenv
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    iter_concurrently,
+)
+from gradescopeapi.classes._helpers._date_helpers import parse_date
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.extensions import update_student_extension
+from gradescopeapi.classes.upload import upload_assignment
+
+DEFAULT_SESSION_FILE = Path("~/.config/gradescopeapi/session.json").expanduser()
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+def _to_plain(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if dataclasses.is_dataclass(value):
+        return {key: _to_plain(item) for key, item in dataclasses.asdict(value).items()}
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+def _to_cell(value: Any) -> Any:
+    # csv and parquet columns are flat, nested values are stored as JSON
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def write_rows(rows: Iterable[dict[str, Any]], output_format: str, output=None):
+    """Write rows as CSV, JSON Lines or Parquet. CSV columns are all keys of the rows, in first-seen order.
+
+    CSV and Parquet need all rows before writing (for the header and the schema), so only JSON
+    Lines is streamed.
+    """
+    rows = (_to_plain(row) for row in rows)
+    if output_format == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Writing Parquet requires pyarrow. Install it with: pip install 'gradescopeapi[parquet]'"
+            ) from e
+        if output is None:
+            raise ValueError("--output is required for the parquet format")
+        table = [{key: _to_cell(value) for key, value in row.items()} for row in rows]
+        pq.write_table(pa.Table.from_pylist(table), output)
+        return
+
+    f = open(output, "w", newline="") if output is not None else sys.stdout
+    try:
+        if output_format == "jsonl":
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+                f.flush()
+        else:
+            table = [
+                {key: _to_cell(value) for key, value in row.items()} for row in rows
+            ]
+            if table:
+                # keys missing from a row are left empty
+                fieldnames = list(dict.fromkeys(key for row in table for key in row))
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(table)
+                f.flush()
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def save_session(connection: GSConnection, session_file: Path):
+    session_file.parent.mkdir(parents=True, exist_ok=True)
+    # the cookies grant full access to the account
+    fd = os.open(session_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(connection.get_session_state(), f)
+
+
+def login(args) -> GSConnection:
+    email = os.getenv("GRADESCOPE_EMAIL") or input("Email: ")
+    password = os.getenv("GRADESCOPE_PASSWORD") or getpass.getpass("Password: ")
+    connection = GSConnection(args.base_url)
+    connection.login(email, password)
+    save_session(connection, args.session_file)
+    return connection
+
+
+def get_connection(args) -> GSConnection:
+    """Restore the saved session, logging in (and saving the session) if there is none or it expired."""
+    if args.session_file.exists():
+        with open(args.session_file) as f:
+            session_state = json.load(f)
+        if session_state["gradescope_base_url"] == args.base_url:
+            connection = GSConnection.from_session_state(session_state)
+            if connection.is_session_valid():
+                connection.restore_csrf_token()
+                return connection
+    return login(args)
+
+
+def cmd_login(args) -> Iterator[dict[str, Any]]:
+    login(args)
+    yield {"status": "logged in", "session_file": str(args.session_file)}
+
+
+def cmd_courses(args) -> Iterator[dict[str, Any]]:
+    courses = get_connection(args).account.get_courses()
+    for role, role_courses in courses.items():
+        for course_id, course in role_courses.items():
+            yield {"course_id": course_id, "role": role, **dataclasses.asdict(course)}
+
+
+def cmd_roster(args) -> Iterator[dict[str, Any]]:
+    members = get_connection(args).account.get_course_users(args.course_id)
+    if members is None:
+        raise RuntimeError(f"Failed to get members of course {args.course_id}")
+    yield from members
+
+
+def cmd_assignments(args) -> Iterator[dict[str, Any]]:
+    yield from get_connection(args).account.get_assignments(args.course_id)
+
+
+def cmd_submissions_export(args) -> Iterator[dict[str, Any]]:
+    account = get_connection(args).account
+    emails = list(
+        account.get_assignment_submission_infos(args.course_id, args.assignment_id)
+    )
+
+    def fetch(email: str):
+        if args.all_versions:
+            return account.get_assignment_all_submissions(
+                args.course_id, args.assignment_id, email, not args.no_links
+            )
+        return [
+            account.get_assignment_active_submission(
+                args.course_id, args.assignment_id, email, not args.no_links
+            )
+        ]
+
+    for email, submissions, error in iter_concurrently(
+        fetch, emails, max_workers=args.jobs, rate_limiter=RateLimiter()
+    ):
+        if error is not None:
+            print(f"Failed to export submissions of {email}: {error}", file=sys.stderr)
+            continue
+        yield from submissions
+
+
+def cmd_extensions_apply(args) -> Iterator[dict[str, Any]]:
+    """Apply the extensions of a CSV file with columns user_id, release_date, due_date, late_due_date.
+
+    Dates are ISO 8601 strings with a timezone, empty columns are left unchanged.
+    """
+    with open(args.file, newline="") as f:
+        extensions = {row["user_id"]: row for row in csv.DictReader(f)}
+    connection = get_connection(args)
+
+    def apply(user_id: str) -> bool:
+        row = extensions[user_id]
+        return update_student_extension(
+            connection.session,
+            args.course_id,
+            args.assignment_id,
+            user_id,
+            release_date=parse_date(row.get("release_date")),
+            due_date=parse_date(row.get("due_date")),
+            late_due_date=parse_date(row.get("late_due_date")),
+            gradescope_base_url=connection.gradescope_base_url,
+        )
+
+    for user_id, success, error in iter_concurrently(
+        apply, extensions, max_workers=args.jobs, rate_limiter=RateLimiter()
+    ):
+        yield {
+            "user_id": user_id,
+            "status": "updated" if success else "failed",
+            "error": str(error) if error is not None else None,
+        }
+
+
+def cmd_upload(args) -> Iterator[dict[str, Any]]:
+    connection = get_connection(args)
+    submission_link = upload_assignment(
+        connection.session,
+        args.course_id,
+        args.assignment_id,
+        *args.files,
+        leaderboard_name=args.leaderboard_name,
+        gradescope_base_url=connection.gradescope_base_url,
+    )
+    yield {"submission_link": submission_link}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="gradescopeapi", description="Interact with Gradescope."
+    )
+    parser.add_argument("--base-url", default=DEFAULT_GRADESCOPE_BASE_URL)
+    parser.add_argument(
+        "--session-file",
+        type=Path,
+        default=Path(os.getenv("GRADESCOPE_SESSION_FILE", DEFAULT_SESSION_FILE)),
+        help="where the logged in session is saved (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="maximum number of concurrent requests (default: %(default)s)",
+    )
+    parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    parser.add_argument("--output", help="output file (default: standard output)")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print where time went (calls made from the main thread) to standard error",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("login", help="log in and save the session").set_defaults(
+        func=cmd_login
+    )
+    subparsers.add_parser("courses", help="list courses").set_defaults(func=cmd_courses)
+    for name, func, help in [
+        ("roster", cmd_roster, "list the members of a course"),
+        ("assignments", cmd_assignments, "list the assignments of a course"),
+    ]:
+        command_parser = subparsers.add_parser(name, help=help)
+        command_parser.add_argument("course_id")
+        command_parser.set_defaults(func=func)
+
+    submissions_parser = subparsers.add_parser("submissions", help="submissions")
+    submissions_subparsers = submissions_parser.add_subparsers(
+        dest="submissions_command", required=True
+    )
+    export_parser = submissions_subparsers.add_parser(
+        "export", help="export the submissions of every student to an assignment"
+    )
+    export_parser.add_argument("course_id")
+    export_parser.add_argument("assignment_id")
+    export_parser.add_argument(
+        "--all-versions", action="store_true", help="export past submissions too"
+    )
+    export_parser.add_argument(
+        "--no-links", action="store_true", help="skip looking up submission files"
+    )
+    export_parser.set_defaults(func=cmd_submissions_export)
+
+    extensions_parser = subparsers.add_parser("extensions", help="extensions")
+    extensions_subparsers = extensions_parser.add_subparsers(
+        dest="extensions_command", required=True
+    )
+    apply_parser = extensions_subparsers.add_parser(
+        "apply", help=cmd_extensions_apply.__doc__.splitlines()[0]
+    )
+    apply_parser.add_argument("course_id")
+    apply_parser.add_argument("assignment_id")
+    apply_parser.add_argument("file", help="CSV file of extensions")
+    apply_parser.set_defaults(func=cmd_extensions_apply)
+
+    upload_parser = subparsers.add_parser(
+        "upload", help="upload files to an assignment"
+    )
+    upload_parser.add_argument("course_id")
+    upload_parser.add_argument("assignment_id")
+    upload_parser.add_argument("files", nargs="+")
+    upload_parser.add_argument("--leaderboard-name")
+    upload_parser.set_defaults(func=cmd_upload)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    load_dotenv()
+    args = build_parser().parse_args(argv)
+
+    profiler = cProfile.Profile() if args.profile else None
+    start_time = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        write_rows(args.func(args), args.format, args.output)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            print(f"Total: {time.perf_counter() - start_time:.2f}s", file=sys.stderr)
+            stats = pstats.Stats(profiler, stream=sys.stderr)
+            stats.sort_stats("cumulative").print_stats(25)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Fake sessions and pages shared by the offline tests."""
+
+import requests
+
+
+class FakeResponse:
+    """Stands in for requests.Response."""
+
+    def __init__(self, status_code=200, content=b"", headers=None):
+        if isinstance(content, str):
+            content = content.encode()
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode()
+        self.headers = headers or {}
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Client Error", response=self
+            )
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class FakeSession:
+    """Stands in for requests.Session, recording the requested URLs.
+
+    Subclasses answer the requests in `respond`.
+    """
+
+    cookies = ()
+
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        return self.respond(url, **kwargs)
+
+    def respond(self, url, **kwargs):
+        raise NotImplementedError
+
+
+def make_review_grades_row(
+    email,
+    submission_id=None,
+    submitted_at="2024-04-15 23:59:00 -0400",
+    name=None,
+    score="1.0",
+):
+    """Build a row of the review_grades page, linking the submission if there is one."""
+    name = name or email
+    if submission_id is not None:
+        name = (
+            f'<a href="/courses/1/assignments/2/submissions/{submission_id}">{name}</a>'
+        )
+    return (
+        f'<tr><td class="table--primaryLink">{name}</td>'
+        f'<td><a href="mailto:{email}">{email}</a></td>'
+        f"<td>1</td><td>{score}</td>"
+        f'<td><time datetime="{submitted_at}">x</time></td>'
+        '<td><div class="btnGroup"><a class="btn" href="#">Regrade</a></div></td></tr>'
+    )
+
+
+def make_review_grades_page(rows):
+    """Build the review_grades page of an assignment from its rows."""
+    return (
+        "<html><body><table><thead><tr><th>Name</th><th>Email</th></tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody></table></body></html>"
+    )
@@ -0,0 +1,191 @@
+import datetime
+
+import numpy as np
+
+from gradescopeapi.classes.analytics import (
+    LATE,
+    MISSING,
+    ON_TIME,
+    PAST_LATE_DUE,
+    compute_lateness,
+)
+from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.extensions import Extension
+
+DUE_DATE = datetime.datetime(2024, 4, 15, 23, 59, tzinfo=datetime.timezone.utc)
+
+
+def make_assignment(assignment_id, due_date, late_due_date=None):
+    return Assignment(
+        assignment_id=assignment_id,
+        name=assignment_id,
+        release_date=None,
+        due_date=due_date,
+        late_due_date=late_due_date,
+        submissions_status=None,
+        grade=None,
+        max_grade="10.0",
+    )
+
+
+def make_submission_info(email, submitted):
+    return {
+        "name": email,
+        "email": email,
+        "submissions": [{"submission_id": "1", "epochtime_s": submitted.timestamp()}],
+    }
+
+
+def test_compute_lateness():
+    """Test deadlines, extensions and lateness classification."""
+    assignments = [
+        make_assignment("hw1", DUE_DATE, DUE_DATE + datetime.timedelta(days=3)),
+        make_assignment("hw2", None),
+    ]
+    submission_infos = {
+        "hw1": {
+            "on_time@x.edu": make_submission_info(
+                "on_time@x.edu", DUE_DATE - datetime.timedelta(hours=1)
+            ),
+            "late@x.edu": make_submission_info(
+                "late@x.edu", DUE_DATE + datetime.timedelta(hours=25)
+            ),
+            "extended@x.edu": make_submission_info(
+                "extended@x.edu", DUE_DATE + datetime.timedelta(hours=25)
+            ),
+        },
+        "hw2": {
+            "late@x.edu": make_submission_info("late@x.edu", DUE_DATE),
+        },
+    }
+    extensions = {
+        "hw1": {
+            "3": Extension(
+                name="extended",
+                release_date=None,
+                due_date=DUE_DATE + datetime.timedelta(days=2),
+                late_due_date=None,
+                delete_path="",
+            )
+        }
+    }
+    emails = ["on_time@x.edu", "late@x.edu", "extended@x.edu", "missing@x.edu"]
+
+    report = compute_lateness(
+        assignments,
+        submission_infos,
+        emails,
+        extensions=extensions,
+        user_id_to_email={"3": "extended@x.edu"},
+    )
+
+    np.testing.assert_array_equal(
+        report.status,
+        [
+            [ON_TIME, MISSING],
+            [LATE, ON_TIME],
+            [ON_TIME, MISSING],
+            [MISSING, MISSING],
+        ],
+    )
+    assert report.minutes_late[1, 0] == 25 * 60
+    assert report.late_days[1, 0] == 2
+    assert (
+        report.due_dates_s[2, 0] == (DUE_DATE + datetime.timedelta(days=2)).timestamp()
+    )
+    assert (
+        report.late_due_dates_s[2, 0]
+        == (DUE_DATE + datetime.timedelta(days=3)).timestamp()
+    )
+    assert np.isnan(report.due_dates_s[0, 1])
+    assert report.late_days_per_student() == {
+        "on_time@x.edu": 0,
+        "late@x.edu": 2,
+        "extended@x.edu": 0,
+        "missing@x.edu": 0,
+    }
+    assert report.status_counts()["hw1"] == {
+        "on_time": 2,
+        "late": 1,
+        "past_late_due": 0,
+        "missing": 1,
+    }
+
+
+def test_compute_lateness_past_late_due_date():
+    """Test submissions after the effective late due date are classified separately."""
+    late_due_date = DUE_DATE + datetime.timedelta(days=1)
+    assignments = [make_assignment("hw1", DUE_DATE, late_due_date)]
+    emails = ["late@x.edu", "too_late@x.edu", "extended@x.edu"]
+    submitted = late_due_date + datetime.timedelta(hours=1)
+    submission_infos = {
+        "hw1": {
+            "late@x.edu": make_submission_info("late@x.edu", late_due_date),
+            "too_late@x.edu": make_submission_info("too_late@x.edu", submitted),
+            "extended@x.edu": make_submission_info("extended@x.edu", submitted),
+        }
+    }
+    extensions = {
+        "hw1": {
+            "3": Extension(
+                name="extended",
+                release_date=None,
+                due_date=None,
+                late_due_date=late_due_date + datetime.timedelta(days=1),
+                delete_path="",
+            )
+        }
+    }
+
+    report = compute_lateness(
+        assignments,
+        submission_infos,
+        emails,
+        extensions=extensions,
+        user_id_to_email={"3": "extended@x.edu"},
+    )
+
+    np.testing.assert_array_equal(report.status[:, 0], [LATE, PAST_LATE_DUE, LATE])
+    assert report.status_counts()["hw1"]["past_late_due"] == 1
+
+
+def test_compute_lateness_grace_period():
+    """Test submissions within the grace period count as on time."""
+    report = compute_lateness(
+        [make_assignment("hw1", DUE_DATE)],
+        {
+            "hw1": {
+                "a@x.edu": make_submission_info(
+                    "a@x.edu", DUE_DATE + datetime.timedelta(minutes=4)
+                )
+            }
+        },
+        ["a@x.edu"],
+        grace_minutes=5,
+    )
+    assert report.status[0, 0] == ON_TIME
+    assert report.late_days[0, 0] == 0
+
+
+def test_compute_lateness_scales():
+    """Test a course with tens of thousands of student-assignment pairs is computed quickly."""
+    num_students, num_assignments = 2000, 20
+    emails = [f"{i}@x.edu" for i in range(num_students)]
+    assignments = [
+        make_assignment(str(j), DUE_DATE + datetime.timedelta(weeks=j))
+        for j in range(num_assignments)
+    ]
+    submission_infos = {
+        str(j): {
+            email: make_submission_info(
+                email, DUE_DATE + datetime.timedelta(weeks=j, minutes=i % 120 - 60)
+            )
+            for i, email in enumerate(emails)
+        }
+        for j in range(num_assignments)
+    }
+
+    report = compute_lateness(assignments, submission_infos, emails)
+    assert report.status.shape == (num_students, num_assignments)
+    num_late = sum(1 for i in range(num_students) if i % 120 - 60 > 0)
+    assert np.count_nonzero(report.status == LATE) == num_assignments * num_late
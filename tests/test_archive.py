@@ -0,0 +1,130 @@
+import json
+import mmap
+import os
+
+import pytest
+
+from gradescopeapi.classes._helpers import _assignment_helpers
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    get_submission_text_files,
+)
+from gradescopeapi.classes.archive import ArchiveIntegrityError, SubmissionArchive
+from tests._fakes import FakeResponse, FakeSession
+
+FILES = {
+    "1": {"main.py": b"print('hello')\n", "utils.py": b"# starter code\n"},
+    "2": {"main.py": b"print('world')\n", "utils.py": b"# starter code\n"},
+}
+
+
+class ArchiveSession(FakeSession):
+    def respond(self, url, **kwargs):
+        if "only_keys" in url:
+            submission_id = url.split("/submissions/")[1].split(".json")[0]
+            text_files = [
+                # signed links differ on every request
+                {
+                    "file": {
+                        "url": f"https://s3/{submission_id}/{path}?sig={len(self.urls)}"
+                    }
+                }
+                for path in FILES[submission_id]
+            ]
+            return FakeResponse(200, json.dumps({"text_files": text_files}))
+        submission_id, path = url.split("?")[0].split("/")[-2:]
+        return FakeResponse(200, FILES[submission_id][path])
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    downloads = ArchiveSession()
+    monkeypatch.setattr(_assignment_helpers, "_download_session", downloads)
+    return downloads
+
+
+def test_fetch_deduplicates_and_skips_archived(tmp_path, downloads):
+    """Test identical files are stored once and archived submissions are not downloaded again."""
+    session = ArchiveSession()
+    archive = SubmissionArchive(tmp_path)
+
+    manifests, errors = archive.fetch_many(session, "1", "2", ["1", "2"])
+    assert not errors
+    # the signed links are not requested through the Gradescope session
+    assert all("only_keys" in url for url in session.urls)
+    assert len(downloads.urls) == 4
+    assert set(manifests["1"]) == {"main.py", "utils.py"}
+    assert manifests["1"]["utils.py"] == manifests["2"]["utils.py"]
+    assert len(list((tmp_path / "objects").glob("*/*"))) == 3
+
+    requests_made = len(session.urls)
+    assert archive.fetch(session, "1", "2", "1") == manifests["1"]
+    assert len(session.urls) == requests_made
+    assert archive.read("2", "main.py") == FILES["2"]["main.py"]
+
+
+def test_read_mmap_and_verify(tmp_path):
+    """Test large files are memory-mapped and corruption is detected."""
+    archive = SubmissionArchive(tmp_path)
+    manifest = archive.put("1", {"big.bin": [b"x" * 1000, b"y" * 1000]})
+
+    data = archive.read("1", "big.bin", verify=True, mmap_threshold=1024)
+    assert isinstance(data, mmap.mmap)
+    assert data[:1000] == b"x" * 1000
+    data.close()
+    assert archive.verify("1") == []
+
+    object_path = tmp_path / "objects" / manifest["big.bin"][:2] / manifest["big.bin"]
+    object_path.write_bytes(b"corrupted")
+    assert archive.verify("1") == ["big.bin"]
+    with pytest.raises(ArchiveIntegrityError):
+        archive.read("1", "big.bin", verify=True)
+    with pytest.raises(KeyError):
+        archive.read("3", "big.bin")
+
+
+def test_gc_evicts_least_recently_used(tmp_path):
+    """Test garbage collection removes least recently used submissions and unused files."""
+    archive = SubmissionArchive(tmp_path)
+    archive.put("old", {"a": b"a" * 100, "shared": b"s" * 100})
+    archive.put("new", {"b": b"b" * 100, "shared": b"s" * 100})
+    os.utime(tmp_path / "submissions" / "old.json", (0, 0))
+    assert archive.size() == 300
+
+    assert archive.gc(max_bytes=250) == ["old"]
+    assert "old" not in archive and "new" in archive
+    assert archive.size() == 200
+    assert archive.read("new", "shared") == b"s" * 100
+
+
+def test_fetch_keeps_submission_larger_than_max_bytes(tmp_path, downloads):
+    """Test the fetched submission is not evicted by the garbage collection of its own fetch."""
+    archive = SubmissionArchive(tmp_path, max_bytes=10)
+    manifest = archive.fetch(ArchiveSession(), "1", "2", "1")
+    assert "1" in archive
+    assert archive.read("1", "main.py") == FILES["1"]["main.py"]
+    assert archive.verify("1") == []
+    assert set(manifest) == {"main.py", "utils.py"}
+
+    # the next fetch evicts it
+    archive.fetch(ArchiveSession(), "1", "2", "2")
+    assert "1" not in archive and "2" in archive
+
+
+def test_text_file_paths_are_unique():
+    """Test files named alike get distinct paths instead of overwriting each other."""
+    text_files = [
+        {"file": {"url": f"https://s3/{directory}/main.py?sig=1"}}
+        for directory in ("a", "b", "c")
+    ] + [{"file": {"url": "https://s3/d/main_1.py?sig=1"}}]
+
+    class Session:
+        cookies = ()
+
+        def get(self, url):
+            return FakeResponse(200, json.dumps({"text_files": text_files}).encode())
+
+    paths = [
+        text_file["path"]
+        for text_file in get_submission_text_files(Session(), "1", "2", "3")
+    ]
+    assert paths == ["main.py", "main_1.py", "main_2.py", "main_1_1.py"]
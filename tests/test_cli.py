@@ -0,0 +1,116 @@
+import csv
+import datetime
+import json
+import os
+
+from gradescopeapi import cli
+from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.cli import (
+    build_parser,
+    get_connection,
+    main,
+    save_session,
+    write_rows,
+)
+
+
+def test_parse_nested_subcommands():
+    """Test global options and nested subcommands are parsed."""
+    args = build_parser().parse_args(
+        [
+            "--jobs",
+            "8",
+            "--format",
+            "csv",
+            "submissions",
+            "export",
+            "1",
+            "2",
+            "--no-links",
+        ]
+    )
+    assert args.jobs == 8
+    assert args.format == "csv"
+    assert (args.course_id, args.assignment_id) == ("1", "2")
+    assert args.no_links and not args.all_versions
+
+
+def test_write_rows(tmp_path):
+    """Test dataclasses, dates, nested values and varying keys are written as CSV and JSON Lines."""
+    rows = [
+        Assignment(
+            "1",
+            "HW1",
+            datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+            None,
+            None,
+            "Submitted",
+            "10.0",
+            "10.0",
+        ),
+        {"assignment_id": "2", "name": "HW2", "links": ["a", "b"]},
+    ]
+    write_rows(rows, "csv", tmp_path / "out.csv")
+    with open(tmp_path / "out.csv", newline="") as f:
+        written = list(csv.DictReader(f))
+    assert written[0]["release_date"] == "2024-01-01T00:00:00+00:00"
+    assert written[1]["name"] == "HW2"
+    # keys of later rows get their own column, missing keys are empty
+    assert json.loads(written[1]["links"]) == ["a", "b"]
+    assert written[0]["links"] == ""
+    assert written[1]["grade"] == ""
+
+    write_rows(rows, "jsonl", tmp_path / "out.jsonl")
+    lines = (tmp_path / "out.jsonl").read_text().splitlines()
+    assert json.loads(lines[1])["links"] == ["a", "b"]
+
+
+def test_saved_session_is_reused(tmp_path, monkeypatch):
+    """Test the saved session is restored without logging in and is private to the user."""
+    monkeypatch.setattr(GSConnection, "is_session_valid", lambda self: True)
+    session_file = tmp_path / "session.json"
+    connection = GSConnection("https://example.com")
+    connection.session.cookies.set("signed_token", "abc", domain="example.com")
+    connection.session.headers["X-CSRF-Token"] = "csrf"
+    save_session(connection, session_file)
+    assert os.stat(session_file).st_mode & 0o777 == 0o600
+
+    args = build_parser().parse_args(
+        [
+            "--base-url",
+            "https://example.com",
+            "--session-file",
+            str(session_file),
+            "courses",
+        ]
+    )
+    restored = get_connection(args)
+    assert restored.logged_in
+    assert restored.session.cookies.get("signed_token") == "abc"
+    assert restored.session.headers["X-CSRF-Token"] == "csrf"
+
+
+def test_expired_session_logs_in_again(tmp_path, monkeypatch):
+    """Test an expired saved session is replaced by logging in again."""
+    monkeypatch.setattr(GSConnection, "is_session_valid", lambda self: False)
+    logins = []
+    monkeypatch.setattr(cli, "login", lambda args: logins.append(args) or "new")
+    session_file = tmp_path / "session.json"
+    save_session(GSConnection("https://example.com"), session_file)
+
+    args = build_parser().parse_args(
+        ["--base-url", "https://example.com", "--session-file", str(session_file)]
+        + ["courses"]
+    )
+    assert get_connection(args) == "new"
+    assert len(logins) == 1
+
+
+def test_main_reports_errors(tmp_path, capsys):
+    """Test failures exit with a non-zero status and a message instead of a traceback."""
+    session_file = tmp_path / "session.json"
+    save_session(GSConnection(), session_file)
+    argv = ["--session-file", str(session_file), "extensions", "apply", "1", "2"]
+    assert main([*argv, str(tmp_path / "missing.csv")]) == 1
+    assert "Error" in capsys.readouterr().err
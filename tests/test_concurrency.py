@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    RateLimitedAdapter,
+    RateLimiter,
+    run_concurrently,
+)
+
+
+def test_run_concurrently_isolates_failures():
+    """Test results and exceptions are reported per key."""
+
+    def square(n):
+        if n == 3:
+            raise ValueError("bad key")
+        return n * n
+
+    results, errors = run_concurrently(square, range(5))
+    assert results == {0: 0, 1: 1, 2: 4, 4: 16}
+    assert list(errors) == [3]
+    assert isinstance(errors[3], ValueError)
+
+
+def test_run_concurrently_bounds_workers():
+    """Test no more than max_workers calls run at the same time."""
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def task(_):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    run_concurrently(task, range(20), max_workers=3)
+    assert max_running <= 3
+
+
+def test_rate_limiter_spaces_calls():
+    """Test the rate limiter enforces the minimum interval between calls."""
+    rate_limiter = RateLimiter(requests_per_second=100)
+    start_time = time.monotonic()
+    run_concurrently(lambda _: None, range(11), rate_limiter=rate_limiter)
+    assert time.monotonic() - start_time >= 0.09
+
+
+def test_rate_limited_adapter_acquires_per_request():
+    """Test every request sent through a mounted adapter acquires the limiter."""
+
+    class CountingRateLimiter(RateLimiter):
+        calls = 0
+
+        def acquire(self):
+            self.calls += 1
+
+    rate_limiter = CountingRateLimiter()
+    session = requests.Session()
+    session.mount("http://", RateLimitedAdapter(rate_limiter))
+    # nothing listens on this port, the limiter is acquired before connecting
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            session.get("http://127.0.0.1:9")
+    assert rate_limiter.calls == 2
@@ -1,8 +1,13 @@
 import os
+import threading
+import time
 
 from dotenv import load_dotenv
 
+from gradescopeapi.classes._helpers._course_helpers import get_latest_term_course_ids
+from gradescopeapi.classes.account import Account
 from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.courses import Course
 
 # load .env file
 load_dotenv()
@@ -89,3 +94,88 @@ def test_membership():
     members = account.get_course_users(course_id)
 
     assert members is not None and len(members) > 0
+
+
+def make_course(semester, year):
+    return Course("CS 101", "Intro", semester, year, None, "1")
+
+
+def test_get_latest_term_course_ids():
+    """Test only the courses of the most recent term are selected."""
+    courses = {
+        "instructor": {
+            "1": make_course("Spring", "2024"),
+            "2": make_course("Fall", "2023"),
+        },
+        "student": {
+            "3": make_course("Spring", "2024"),
+            "4": make_course("Winter", "2024"),
+        },
+    }
+    assert get_latest_term_course_ids(courses) == ["1", "3"]
+    assert get_latest_term_course_ids({"instructor": {}, "student": {}}) == []
+
+
+def test_warmup_prefetches_assignments():
+    """Test later calls wait for the in-flight prefetch instead of fetching again."""
+
+    class SlowSession:
+        cookies = ()
+
+        def __init__(self):
+            self.urls = []
+            self.lock = threading.Lock()
+
+        def get(self, url):
+            with self.lock:
+                self.urls.append(url)
+            time.sleep(0.2)
+            return type("Response", (), {"status_code": 200, "text": "<html></html>"})()
+
+    class WarmupAccount(Account):
+        def get_courses(self, force=False):
+            if self.courses_cache is not None and not force:
+                return self.courses_cache
+            return {
+                "instructor": {"1": make_course("Fall", "2024")},
+                "student": {"2": make_course("Spring", "2024")},
+            }
+
+    session = SlowSession()
+    account = WarmupAccount(session, "https://example.com")
+    assert account.warmup() == ["1"]
+    assert account.get_courses() is account.courses_cache
+
+    assert account.get_assignments("1") == []
+    assert account.get_assignments("1") == []
+    assert session.urls == ["https://example.com/courses/1/assignments"]
+
+    account.get_assignments("1", force=True)
+    assert len(session.urls) == 2
+    # the forced fetch replaced the prefetched assignments
+    assert account.get_assignments("1") == []
+    assert len(session.urls) == 2
+
+
+def test_login_succeeds_when_warmup_fails(monkeypatch):
+    """Test a failing warmup is logged instead of failing a successful login."""
+    from gradescopeapi.classes import connection as connection_module
+
+    monkeypatch.setattr(
+        connection_module,
+        "get_auth_token_init_gradescope_session",
+        lambda session, base_url: "token",
+    )
+    monkeypatch.setattr(
+        connection_module,
+        "login_set_session_cookies",
+        lambda session, email, password, auth_token, base_url: True,
+    )
+
+    def failing_warmup(self):
+        raise RuntimeError("Failed to access account page on Gradescope")
+
+    monkeypatch.setattr(Account, "warmup", failing_warmup)
+    connection = GSConnection("https://example.com")
+    connection.login("user@example.com", "secret", warmup=True)
+    assert connection.logged_in
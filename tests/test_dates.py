@@ -0,0 +1,68 @@
+import datetime
+
+import dateutil.parser
+
+from gradescopeapi.classes._helpers._date_helpers import (
+    epochs_to_datetimes,
+    get_timezone,
+    parse_date,
+    parse_date_in_timezone,
+)
+
+
+def test_parse_date_matches_dateutil():
+    """Test fast path parsing agrees with dateutil for formats used by Gradescope."""
+    date_strs = [
+        "2024-04-15T23:59:00.000-04:00",
+        "2024-04-15T23:59:00-04:00",
+        "2024-04-16T03:59:00Z",
+        "2024-04-15 23:59:00 -0400",
+        "2024-04-15T23:59:00.123456+00:00",
+    ]
+    for date_str in date_strs:
+        assert parse_date(date_str) == dateutil.parser.parse(date_str), date_str
+
+
+def test_parse_date_falls_back_to_dateutil():
+    """Test unknown formats are still parsed."""
+    assert parse_date("April 15, 2024 11:59 PM") == datetime.datetime(
+        2024, 4, 15, 23, 59
+    )
+
+
+def test_parse_date_empty():
+    """Test empty values are passed through as None."""
+    assert parse_date(None) is None
+    assert parse_date("") is None
+    assert parse_date_in_timezone(None, datetime.timezone.utc) is None
+
+
+def test_parse_date_replace_timezone():
+    """Test tzinfo replaces the timezone but keeps the wall clock time."""
+    timezone = get_timezone("America/New_York")
+    parsed = parse_date("2024-04-16T03:59:00Z", tzinfo=timezone)
+    assert parsed.tzinfo is timezone
+    assert parsed.hour == 3
+
+
+def test_parse_date_in_timezone():
+    """Test the point in time is preserved when converting timezones."""
+    timezone = get_timezone("America/New_York")
+    parsed = parse_date_in_timezone("2024-04-16T03:59:00Z", timezone)
+    assert parsed.tzinfo is timezone
+    assert parsed.hour == 23
+    assert parsed == parse_date("2024-04-16T03:59:00Z")
+
+
+def test_get_timezone_cached():
+    """Test timezone objects are reused."""
+    assert get_timezone("America/New_York") is get_timezone("America/New_York")
+
+
+def test_epochs_to_datetimes():
+    """Test batch conversion of epoch timestamps."""
+    epochs = [0, 1713239940, 0]
+    datetimes = epochs_to_datetimes(epochs)
+    assert datetimes[0] == datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+    assert datetimes[1].timestamp() == 1713239940
+    assert datetimes[0] is datetimes[2]
@@ -0,0 +1,133 @@
+import io
+import json
+import threading
+import time
+import zipfile
+
+import pytest
+
+from gradescopeapi.classes._helpers import _assignment_helpers
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    iter_concurrently_in_order,
+)
+from gradescopeapi.classes.archive import SubmissionArchive
+from gradescopeapi.classes.download import iter_submissions_zip
+from tests._fakes import (
+    FakeResponse,
+    FakeSession,
+    make_review_grades_page,
+    make_review_grades_row,
+)
+
+SUBMISSIONS = {
+    # email: (submission ID, files)
+    "b@example.com": ("2", {"main.py": b"print('b')\n" * 10000, "../../etc/x": b"x"}),
+    "a@example.com": ("1", {"main.py": b"print('a')\n"}),
+    "c@example.com": ("3", None),  # download fails
+}
+
+
+class DownloadSession(FakeSession):
+    def respond(self, url, **kwargs):
+        files = {submission_id: files for submission_id, files in SUBMISSIONS.values()}
+        if url.endswith("/review_grades"):
+            return FakeResponse(
+                200,
+                make_review_grades_page(
+                    make_review_grades_row(
+                        email, submission_id, "2024-04-15 20:00:00 -0400"
+                    )
+                    for email, (submission_id, _) in SUBMISSIONS.items()
+                ),
+            )
+        if "only_keys" in url:
+            submission_id = url.split("/submissions/")[1].split(".json")[0]
+            if files[submission_id] is None:
+                return FakeResponse(500)
+            text_files = [
+                {
+                    "file": {"url": f"https://s3/{submission_id}/{index}"},
+                    "path": path,
+                }
+                for index, path in enumerate(files[submission_id])
+            ]
+            return FakeResponse(200, json.dumps({"text_files": text_files}))
+        submission_id, index = url.split("/")[-2:]
+        return FakeResponse(200, list(files[submission_id].values())[int(index)])
+
+
+@pytest.fixture(autouse=True)
+def downloads(monkeypatch):
+    downloads = DownloadSession()
+    monkeypatch.setattr(_assignment_helpers, "_download_session", downloads)
+    return downloads
+
+
+def read_zip(chunks):
+    return zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+
+
+def test_iter_submissions_zip(downloads):
+    """Test the zip file has a deterministic per-student layout and records failed downloads."""
+    session = DownloadSession()
+    chunks = list(iter_submissions_zip(session, "1", "2", max_workers=3))
+    assert len(chunks) > 1  # streamed, not built in one piece
+    # the signed links are not requested through the Gradescope session
+    assert not any(url.startswith("https://s3/") for url in session.urls)
+    assert len(downloads.urls) == 3
+
+    zip_file = read_zip(chunks)
+    assert zip_file.namelist() == [
+        "a@example.com/main.py",
+        "b@example.com/main.py",
+        "b@example.com/etc/x",
+        "c@example.com/ERROR.txt",
+    ]
+    assert zip_file.testzip() is None
+    assert zip_file.read("a@example.com/main.py") == b"print('a')\n"
+    assert zip_file.read("b@example.com/etc/x") == b"x"
+    assert zip_file.getinfo("a@example.com/main.py").date_time == (
+        2024,
+        4,
+        15,
+        20,
+        0,
+        0,
+    )
+    assert chunks == list(iter_submissions_zip(DownloadSession(), "1", "2"))
+
+
+def test_iter_submissions_zip_from_archive(tmp_path):
+    """Test archived submissions are zipped without downloading them again."""
+    archive = SubmissionArchive(tmp_path)
+    session = DownloadSession()
+    first = read_zip(iter_submissions_zip(session, "1", "2", archive=archive))
+    downloads = len(session.urls)
+    second = read_zip(iter_submissions_zip(session, "1", "2", archive=archive))
+
+    # only the review_grades page and the failed submission are requested again
+    assert len(session.urls) == downloads + 2
+    assert first.namelist() == second.namelist()
+    assert second.read("b@example.com/main.py") == b"print('b')\n" * 10000
+
+
+def test_iter_concurrently_in_order():
+    """Test results are yielded in key order with bounded read-ahead."""
+    started = []
+    lock = threading.Lock()
+
+    def func(key):
+        with lock:
+            started.append(key)
+        time.sleep(0.01 * (5 - key))
+        if key == 2:
+            raise ValueError("failed")
+        return key * 10
+
+    results = iter_concurrently_in_order(func, range(6), max_workers=2, max_pending=3)
+    key, result, error = next(results)
+    assert (key, result, error) == (0, 0, None)
+    assert len(started) <= 3
+    rest = list(results)
+    assert [key for key, _, _ in rest] == [1, 2, 3, 4, 5]
+    assert isinstance(rest[1][2], ValueError)
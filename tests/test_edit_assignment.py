@@ -1,14 +1,19 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from gradescopeapi.classes.assignments import (
+    Assignment,
     update_assignment_date,
+    update_assignment_dates_bulk,
     update_assignment_title,
     update_autograder_image_name,
+    update_autograder_image_names_bulk,
     InvalidTitleName,
 )
 import requests
 import uuid
 
+from tests._fakes import FakeResponse
+
 
 def test_valid_change_assignment(create_session):
     """Test valid extension for a student."""
@@ -204,3 +209,155 @@ def test_update_assignment_title_invalid_session(create_session):
         assert False, "Incorrectly updated assignment title with invalid session"
     except requests.exceptions.HTTPError as e:
         assert e.response.status_code == 401  # HTTP 401 Not Authorized
+
+
+class FakeEditSession:
+    """Stands in for requests.Session, recording the assignments that were updated."""
+
+    def __init__(self):
+        self.edit_page_requests = 0
+        self.updated_assignment_ids = []
+        self.urls = []
+        self.forms = {}
+
+    def get(self, url):
+        self.urls.append(url)
+        self.edit_page_requests += 1
+        return FakeResponse(200, '<input name="authenticity_token" value="token">')
+
+    def post(self, url, data, headers):
+        self.urls.append(url)
+        self.updated_assignment_ids.append(url.split("/")[-1])
+        self.forms[url.split("/")[-1]] = data.fields
+        return FakeResponse(200, "")
+
+
+def test_update_assignment_dates_bulk():
+    """Test shifting dates skips unchanged assignments and reuses the auth token."""
+    release_date = datetime(2024, 1, 15, 9)
+    assignments = [
+        Assignment(
+            assignment_id=assignment_id,
+            name=assignment_id,
+            release_date=release_date,
+            due_date=release_date + timedelta(days=7),
+            late_due_date=None,
+            submissions_status=None,
+            grade=None,
+            max_grade="10.0",
+        )
+        for assignment_id in ["1", "2", "3"]
+    ]
+    session = FakeEditSession()
+
+    results = update_assignment_dates_bulk(
+        session,
+        "753413",
+        delta=timedelta(weeks=17),
+        new_dates={
+            "2": {
+                "release_date": release_date,
+                "due_date": release_date + timedelta(days=7),
+            }
+        },
+        assignments=assignments,
+    )
+
+    assert results["1"].status == "updated"
+    assert results["1"].due_date == datetime(2024, 5, 20, 9)
+    assert results["1"].late_due_date is None
+    assert results["2"].status == "skipped"
+    assert results["3"].status == "updated"
+    assert sorted(session.updated_assignment_ids) == ["1", "3"]
+    assert session.edit_page_requests == 1
+
+
+def test_update_assignment_dates_bulk_course_timezone():
+    """Test UTC dates are sent in the course timezone, keeping the wall clock across DST."""
+    # 2024-03-01 23:59 in New York (EST, UTC-5)
+    due_date = datetime(2024, 3, 2, 4, 59, tzinfo=timezone.utc)
+    assignment = Assignment(
+        assignment_id="1",
+        name="1",
+        release_date=None,
+        due_date=due_date,
+        late_due_date=None,
+        submissions_status=None,
+        grade=None,
+        max_grade="10.0",
+    )
+    session = FakeEditSession()
+
+    results = update_assignment_dates_bulk(
+        session,
+        "753413",
+        delta=timedelta(weeks=4),  # into EDT (UTC-4)
+        assignments=[assignment],
+        timezone="America/New_York",
+    )
+
+    assert session.forms["1"]["assignment[due_date_string]"] == "2024-03-29T23:59"
+    shifted = results["1"].due_date
+    assert shifted.utcoffset() == timedelta(hours=-4)
+    assert shifted.astimezone(timezone.utc) == datetime(
+        2024, 3, 30, 3, 59, tzinfo=timezone.utc
+    )
+
+
+def test_update_with_positional_base_url():
+    """Test the base URL can still be passed positionally after auth_token was added."""
+    base_url = "https://gradescope.example.edu"
+    session = FakeEditSession()
+    update_assignment_date(session, "1", "2", None, None, None, base_url)
+    update_autograder_image_name(session, "1", "2", "base:new", base_url)
+    assert session.urls and all(url.startswith(base_url) for url in session.urls)
+
+
+class FakeAutograderSession:
+    def __init__(self, image_names):
+        self.image_names = image_names  # assignment ID -> current image name
+        self.updated_assignment_ids = []
+
+    def get(self, url):
+        assignment_id = url.split("/")[-2]
+        if assignment_id not in self.image_names:
+            return FakeResponse(404, "Not Found")
+        return FakeResponse(
+            200,
+            '<input name="authenticity_token" value="token">'
+            '<input name="assignment[image_name]" '
+            f'value="{self.image_names[assignment_id]}">',
+        )
+
+    def post(self, url, data, headers):
+        self.updated_assignment_ids.append(url.split("/")[-1])
+        if "missing" in data.fields["assignment[image_name]"]:
+            return FakeResponse(
+                200, "<p>Docker image not found in your current course!</p>"
+            )
+        return FakeResponse(200, "")
+
+
+def test_update_autograder_image_names_bulk():
+    """Test bulk image updates skip current images and report images not found."""
+    session = FakeAutograderSession({"1": "base:old", "2": "base:new", "3": "base:old"})
+
+    results = update_autograder_image_names_bulk(
+        session,
+        [
+            ("10", "1", "base:new"),
+            ("10", "2", "base:new"),
+            ("20", "3", "base:missing"),
+            ("20", "4", "base:new"),
+        ],
+    )
+
+    assert [result.status for result in results.values()] == [
+        "updated",
+        "skipped",
+        "image_not_found",
+        "failed",
+    ]
+    assert results[("10", "1")].previous_image_name == "base:old"
+    assert "404" in results[("20", "4")].error
+    assert sorted(session.updated_assignment_ids) == ["1", "3"]
@@ -0,0 +1,94 @@
+import datetime
+import json
+
+from gradescopeapi.classes import export
+from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.courses import Course
+from gradescopeapi.classes.export import export_term
+
+COURSE = Course(
+    name="CS 101",
+    full_name="Intro",
+    semester="Spring",
+    year="2024",
+    num_grades_published=None,
+    num_assignments="1",
+)
+
+
+def test_session_state_round_trip():
+    """Test a connection is restored from its session state without logging in."""
+    connection = GSConnection("https://example.com")
+    connection.session.cookies.set(
+        "_gradescope_session", "abc", domain="example.com", path="/"
+    )
+    state = json.loads(json.dumps(connection.get_session_state()))
+
+    restored = GSConnection.from_session_state(state)
+    assert restored.logged_in
+    assert restored.gradescope_base_url == "https://example.com"
+    assert restored.account.session is restored.session
+    assert restored.session.cookies.get("_gradescope_session") == "abc"
+
+
+def test_export_course_isolates_failures(monkeypatch):
+    """Test a failing course keeps its partial results and records the error."""
+
+    class FakeAccount:
+        def get_assignments(self, course_id):
+            return [
+                Assignment(
+                    "1",
+                    "HW1",
+                    datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+                    None,
+                    None,
+                    "",
+                    None,
+                    None,
+                )
+            ]
+
+        def get_assignment_submission_infos(self, course_id, assignment_id):
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(export, "_worker_account", FakeAccount())
+    course_export = export._export_course("123", "instructor", COURSE, True)
+    assert course_export.error == "RuntimeError: boom"
+    assert len(course_export.assignments) == 1
+
+    data = json.loads(json.dumps(course_export.to_dict()))
+    assert data["assignments"][0]["release_date"] == "2024-01-01T00:00:00+00:00"
+    assert data["course"]["name"] == "CS 101"
+
+
+def test_export_term_merges_results(tmp_path):
+    """Test every course ends up in the merged output once, even if its worker requests fail."""
+
+    class FakeAccount:
+        def get_courses(self):
+            return {
+                "instructor": {"1": COURSE},
+                "student": {
+                    "1": COURSE,  # also listed as instructor
+                    "2": COURSE,
+                    "3": Course("Old", "Old", "Fall", "2023", None, "0"),
+                },
+            }
+
+    # nothing listens on this port, so every request made by the workers fails
+    connection = GSConnection("http://127.0.0.1:9")
+    connection.logged_in = True
+    connection.account = FakeAccount()
+
+    output_path = tmp_path / "term.jsonl"
+    exports = export_term(
+        connection, semester="Spring", year="2024", processes=2, output_path=output_path
+    )
+    assert list(exports) == ["1", "2"]
+    assert exports["1"].role == "instructor"
+    assert all(course_export.error for course_export in exports.values())
+
+    lines = output_path.read_text().splitlines()
+    assert [json.loads(line)["course_id"] for line in lines] == ["1", "2"]
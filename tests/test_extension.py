@@ -1,8 +1,14 @@
+import html
+import json
 from datetime import datetime, timedelta
 
 import pytest
 
-from gradescopeapi.classes.extensions import get_extensions, update_student_extension
+from gradescopeapi.classes.extensions import (
+    get_course_extensions,
+    get_extensions,
+    update_student_extension,
+)
 
 
 def test_get_extensions(create_session):
@@ -112,3 +118,52 @@ def test_invalid_course_id(create_session):
     # Attempt to fetch or modify extensions with an invalid course ID
     with pytest.raises(RuntimeError, match="Failed to get extensions"):
         get_extensions(test_session, invalid_course_id, "4330410")
+
+
+def make_extensions_page(extensions):
+    rows = ""
+    for user_id, name, due_date in extensions:
+        props = {
+            "override": {
+                "user_id": int(user_id),
+                "settings": {"due_date": {"type": "absolute", "value": due_date}},
+            },
+            "timezone": {"identifier": "America/New_York"},
+            "deletePath": f"/extensions/{user_id}",
+            "studentName": name,
+        }
+        rows += (
+            '<tr><td><div data-react-class="EditExtension" '
+            f'data-react-props="{html.escape(json.dumps(props))}"></div></td></tr>'
+        )
+    return f'<table class="table js-overridesTable"><tbody>{rows}</tbody></table>'
+
+
+def test_get_course_extensions():
+    """Test the extensions of a course are indexed by user and by assignment."""
+    pages = {
+        "1": make_extensions_page([("11", "Alice", "2024-04-16T03:59:00Z")]),
+        "2": make_extensions_page(
+            [
+                ("11", "Alice", "2024-04-20T03:59:00Z"),
+                ("12", "Bob", "2024-04-21T03:59:00Z"),
+            ]
+        ),
+        "3": make_extensions_page([]),
+    }
+
+    class FakeSession:
+        def get(self, url):
+            assignment_id = url.split("/")[-2]
+            return type(
+                "Response", (), {"status_code": 200, "text": pages[assignment_id]}
+            )()
+
+    extensions = get_course_extensions(FakeSession(), "753413", ["1", "2", "3"])
+
+    assert set(extensions.by_user) == {"11", "12"}
+    assert set(extensions.by_user["11"]) == {"1", "2"}
+    assert extensions.by_assignment["3"] == {}
+    assert extensions.get("12", "2").name == "Bob"
+    assert extensions.get("12", "1") is None
+    assert extensions.by_user["11"]["2"] is extensions.by_assignment["2"]["11"]
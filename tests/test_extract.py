@@ -0,0 +1,73 @@
+import html
+import json
+
+from bs4 import BeautifulSoup
+
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    get_assignments_from_table_props,
+    get_assignments_instructor_view,
+)
+from gradescopeapi.classes._helpers._extract_helpers import (
+    get_csrf_token,
+    get_form_authenticity_token,
+    get_react_props,
+)
+
+PROPS = {
+    "table_data": [
+        {
+            "type": "assignment",
+            "url": "/courses/1/assignments/2",
+            "title": "Homework <1> & \"quotes\" 'too'",
+            "submission_window": {
+                "release_date": "2024-04-15T09:00:00-04:00",
+                "due_date": "2024-04-22T23:59:00-04:00",
+            },
+            "total_points": 10,
+        },
+        {"type": "section", "title": "Week 1"},
+    ]
+}
+
+PAGE = f"""<!DOCTYPE html>
+<html><head>
+<META content='csrf &amp; token' name="csrf-token">
+</head><body>
+<form class="search" action="/search"><input name="authenticity_token" value="wrong"></form>
+<form action="/login" method="post">
+  <input type="hidden" value="login-token" name="authenticity_token" />
+</form>
+<divider data-react-class="AssignmentsTable" data-react-props="{{}}"></divider>
+<div data-react-class="Other" data-react-props="{{}}"></div>
+<div class="x" data-react-props="{html.escape(json.dumps(PROPS))}"
+     data-react-class="AssignmentsTable"></div>
+</body></html>"""
+
+
+def test_fast_path_matches_soup():
+    """Test the extracted values equal those found by BeautifulSoup, for text and bytes."""
+    soup = BeautifulSoup(PAGE, "html.parser")
+    for page in (PAGE, PAGE.encode()):
+        assert (
+            get_csrf_token(page)
+            == soup.select_one('meta[name="csrf-token"]')["content"]
+        )
+        assert (
+            get_form_authenticity_token(page, "/login")
+            == soup.select_one(
+                'form[action="/login"] input[name="authenticity_token"]'
+            )["value"]
+        )
+        assert json.loads(get_react_props(page, "AssignmentsTable")) == PROPS
+
+    assert get_assignments_from_table_props(
+        get_react_props(PAGE, "AssignmentsTable")
+    ) == get_assignments_instructor_view(soup)
+
+
+def test_fast_path_misses():
+    """Test missing tags return None so callers fall back to parsing the page."""
+    assert get_csrf_token("<html><meta name='other' content='x'></html>") is None
+    assert get_form_authenticity_token(PAGE, "/signup") is None
+    assert get_react_props(PAGE, "Missing") is None
+    assert get_assignments_from_table_props(None) == []
@@ -0,0 +1,75 @@
+import csv
+
+import numpy as np
+import pytest
+
+from gradescopeapi.classes.gradebook import get_gradebook, get_gradebook_scores
+from gradescopeapi.classes.member import Member
+
+
+class FakeGradebookSession:
+    """Stands in for requests.Session, serving gradebook.json documents per user."""
+
+    def __init__(self, gradebooks):
+        self.gradebooks = gradebooks
+
+    def get(self, url, params):
+        gradebook = self.gradebooks[params["user_id"]]
+        return type(
+            "Response", (), {"status_code": 200, "json": lambda self: gradebook}
+        )()
+
+
+def make_student(user_id):
+    return Member(
+        full_name=f"Student {user_id}",
+        first_name="Student",
+        last_name=user_id,
+        sid=user_id,
+        email=f"{user_id}@example.com",
+        role="Student",
+        user_id=user_id,
+        num_submissions=0,
+        sections="",
+        course_id="753413",
+    )
+
+
+def test_get_gradebook_matrix(tmp_path):
+    """Test gradebooks are assembled into a dense matrix with NaN for missing scores."""
+    session = FakeGradebookSession(
+        {
+            "1": [
+                {"assignment": {"id": 10, "title": "HW 1"}, "score": "9.5"},
+                {"assignment": {"id": 11, "title": "HW 2"}, "score": None},
+            ],
+            "2": [
+                {"assignment": {"id": 11, "title": "HW 2"}, "score": 7},
+                {"assignment": {"id": 12, "title": "HW 3"}, "score": 3},
+            ],
+        }
+    )
+    students = [make_student("1"), make_student("2")]
+
+    gradebook = get_gradebook(session, "753413", students=students)
+
+    assert gradebook.assignment_ids == ["10", "11", "12"]
+    assert gradebook.assignment_names == ["HW 1", "HW 2", "HW 3"]
+    np.testing.assert_array_equal(
+        gradebook.scores, [[9.5, np.nan, np.nan], [np.nan, 7.0, 3.0]]
+    )
+
+    csv_path = tmp_path / "gradebook.csv"
+    gradebook.to_csv(csv_path)
+    with open(csv_path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][-3:] == ["HW 1 (10)", "HW 2 (11)", "HW 3 (12)"]
+    assert rows[1][0] == "1" and rows[1][-3:] == ["9.5", "", ""]
+
+
+def test_gradebook_scores_reject_unknown_formats():
+    """Test documents of another format raise instead of being guessed at."""
+    with pytest.raises(RuntimeError, match="expected a list"):
+        get_gradebook_scores({"assignments": []})
+    with pytest.raises(RuntimeError, match="entry"):
+        get_gradebook_scores([{"id": 10, "title": "HW 1", "score": "9.5"}])
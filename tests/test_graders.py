@@ -1,3 +1,9 @@
+from bs4 import BeautifulSoup
+
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    get_question_grader_counts,
+    get_question_ids,
+)
 from gradescopeapi.classes.account import Account
 
 
@@ -25,3 +31,39 @@ def test_get_assignment_graders_empty(create_session):
 
     graders = account.get_assignment_graders(course_id, question_id)
     assert len(graders) == 0, "Should not have any graders"
+
+
+def test_get_question_ids():
+    """Test question IDs are found in page order without duplicates."""
+    grade_page = """
+    <a href="/courses/753413/questions/49653137/grade">Q1</a>
+    <a href="/courses/753413/questions/49653137/submissions">Q1</a>
+    <div data-react-props='{"url":"/courses/753413/questions/49653136/grade"}'></div>
+    <a href="/courses/111111/questions/1/grade">other course</a>
+    """
+    assert get_question_ids(grade_page, "753413") == ["49653137", "49653136"]
+
+
+def test_get_question_grader_counts_uses_headers():
+    """Test grader counts come from the column labelled as grader, not a fixed position."""
+    soup = BeautifulSoup(
+        """
+        <table>
+          <thead><tr><th>Name</th><th>Section</th><th>Score</th><th>Graded by</th></tr></thead>
+          <tbody>
+            <tr><td>Student A</td><td>1</td><td>2.0</td><td>Grader One</td></tr>
+            <tr><td>Student B</td><td>1</td><td>1.0</td><td>Grader One</td></tr>
+            <tr><td>Student C</td><td>2</td><td>0.0</td><td>Grader Two</td></tr>
+            <tr><td>Student D</td><td>2</td><td></td><td></td></tr>
+          </tbody>
+        </table>
+        """,
+        "html.parser",
+    )
+    assert get_question_grader_counts(soup) == {"Grader One": 2, "Grader Two": 1}
+
+
+def test_get_question_grader_counts_no_table():
+    """Test pages without a submissions table have no graders."""
+    soup = BeautifulSoup("<p>No submissions</p>", "html.parser")
+    assert get_question_grader_counts(soup) == {}
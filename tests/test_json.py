@@ -0,0 +1,61 @@
+import pytest
+
+from gradescopeapi.classes._helpers import _json_helpers
+from gradescopeapi.classes._helpers._json_helpers import (
+    AssignmentsTableProps,
+    ExtensionProps,
+    RosterMemberData,
+    loads,
+)
+
+EXTENSION_PROPS = (
+    '{"override": {"user_id": 1, "settings": {}}, "timezone": {"identifier": "UTC"},'
+    ' "deletePath": "/x", "studentName": "Alice", "sections": [1, 2, 3]}'
+)
+
+
+@pytest.fixture(params=["orjson", "msgspec", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(_json_helpers, "orjson", None)
+        monkeypatch.setattr(_json_helpers, "msgspec", None)
+    elif request.param == "msgspec":
+        pytest.importorskip("msgspec")
+        monkeypatch.setattr(_json_helpers, "orjson", None)
+    else:
+        pytest.importorskip("orjson")
+    return request.param
+
+
+def test_loads(backend):
+    """Test every backend decodes the same values, from text and bytes."""
+    assert loads('{"a": [1, 2.5, null, "\\u00e9"]}') == {"a": [1, 2.5, None, "é"]}
+    assert loads(b'{"a": true}') == {"a": True}
+    with pytest.raises(ValueError):
+        loads("{not json")
+
+
+def test_loads_schema(backend):
+    """Test the declared keys are decoded with a schema and the rest is only skipped by msgspec."""
+    props = loads(EXTENSION_PROPS, ExtensionProps)
+    assert props["studentName"] == "Alice"
+    assert props["override"]["user_id"] == 1
+    if backend == "msgspec" or (backend == "orjson" and _json_helpers.msgspec):
+        assert "sections" not in props
+    else:
+        assert props["sections"] == [1, 2, 3]
+
+
+def test_loads_schema_null_fields(backend):
+    """Test null values of nullable fields are accepted with a schema."""
+    table_props = loads(
+        '{"table_data": [{"type": "section", "url": null, "title": null}]}',
+        AssignmentsTableProps,
+    )
+    assert table_props["table_data"][0]["url"] is None
+    roster_member = loads(
+        '{"full_name": "Alice", "first_name": null, "last_name": null}',
+        RosterMemberData,
+    )
+    assert roster_member["first_name"] is None
+    assert loads('{"deletePath": null}', ExtensionProps)["deletePath"] is None
@@ -0,0 +1,138 @@
+import threading
+import time
+
+import pytest
+
+from gradescopeapi.classes import pool
+from gradescopeapi.classes.pool import NoSessionAvailable, SessionPool
+
+COURSES = {
+    "ta@example.com": {"instructor": {"1": None}, "student": {}},
+    "staff@example.com": {"instructor": {"1": None, "2": None}, "student": {}},
+    "student@example.com": {"instructor": {}, "student": {"1": None}},
+}
+
+
+class FakeConnection:
+    logins = []
+    expired = set()  # emails whose sessions expired
+    unreachable = False  # whether requests and logins raise network errors
+
+    def __init__(self, gradescope_base_url, retry_policy=None):
+        self.session = self
+        self.account = self
+
+    def login(self, email, password):
+        if FakeConnection.unreachable:
+            raise ConnectionError("Network is unreachable")
+        if password != "secret":
+            raise ValueError("Invalid credentials.")
+        self.email = email
+        FakeConnection.logins.append(email)
+        FakeConnection.expired.discard(email)
+
+    def get_courses(self):
+        return COURSES[self.email]
+
+    def get(self, url, allow_redirects=True):
+        if FakeConnection.unreachable:
+            raise ConnectionError("Network is unreachable")
+        status_code = 302 if self.email in FakeConnection.expired else 200
+        return type("Response", (), {"status_code": status_code})()
+
+
+@pytest.fixture
+def fake_connection(monkeypatch):
+    monkeypatch.setattr(pool, "GSConnection", FakeConnection)
+    FakeConnection.logins = []
+    FakeConnection.expired = set()
+    FakeConnection.unreachable = False
+
+
+def test_pool_logs_in_lazily_and_routes_by_course(fake_connection):
+    """Test accounts are logged in only when needed and chosen by course and role."""
+    session_pool = SessionPool(
+        [
+            ("ta@example.com", "secret"),
+            ("staff@example.com", "secret"),
+            ("student@example.com", "secret"),
+        ]
+    )
+    with session_pool.connection("1") as connection:
+        assert connection.email == "ta@example.com"
+    assert FakeConnection.logins == ["ta@example.com"]
+
+    with session_pool.connection("2", "instructor") as connection:
+        assert connection.email == "staff@example.com"
+    with session_pool.connection("1", "student") as connection:
+        assert connection.email == "student@example.com"
+    assert len(FakeConnection.logins) == 3
+
+    with pytest.raises(NoSessionAvailable):
+        session_pool.acquire("3")
+
+
+def test_pool_caps_usage_and_balances(fake_connection):
+    """Test a connection is lent to at most max_uses_per_session tasks at once."""
+    session_pool = SessionPool(
+        [("ta@example.com", "secret"), ("staff@example.com", "secret")],
+        max_uses_per_session=1,
+    )
+    first = session_pool.acquire("1")
+    second = session_pool.acquire("1")
+    assert {first.email, second.email} == {"ta@example.com", "staff@example.com"}
+    with pytest.raises(NoSessionAvailable, match="Timed out"):
+        session_pool.acquire("1", timeout=0.05)
+
+    threading.Timer(0.05, session_pool.release, [first]).start()
+    assert session_pool.acquire("1", timeout=5) is first
+
+
+def test_pool_relogs_expired_sessions(fake_connection):
+    """Test expired sessions are detected by the probe and logged in again in the background."""
+    session_pool = SessionPool(
+        [("ta@example.com", "secret"), ("staff@example.com", "secret")],
+        validate_after_s=0,
+    )
+    with session_pool.connection("2"):
+        pass
+    FakeConnection.expired.add("staff@example.com")
+
+    with session_pool.connection("2", timeout=5) as connection:
+        assert connection.email == "staff@example.com"
+    assert FakeConnection.logins == [
+        "ta@example.com",
+        "staff@example.com",
+        "staff@example.com",
+    ]
+    session_pool.close()
+
+
+def test_pool_reports_login_failures(fake_connection):
+    """Test a course is unavailable when the only account with access fails to log in."""
+    session_pool = SessionPool([("staff@example.com", "wrong")])
+    with pytest.raises(NoSessionAvailable, match="Invalid credentials"):
+        session_pool.acquire("2")
+
+
+def test_pool_keeps_sessions_on_network_errors(fake_connection):
+    """Test a failing probe keeps the connection and failed logins are retried after a backoff."""
+    session_pool = SessionPool(
+        [("staff@example.com", "secret")], validate_after_s=0, login_backoff_s=0.05
+    )
+    with session_pool.connection("2"):
+        pass
+    FakeConnection.unreachable = True
+    with session_pool.connection("2", timeout=5) as connection:
+        assert connection.email == "staff@example.com"
+    assert FakeConnection.logins == ["staff@example.com"]
+
+    session_pool = SessionPool([("staff@example.com", "secret")], login_backoff_s=0.05)
+    with pytest.raises(NoSessionAvailable, match="unreachable"):
+        session_pool.acquire("2")
+    FakeConnection.unreachable = False
+    with pytest.raises(NoSessionAvailable):
+        session_pool.acquire("2")  # still backing off
+    time.sleep(0.05)
+    with session_pool.connection("2") as connection:
+        assert connection.email == "staff@example.com"
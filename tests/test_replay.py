@@ -0,0 +1,152 @@
+import gzip
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from gradescopeapi.classes._helpers import _assignment_helpers
+from gradescopeapi.classes._helpers._assignment_helpers import download_text_file
+from gradescopeapi.classes._helpers._login_helpers import (
+    get_auth_token_init_gradescope_session,
+    login_set_session_cookies,
+)
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.replay import CassetteMiss, record, replay
+
+HOMEPAGE = b"""<html><body><form action="/login">
+<input type="hidden" name="authenticity_token" value="secret-form-token">
+</form></body></html>"""
+ACCOUNT_PAGE = b"""<html><head><meta name="csrf-token" content="secret-csrf"></head>
+<body><a href="https://s3.example.com/f.pdf?X-Amz-Signature=secret-sig&x=1">f</a>
+<a href="/files/f.py?X-Amz-Credential=secret-cred&X-Amz-Signature=secret-sig">f.py</a>
+</body></html>"""
+
+
+class FakeGradescopeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def respond(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/":
+            self.respond(
+                200,
+                HOMEPAGE,
+                [("Set-Cookie", "_gradescope_session=secret-session; path=/")],
+            )
+        elif self.path == "/account":
+            self.respond(200, ACCOUNT_PAGE)
+        elif self.path.startswith("/files/f.py?"):
+            self.respond(200, b"print('submitted')\n")
+        else:
+            self.respond(404)
+
+    def do_POST(self):
+        self.respond(
+            302,
+            headers=[
+                ("Location", "/account"),
+                ("Set-Cookie", "signed_token=secret-signed; path=/"),
+                ("Set-Cookie", "remember_me=secret-remember; path=/"),
+            ],
+        )
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGradescopeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def login(connection):
+    auth_token = get_auth_token_init_gradescope_session(
+        connection.session, connection.gradescope_base_url
+    )
+    assert login_set_session_cookies(
+        connection.session,
+        "user@example.com",
+        "hunter2",
+        auth_token,
+        connection.gradescope_base_url,
+    )
+    return auth_token
+
+
+def test_record_and_replay_login(server_url, tmp_path):
+    """Test a recorded login replays offline, with credentials scrubbed from the cassette."""
+    path = tmp_path / "login.json.gz"
+    connection = GSConnection(server_url)
+    record(connection.session, path)
+    assert login(connection) == "secret-form-token"
+    connection.session.close()
+
+    cassette_text = gzip.decompress(path.read_bytes()).decode()
+    for secret in [
+        "hunter2",
+        "user%40example.com",
+        "secret-form-token",
+        "secret-csrf",
+        "secret-session",
+        "secret-signed",
+        "secret-sig",
+    ]:
+        assert secret not in cassette_text, secret
+
+    # replay against the same URL, with nothing listening anymore
+    replayed = GSConnection(server_url)
+    replay(replayed.session, path)
+    assert login(replayed) == "REDACTED"
+    assert replayed.session.cookies.get("signed_token") == "REDACTED"
+    assert replayed.session.headers["X-CSRF-Token"] == "REDACTED"
+
+    with pytest.raises(CassetteMiss):
+        replayed.session.get(f"{server_url}/not-recorded")
+
+
+def test_replay_latency(server_url, tmp_path):
+    """Test synthetic latency is added to replayed responses."""
+    path = tmp_path / "account.json.gz"
+    connection = GSConnection(server_url)
+    record(connection.session, path)
+    connection.session.get(f"{server_url}/account")
+    connection.session.close()
+
+    replayed = GSConnection(server_url)
+    replay(replayed.session, path, latency=0.05)
+    response = replayed.session.get(f"{server_url}/account")
+    assert response.elapsed.total_seconds() >= 0.05
+    assert b"X-Amz-Signature=REDACTED&x=1" in response.content
+
+
+def test_replay_presigned_download(server_url, tmp_path, monkeypatch):
+    """Test a file linked from a replayed page downloads offline, without leaking its signature."""
+    monkeypatch.setattr(_assignment_helpers, "_download_session", requests.Session())
+    path = tmp_path / "download.json.gz"
+    connection = GSConnection(server_url)
+    record(connection.session, path)
+    account_page = connection.session.get(f"{server_url}/account").text
+    link = re.search(r'href="(/files/[^"]+)"', account_page).group(1)
+    assert download_text_file(f"{server_url}{link}").ok
+    connection.session.close()
+    assert "secret-" not in gzip.decompress(path.read_bytes()).decode()
+
+    replayed = GSConnection(server_url)
+    replay(replayed.session, path)
+    account_page = replayed.session.get(f"{server_url}/account").text
+    link = re.search(r'href="(/files/[^"]+)"', account_page).group(1)
+    assert "REDACTED" in link
+    response = download_text_file(f"{server_url}{link}")
+    assert response.content == b"print('submitted')\n"
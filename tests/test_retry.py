@@ -0,0 +1,162 @@
+import io
+
+import pytest
+import requests
+
+from gradescopeapi.classes._helpers._assignment_helpers import check_page_auth
+from gradescopeapi.classes._helpers._retry_helpers import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    mount_retry_adapter,
+)
+
+NO_BACKOFF = RetryPolicy(backoff_factor_s=0, jitter=False)
+
+
+def make_response(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"{}"
+    response.raw = io.BytesIO()
+    return response
+
+
+@pytest.fixture
+def scripted_send(monkeypatch):
+    """Replace the transport with one returning (or raising) scripted outcomes in order."""
+    outcomes = []
+    sent = []
+
+    def send(self, request, *args, **kwargs):
+        sent.append(request.method)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = make_response(outcome)
+        response.request = request
+        return response
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+    return outcomes, sent
+
+
+def test_retry_get_until_success(scripted_send):
+    """Test transient errors and 5xx responses of GETs are retried."""
+    outcomes, sent = scripted_send
+    outcomes.extend([requests.ConnectionError("reset"), 503, 200])
+    session = requests.Session()
+    adapter = mount_retry_adapter(session, NO_BACKOFF)
+
+    assert session.get("https://example.com").status_code == 200
+    assert len(sent) == 3
+    assert adapter.metrics.snapshot() == {
+        "requests": 1,
+        "retries": 2,
+        "failures": 0,
+        "short_circuited": 0,
+    }
+
+
+def test_retry_gives_up_after_max_attempts(scripted_send):
+    """Test the final error response is returned once the attempts are used up."""
+    outcomes, sent = scripted_send
+    outcomes.extend([500] * 4)
+    session = requests.Session()
+    adapter = mount_retry_adapter(
+        session, NO_BACKOFF, CircuitBreaker(failure_threshold=10)
+    )
+
+    response = session.get("https://example.com")
+    assert response.status_code == 500
+    assert len(sent) == 4
+    assert adapter.metrics.failures == 1
+
+    # check_page_auth no longer returns None for unexpected statuses
+    outcomes.extend([500] * 4)
+    with pytest.raises(RuntimeError):
+        check_page_auth(session, "https://example.com")
+
+
+def test_post_not_retried(scripted_send):
+    """Test non-idempotent requests are only sent once."""
+    outcomes, sent = scripted_send
+    outcomes.append(503)
+    session = requests.Session()
+    mount_retry_adapter(session, NO_BACKOFF)
+
+    assert session.post("https://example.com").status_code == 503
+    assert sent == ["POST"]
+
+
+def test_retry_stops_at_max_elapsed(scripted_send):
+    """Test no retry is started if its backoff would exceed the max elapsed time."""
+    outcomes, sent = scripted_send
+    outcomes.extend([502, 200])
+    session = requests.Session()
+    mount_retry_adapter(
+        session, RetryPolicy(backoff_factor_s=10, jitter=False, max_elapsed_s=1)
+    )
+
+    assert session.get("https://example.com").status_code == 502
+    assert len(sent) == 1
+
+
+def test_circuit_breaker_fails_fast(scripted_send):
+    """Test requests are rejected without being sent while the circuit is open."""
+    outcomes, sent = scripted_send
+    outcomes.extend([requests.ConnectionError("down")] * 2)
+    session = requests.Session()
+    adapter = mount_retry_adapter(
+        session,
+        NO_BACKOFF,
+        CircuitBreaker(failure_threshold=2, reset_timeout_s=60),
+    )
+
+    with pytest.raises(CircuitOpenError):
+        session.get("https://example.com")
+    with pytest.raises(CircuitOpenError):
+        session.get("https://example.com")
+    assert len(sent) == 2
+    assert adapter.metrics.short_circuited == 2
+
+
+def test_circuit_breaker_half_open():
+    """Test a single trial request is allowed after the reset timeout."""
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=0)
+    circuit_breaker.record_failure()
+    assert circuit_breaker.is_open
+    assert circuit_breaker.allow_request()
+    assert not circuit_breaker.allow_request()
+    circuit_breaker.record_success()
+    assert not circuit_breaker.is_open
+    assert circuit_breaker.allow_request()
+
+
+def test_half_open_trial_always_ends(scripted_send):
+    """Test a 429 or an unexpected exception of the trial request does not block the circuit."""
+    outcomes, sent = scripted_send
+    session = requests.Session()
+    mount_retry_adapter(
+        session,
+        RetryPolicy(max_attempts=1),
+        CircuitBreaker(failure_threshold=2, reset_timeout_s=0),
+    )
+    outcomes.extend([500, 500, 429])
+    for _ in range(3):
+        assert session.get("https://example.com").status_code in (500, 429)
+
+    outcomes.append(ValueError("unexpected"))
+    with pytest.raises(ValueError):
+        session.get("https://example.com")
+
+    outcomes.append(200)
+    assert session.get("https://example.com").status_code == 200
+    assert len(sent) == 5
+
+
+def test_backoff_is_capped():
+    """Test backoff grows exponentially up to the cap and honors Retry-After."""
+    policy = RetryPolicy(backoff_factor_s=1, max_backoff_s=5, jitter=False)
+    assert [policy.get_backoff(n) for n in range(1, 5)] == [1, 2, 4, 5]
+    assert policy.get_backoff(1, retry_after_s=3) == 3
@@ -0,0 +1,77 @@
+import tracemalloc
+
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    get_submission_infos,
+    parse_review_grades,
+)
+from tests._fakes import make_review_grades_page, make_review_grades_row
+
+
+def make_row(i, submitted=True, name=None):
+    return make_review_grades_row(
+        f"s{i}@example.com",
+        str(i) if submitted else None,
+        name=name or f"Student {i}",
+        score=f"{i % 10}.0",
+    )
+
+
+def test_parse_review_grades_records():
+    """Test every student row becomes a plain record, with or without a submission."""
+    page = make_review_grades_page([make_row(1), make_row(2, submitted=False)])
+    assert parse_review_grades(page, chunk_size=7) == [
+        {
+            "submission_id": "1",
+            "email": "s1@example.com",
+            "datetime": "2024-04-15 23:59:00 -0400",
+            "name": "Student 1",
+        },
+        {
+            "submission_id": None,
+            "email": "s2@example.com",
+            "datetime": "2024-04-15 23:59:00 -0400",
+            "name": "Student 2",
+        },
+    ]
+
+
+def test_get_submission_infos():
+    """Test unsubmitted, group and repeated submissions are skipped."""
+    page = make_review_grades_page(
+        [
+            make_row(1),
+            make_row(2, submitted=False),
+            make_row(3, name="Student 3, Student 4"),
+            make_row(1),
+        ]
+    )
+    submission_infos = get_submission_infos(parse_review_grades(page))
+    assert submission_infos == {
+        "s1@example.com": {
+            "name": "Student 1",
+            "email": "s1@example.com",
+            "submissions": [
+                {
+                    "submission_id": "1",
+                    "datetime": "2024-04-15T23:59:00-04:00",
+                    "epochtime_s": 1713239940.0,
+                }
+            ],
+        }
+    }
+
+
+def test_parse_review_grades_memory_ceiling():
+    """Test parsing a large page stays within a small multiple of the page size."""
+    page = make_review_grades_page(make_row(i) for i in range(2000))
+
+    tracemalloc.start()
+    try:
+        submission_infos = get_submission_infos(parse_review_grades(page))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(submission_infos) == 2000
+    # a full BeautifulSoup tree of this page takes over 30x the page size
+    assert peak < 4 * len(page), f"peak {peak} bytes for a {len(page)} byte page"
@@ -0,0 +1,119 @@
+import json
+import random
+
+from gradescopeapi.classes._helpers import _assignment_helpers
+from gradescopeapi.classes.archive import SubmissionArchive
+from gradescopeapi.classes.similarity import (
+    SimilarityIndex,
+    fingerprint,
+    index_submissions,
+    winnow,
+)
+
+STARTER_CODE = "def main():\n    # TODO: implement the assignment here\n    pass\n"
+
+
+def make_program(seed, lines=60):
+    rng = random.Random(seed)
+    return "\n".join(
+        f"value_{rng.randrange(10**6)} = compute({rng.randrange(10**6)}, '{rng.random()}')"
+        for _ in range(lines)
+    )
+
+
+def test_winnow():
+    """Test winnowing keeps the minimum of every window."""
+    assert winnow([5, 3, 4, 1, 2], 2) == {3, 1}
+    assert winnow([4, 2], 3) == {2}
+    assert fingerprint(["a b"], k=2) == fingerprint(["ab"], k=2)
+
+
+def test_similar_pairs():
+    """Test copied submissions are found among unrelated ones, ignoring the starter code."""
+    index = SimilarityIndex(base_texts=[STARTER_CODE])
+    original = make_program(0)
+    # reformatted copy with a few changed lines
+    copy = original.replace(" = ", "=").replace("\n", "\n\n", 5) + "\nextra = 1"
+    index.add("original", [STARTER_CODE, original])
+    index.add("copy", [copy, STARTER_CODE])
+    for seed in range(1, 30):
+        index.add(f"other-{seed}", [STARTER_CODE, make_program(seed)])
+
+    pairs = index.similar_pairs(threshold=0.5)
+    assert [(first, second) for first, second, _ in pairs] == [("copy", "original")]
+    assert len(index.candidate_pairs()) < 31 * 30 // 2
+
+
+def test_small_submissions_are_not_all_candidates():
+    """Test small unrelated submissions rarely share a bucket, even with empty MinHash bins."""
+    for lines in (3, 20):
+        index = SimilarityIndex()
+        for seed in range(300):
+            index.add(str(seed), [make_program(seed, lines)])
+        assert len(index.candidate_pairs()) < 300
+        index.add("copy", [make_program(0, lines)])
+        assert ("0", "copy") in index.candidate_pairs()
+
+
+def test_incremental_and_save(tmp_path):
+    """Test a saved index only fingerprints new submissions and keeps finding pairs."""
+    index = SimilarityIndex()
+    index.add("a", [make_program(1)])
+    index.add("b", [make_program(2)])
+    path = tmp_path / "index.json.gz"
+    index.save(path)
+
+    loaded = SimilarityIndex.load(path)
+    assert loaded.fingerprints == index.fingerprints
+    assert not loaded.add("a", ["ignored, already indexed"])
+    assert loaded.add("c", [make_program(1)])
+    assert loaded.similar_pairs() == [("a", "c", 1.0)]
+
+
+def test_index_submissions_from_archive(tmp_path):
+    """Test archived submissions are indexed without requests, skipping indexed ones."""
+    archive = SubmissionArchive(tmp_path)
+    archive.put("1", {"main.py": make_program(1).encode()})
+    archive.put("2", {"main.py": make_program(1).encode(), "extra.py": b"x = 1"})
+    index = SimilarityIndex()
+    index.add("3", [make_program(3)])
+
+    errors = index_submissions(index, None, "1", "2", ["1", "2", "3", "1"], archive)
+    assert errors == {}
+    assert len(index) == 3
+    assert [pair[:2] for pair in index.similar_pairs()] == [("1", "2")]
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.status_code = 200
+        self.content = content
+        self.text = content.decode()
+
+
+class FakeSession:
+    def __init__(self, files):
+        self.files = files
+        self.urls = []
+
+    def get(self, url, stream=False):
+        self.urls.append(url)
+        if "only_keys" in url:
+            text_files = [
+                {"file": {"url": f"https://s3/{path}"}} for path in self.files
+            ]
+            return FakeResponse(json.dumps({"text_files": text_files}).encode())
+        return FakeResponse(self.files[url.split("/")[-1]])
+
+
+def test_index_submissions_downloads_signed_links(monkeypatch):
+    """Test submitted files are downloaded from their signed links, not through the session."""
+    files = {"main.py": make_program(1).encode()}
+    session, downloads = FakeSession(files), FakeSession(files)
+    monkeypatch.setattr(_assignment_helpers, "_download_session", downloads)
+    index = SimilarityIndex()
+
+    assert index_submissions(index, session, "1", "2", ["1"]) == {}
+    assert len(index) == 1
+    assert all("only_keys" in url for url in session.urls)
+    assert downloads.urls == ["https://s3/main.py"]
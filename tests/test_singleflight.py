@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from gradescopeapi.classes._helpers._assignment_helpers import check_page_auth
+from gradescopeapi.classes._helpers._singleflight_helpers import (
+    SingleFlight,
+    get_session_identity,
+)
+
+
+def run_in_threads(func, num_threads):
+    results = [None] * num_threads
+
+    def worker(i):
+        try:
+            results[i] = func()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_one_call():
+    """Test concurrent calls with the same key run the function once."""
+    group = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return ["parsed"]
+
+    results = run_in_threads(lambda: group.do("key", fetch), 5)
+    assert len(calls) == 1
+    assert all(result == ["parsed"] for result in results)
+    assert group.shared == 4
+    # every caller gets its own list
+    results[0].append("mutated")
+    assert all(result == ["parsed"] for result in results[1:])
+
+    # nothing is cached once the call completed
+    group.do("key", fetch)
+    assert len(calls) == 2
+
+
+def test_concurrent_calls_share_exception():
+    """Test waiting callers get the exception of the shared call."""
+    group = SingleFlight()
+
+    def fetch():
+        time.sleep(0.2)
+        raise RuntimeError("upstream failed")
+
+    results = run_in_threads(lambda: group.do("key", fetch), 3)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    with pytest.raises(RuntimeError):
+        group.do("key", fetch)
+
+
+def test_session_identity():
+    """Test sessions of the same user share an identity and other users do not."""
+    session_a = requests.Session()
+    session_a.cookies.set("signed_token", "user-a")
+    session_a_copy = requests.Session()
+    session_a_copy.cookies.set("signed_token", "user-a")
+    session_b = requests.Session()
+    session_b.cookies.set("signed_token", "user-b")
+
+    assert get_session_identity(session_a) == get_session_identity(session_a_copy)
+    assert get_session_identity(session_a) != get_session_identity(session_b)
+    assert "user-a" not in get_session_identity(session_a)
+    # the rotating session cookie does not change the identity
+    session_a_copy.cookies.set("_gradescope_session", "rotated")
+    assert get_session_identity(session_a) == get_session_identity(session_a_copy)
+    # sessions without login cookies are never shared
+    assert get_session_identity(requests.Session()) != get_session_identity(
+        requests.Session()
+    )
+
+
+def test_check_page_auth_coalesces_requests():
+    """Test concurrent checks of the same page send a single request."""
+
+    class SlowSession:
+        cookies = ()
+
+        def __init__(self):
+            self.urls = []
+
+        def get(self, url):
+            self.urls.append(url)
+            time.sleep(0.2)
+            return type("Response", (), {"status_code": 200, "text": "ok"})()
+
+    session = SlowSession()
+    results = run_in_threads(
+        lambda: check_page_auth(session, "https://example.com/review_grades"), 4
+    )
+    assert session.urls == ["https://example.com/review_grades"]
+    assert all(result.text == "ok" for result in results)
@@ -1,3 +1,4 @@
+import json
 import os
 
 import pytest
@@ -75,3 +76,81 @@ def test_get_assignment_submission_no_submission_found(create_session):
 
     with pytest.raises(Exception, match="No submission found"):
         account.get_assignment_submission(student_email, course_id, assignment_id)
+
+
+def test_get_assignment_all_submissions_single_fetch():
+    """Test all versions are normalized from a single past_submissions request."""
+    past_submissions = {
+        "past_submissions": [
+            {
+                "id": 1,
+                "created_at": "2024-04-15T22:00:00.000-04:00",
+                "owners": [{"name": "Student A", "active": False}],
+                "show_path": "",
+                "activate_path": "",
+                "active": False,
+            },
+            {
+                "id": 2,
+                "created_at": "2024-04-15T23:00:00.000-04:00",
+                "owners": [{"name": "Student A", "active": True}],
+                "show_path": "",
+                "activate_path": "",
+                "active": True,
+            },
+        ]
+    }
+
+    class FakeSession:
+        def __init__(self):
+            self.urls = []
+
+        def get(self, url):
+            self.urls.append(url)
+            return type("Response", (), {"text": json.dumps(past_submissions)})()
+
+    session = FakeSession()
+    account = Account(session)
+    account.assignment_submission_cache = {
+        "1": {
+            "2": {
+                "a@example.com": {
+                    "name": "Student A",
+                    "email": "a@example.com",
+                    "submissions": [
+                        {"submission_id": "2", "datetime": "2024-04-15 23:00:00 -0400"}
+                    ],
+                }
+            }
+        }
+    }
+
+    submissions = account.get_assignment_all_submissions(
+        "1", "2", "a@example.com", include_links=False
+    )
+    assert len(session.urls) == 1
+    assert [submission["is_active"] for submission in submissions] == [False, True]
+    assert all("active" not in submission for submission in submissions)
+    assert submissions[1]["gradescope_submission_link"].endswith("/submissions/2")
+
+    active_submission = account.get_assignment_active_submission(
+        "1", "2", "a@example.com", include_links=False
+    )
+    assert active_submission["id"] == 2
+    assert isinstance(active_submission["epochtime_s"], int)
+    assert account.get_assignment_all_submissions("1", "2", "b@example.com") is None
+
+
+def test_submission_links_failure_is_logged(caplog):
+    """Test a failed file lookup is logged and leaves the submission without links."""
+
+    class FakeSession:
+        def get(self, url):
+            return type("Response", (), {"status_code": 500, "text": ""})()
+
+    submission = {"id": 2}
+    with caplog.at_level("WARNING", logger="gradescopeapi.classes.account"):
+        Account(FakeSession())._add_submission_links("1", "2", [submission])
+    assert "links" not in submission
+    assert "submission 2" in caplog.text
+    assert caplog.records[0].exc_info is not None
@@ -1,9 +1,20 @@
+import hashlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
+from gradescopeapi.classes._helpers import _assignment_helpers
 from gradescopeapi.classes.connection import GSConnection
-from gradescopeapi.classes.upload import upload_assignment
+from gradescopeapi.classes.upload import (
+    _hash_submission_files,
+    _hash_upload_files,
+    _read_hash_ledger,
+    _write_hash_ledger_entry,
+    upload_assignment,
+    upload_assignments_for_students,
+)
 
 # load .env file
 load_dotenv()
@@ -89,3 +100,190 @@ def test_upload_with_no_files():
     # No files are passed
     submission_link = upload_assignment(test_session, course_id, assignment_id)
     assert submission_link is None, "Should handle missing files gracefully"
+
+
+class FakeUploadSession:
+    """Stands in for requests.Session, reading the request body in chunks like requests does."""
+
+    def __init__(self, submission_url):
+        self.submission_url = submission_url
+        self.body = b""
+
+    def get(self, url):
+        return type(
+            "Response", (), {"text": '<meta name="csrf-token" content="token">'}
+        )
+
+    def post(self, url, data, headers):
+        while chunk := data.read(8192):
+            self.body += chunk
+        return type("Response", (), {"url": self.submission_url})
+
+
+def test_upload_paths_bytes_and_streams_with_progress():
+    """Test uploading mixed file inputs reports progress up to the full body size."""
+    submission_url = "https://www.gradescope.com/courses/1/assignments/2/submissions/3"
+    session = FakeUploadSession(submission_url)
+    progress = []
+
+    with open("tests/upload_files/python_file.py", "rb") as python_file:
+        submission_link = upload_assignment(
+            session,
+            "1",
+            "2",
+            "tests/upload_files/text_file.txt",
+            ("notes.md", b"# notes"),
+            b"raw bytes",
+            python_file,
+            progress_callback=progress.append,
+        )
+
+    assert submission_link == submission_url
+    assert b'filename="text_file.txt"' in session.body
+    assert b'filename="notes.md"' in session.body
+    assert b'filename="file_2"' in session.body
+    assert b'filename="python_file.py"' in session.body
+    assert progress[-1].bytes_sent == progress[-1].total_bytes == len(session.body)
+
+
+def test_bulk_upload_for_students():
+    """Test bulk uploads isolate per-student failures and fetch the token once."""
+    submission_url = "https://www.gradescope.com/courses/1/assignments/2/submissions/3"
+    session = FakeUploadSession(submission_url)
+
+    results = upload_assignments_for_students(
+        session,
+        "1",
+        "2",
+        {
+            "111": [("a.py", b"print(1)")],
+            "222": ["tests/upload_files/does_not_exist.py"],
+        },
+    )
+
+    assert results["111"].submission_link == submission_url
+    assert results["111"].error is None
+    assert results["222"].submission_link is None
+    assert "does_not_exist.py" in results["222"].error
+    assert b'name="submission[owner_id]"\r\n\r\n111' in session.body
+
+
+def test_upload_skipped_when_unchanged(tmp_path):
+    """Test uploads matching the hash ledger are skipped and return the previous link."""
+    submission_url = "https://www.gradescope.com/courses/1/assignments/2/submissions/3"
+    session = FakeUploadSession(submission_url)
+    hash_ledger_path = tmp_path / "ledger.json"
+
+    first_link = upload_assignment(
+        session,
+        "1",
+        "2",
+        "tests/upload_files/text_file.txt",
+        hash_ledger_path=hash_ledger_path,
+    )
+    body_size = len(session.body)
+
+    with open("tests/upload_files/text_file.txt", "rb") as text_file:
+        second_link = upload_assignment(
+            session,
+            "1",
+            "2",
+            text_file,
+            skip_if_unchanged=True,
+            hash_ledger_path=hash_ledger_path,
+        )
+    assert first_link == second_link == submission_url
+    assert len(session.body) == body_size, "Unchanged files should not be uploaded"
+
+    changed_link = upload_assignment(
+        session,
+        "1",
+        "2",
+        ("text_file.txt", b"changed"),
+        skip_if_unchanged=True,
+        hash_ledger_path=hash_ledger_path,
+    )
+    assert changed_link == submission_url
+    assert len(session.body) > body_size, "Changed files should be uploaded"
+
+
+def test_upload_hashes_include_filenames(tmp_path):
+    """Test renamed files or swapped contents do not hash like the original files."""
+    original = _hash_upload_files([("a.py", b"a"), ("b.py", b"b")])
+    assert original == _hash_upload_files([("b.py", b"b"), ("a.py", b"a")])
+    assert original != _hash_upload_files([("a.py", b"b"), ("b.py", b"a")])
+    assert original != _hash_upload_files([("c.py", b"a"), ("b.py", b"b")])
+
+    # text mode streams hash like their encoded contents
+    path = tmp_path / "notes.txt"
+    path.write_bytes("caf\u00e9\n".encode())
+    with open(path, encoding="utf-8") as text_file:
+        assert _hash_upload_files([text_file]) == _hash_upload_files([path])
+
+
+def test_submission_hashes_unavailable():
+    """Test a failed lookup of the active submission's files means the upload goes ahead."""
+    session = type(
+        "Session",
+        (),
+        {"get": lambda self, url: type("Response", (), {"status_code": 500})},
+    )()
+    assert _hash_submission_files(session, "1", "2", "3") is None
+
+
+class FakeDownloadSession:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.urls = []
+
+    def get(self, url, stream=False):
+        self.urls.append(url)
+        content = json.dumps(
+            {"text_files": [{"file": {"url": "https://s3/main.py?sig=1"}}]}
+        ).encode()
+        if url.startswith("https://s3/"):
+            content = b"print(1)"
+        return type(
+            "Response",
+            (),
+            {
+                "status_code": self.status_code,
+                "text": content.decode(),
+                "iter_content": lambda self, chunk_size: [content],
+                "close": lambda self: None,
+                "__enter__": lambda self: self,
+                "__exit__": lambda self, *exc_info: None,
+            },
+        )()
+
+
+def test_submission_hashes_from_signed_links(monkeypatch):
+    """Test submitted files are hashed from their signed links, not through the session."""
+    session = FakeDownloadSession(200)
+    downloads = FakeDownloadSession(200)
+    monkeypatch.setattr(_assignment_helpers, "_download_session", downloads)
+    assert _hash_submission_files(session, "1", "2", "3") == [
+        ["main.py", hashlib.sha256(b"print(1)").hexdigest()]
+    ]
+    assert not any(url.startswith("https://s3/") for url in session.urls)
+    assert downloads.urls == ["https://s3/main.py?sig=1"]
+
+    # a failed download means the upload goes ahead
+    monkeypatch.setattr(
+        _assignment_helpers, "_download_session", FakeDownloadSession(403)
+    )
+    assert _hash_submission_files(session, "1", "2", "3") is None
+
+
+def test_hash_ledger_concurrent_writes(tmp_path):
+    """Test concurrent ledger writes keep every entry and leave no temporary files."""
+    hash_ledger_path = tmp_path / "ledger.json"
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(
+            executor.map(
+                lambda i: _write_hash_ledger_entry(hash_ledger_path, str(i), {"i": i}),
+                range(50),
+            )
+        )
+    assert _read_hash_ledger(hash_ledger_path) == {str(i): {"i": i} for i in range(50)}
+    assert os.listdir(tmp_path) == ["ledger.json"]
@@ -0,0 +1,104 @@
+import datetime
+
+import pytest
+
+from gradescopeapi.classes.account import Account
+from gradescopeapi.classes.watcher import SubmissionWatcher
+from tests._fakes import (
+    FakeResponse,
+    FakeSession,
+    make_review_grades_page,
+    make_review_grades_row,
+)
+
+
+class WatchedSession(FakeSession):
+    """Serves the current page, answering 304 when the client's ETag is current."""
+
+    def __init__(self):
+        super().__init__()
+        self.page = ""
+        self.version = 0
+        self.statuses = []
+
+    def set_page(self, rows):
+        self.page = make_review_grades_page(
+            make_review_grades_row(email, submission_id, submitted_at)
+            for email, submission_id, submitted_at in rows
+        )
+        self.version += 1
+
+    def respond(self, url, headers=None):
+        etag = f'"v{self.version}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            response = FakeResponse(304, headers={"ETag": etag})
+        else:
+            response = FakeResponse(200, self.page, headers={"ETag": etag})
+        self.statuses.append(response.status_code)
+        return response
+
+
+def test_watcher_reports_new_and_changed_submissions():
+    """Test only new or resubmitted submissions are reported, using conditional requests."""
+    session = WatchedSession()
+    account = Account(session, "https://example.com")
+    received = []
+    watcher = SubmissionWatcher(account, "1", "2", on_event=received.append)
+
+    session.set_page([("a@example.com", "10", "2024-04-15 20:00:00 -0400")])
+    assert watcher.poll() == []  # existing submissions are the baseline
+    assert watcher.poll() == []
+    assert session.statuses == [200, 304]
+
+    session.set_page(
+        [
+            ("a@example.com", "11", "2024-04-15 21:00:00 -0400"),
+            ("b@example.com", "12", "2024-04-15 21:30:00 -0400"),
+        ]
+    )
+    events = list(watcher.watch(max_polls=1))
+    assert [(event.kind, event.email) for event in events] == [
+        ("changed", "a@example.com"),
+        ("new", "b@example.com"),
+    ]
+    assert events[0].previous_submission_info["submissions"][0]["submission_id"] == "10"
+    assert received == events
+    # the fresh snapshot is shared with the account cache
+    assert set(account.get_assignment_submission_infos("1", "2")) == {
+        "a@example.com",
+        "b@example.com",
+    }
+
+
+def test_watcher_adaptive_interval():
+    """Test polling is tight near deadlines and backs off while idle."""
+    due_date = datetime.datetime(2024, 4, 15, 23, 59, tzinfo=datetime.timezone.utc)
+    watcher = SubmissionWatcher(
+        Account(WatchedSession()),
+        "1",
+        "2",
+        due_date=due_date,
+        min_interval_s=5,
+        max_interval_s=300,
+        deadline_window_s=1800,
+    )
+    far_away = due_date - datetime.timedelta(days=1)
+    assert watcher.next_interval(far_away) == 5
+
+    watcher.idle_polls = 20
+    assert watcher.next_interval(far_away) == 300
+    # never sleep into the deadline window
+    assert watcher.next_interval(due_date - datetime.timedelta(minutes=32)) == 120
+    assert watcher.next_interval(due_date - datetime.timedelta(minutes=10)) == 5
+    assert watcher.next_interval(due_date + datetime.timedelta(minutes=10)) == 5
+
+
+def test_watcher_rejects_naive_deadlines():
+    """Test deadlines without a timezone are rejected instead of failing while polling."""
+    with pytest.raises(ValueError):
+        SubmissionWatcher(
+            Account(WatchedSession()),
+            "1",
+            "2",
+            due_date=datetime.datetime(2024, 4, 15, 23, 59),
+        )